@@ -0,0 +1,332 @@
+"""
+Performance benchmarks for the scoring pipeline.
+
+Runs each stage on deterministic synthetic audio of several durations,
+records wall time, CPU throughput and peak memory, writes the results to
+JSON and compares them against a stored baseline. CLI startup time is
+also measured and held to a fixed budget.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # compare to baseline
+    python benchmarks/run_benchmarks.py --update-baseline    # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Tuple
+
+import numpy as np
+
+# Add the project root to the Python path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.config import Config
+from src.utils.logger import setup_logging
+from src.utils.audio_utils import resample_audio, compute_spectrogram
+from src.models.vad import VADModel
+from src.models.acoustic import AcousticModel
+from src.feedback.engine import FeedbackEngine
+
+
+DURATIONS = (1.0, 5.0, 30.0)
+SAMPLE_RATE = 16000
+CAPTURE_RATE = 48000
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+# Import cost of ``python -m src.main --help`` above a bare interpreter start
+STARTUP_BUDGET_MS = 500.0
+
+# Reference phonemes cycled to about 10 per second of audio
+REFERENCE_PHONEMES = ["θ", "ɪ", "ŋ", "k", "æ", "t", "s", "ə", "v", "w"]
+
+
+def synthetic_speech(duration: float, sample_rate: int = SAMPLE_RATE,
+                     seed: int = 0) -> np.ndarray:
+    """Generate deterministic speech-like audio.
+
+    Alternating voiced bursts (a harmonic series with a drifting pitch) and
+    pauses, over low-level noise, so VAD, features and alignment all see
+    realistic structure.
+
+    Args:
+        duration: Length in seconds
+        sample_rate: Sample rate in Hz
+        seed: Random seed
+
+    Returns:
+        Float32 audio in [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    num_samples = int(duration * sample_rate)
+    t = np.arange(num_samples) / sample_rate
+
+    pitch = 120.0 + 30.0 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+
+    # 600 ms syllable groups separated by 200 ms pauses
+    envelope = ((t % 0.8) < 0.6).astype(np.float64)
+    envelope *= np.sin(np.pi * np.minimum((t % 0.8) / 0.6, 1.0)) ** 0.5
+
+    audio = 0.3 * voiced * envelope + 0.003 * rng.standard_normal(num_samples)
+    return np.clip(audio, -1.0, 1.0).astype(np.float32)
+
+
+def reference_for(duration: float) -> List[str]:
+    """Reference phonemes for an utterance of the given duration."""
+    count = max(1, int(duration * 10))
+    return [REFERENCE_PHONEMES[i % len(REFERENCE_PHONEMES)] for i in range(count)]
+
+
+def measure(func: Callable[[], Any], audio_seconds: float, repeats: int,
+            min_time: float = 0.2) -> Dict[str, float]:
+    """Time a benchmark and measure its peak traced memory.
+
+    Args:
+        func: Benchmark body
+        audio_seconds: Audio duration processed per call
+        repeats: Minimum timed runs after one warm-up run
+        min_time: Keep repeating fast benchmarks until this many seconds
+            have been timed, so medians of sub-millisecond runs are stable
+
+    Returns:
+        Median wall and CPU milliseconds, throughput in audio seconds per
+        CPU second, and peak Python/NumPy memory in MB
+    """
+    func()  # warm-up: lazy model loads and caches
+
+    wall, cpu = [], []
+    while len(wall) < repeats or (sum(wall) < min_time and len(wall) < 1000):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func()
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+
+    # Memory is traced in a separate run; tracing slows allocation down
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cpu_median = statistics.median(cpu)
+    return {
+        "wall_ms": round(statistics.median(wall) * 1000.0, 3),
+        "cpu_ms": round(cpu_median * 1000.0, 3),
+        "throughput": round(audio_seconds / max(cpu_median, 1e-9), 2),
+        "peak_mb": round(peak / 2 ** 20, 3),
+    }
+
+
+def measure_startup(repeats: int = 5) -> Dict[str, float]:
+    """Time CLI startup in fresh interpreters.
+
+    Args:
+        repeats: Runs of each command; the fastest is kept, since startup
+            noise only ever adds time
+
+    Returns:
+        Wall milliseconds of ``python -m src.main --help`` above
+        ``python -c pass``, and the budget it is held to
+    """
+    def best_ms(args: List[str]) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + args, cwd=ROOT, check=True, capture_output=True)
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000.0
+
+    baseline = best_ms(["-c", "pass"])
+    startup = best_ms(["-m", "src.main", "--help"])
+    return {
+        "wall_ms": round(max(startup - baseline, 0.0), 3),
+        "budget_ms": STARTUP_BUDGET_MS,
+    }
+
+
+def build_benchmarks(config: Config) -> Tuple[List[Tuple[str, float, Callable[[], Any]]], str]:
+    """Create the benchmark cases.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Tuple of (list of (name, audio seconds, callable), acoustic backend name)
+    """
+    vad_model = VADModel(config)
+    acoustic_model = AcousticModel(config)
+    feedback_engine = FeedbackEngine(config)
+    language = "english"
+
+    def pipeline(audio: np.ndarray, reference: List[str]) -> List[Dict[str, Any]]:
+        segments = vad_model.detect_speech(audio)
+        start = int(segments[0][0] * SAMPLE_RATE) if segments else 0
+        end = int(segments[-1][1] * SAMPLE_RATE) if segments else len(audio)
+        log_probs = acoustic_model.compute_log_probs(audio[start:end])
+        scores = acoustic_model.align_log_probs(log_probs, reference)
+        return feedback_engine.generate_feedback(scores, language)
+
+    cases = []
+    for duration in DURATIONS:
+        label = f"{duration:g}s"
+        audio = synthetic_speech(duration)
+        captured = synthetic_speech(duration, CAPTURE_RATE)
+        reference = reference_for(duration)
+        cases += [
+            (f"resample_audio/{label}", duration,
+             lambda a=captured: resample_audio(a, CAPTURE_RATE, SAMPLE_RATE)),
+            (f"compute_spectrogram/{label}", duration,
+             lambda a=audio: compute_spectrogram(a, SAMPLE_RATE, n_mels=80)),
+            (f"detect_speech/{label}", duration,
+             lambda a=audio: vad_model.detect_speech(a)),
+            (f"extract_features/{label}", duration,
+             lambda a=audio: acoustic_model.extract_features(a)),
+            (f"align_phonemes/{label}", duration,
+             lambda a=audio, r=reference: acoustic_model.align_phonemes(a, r)),
+            (f"pipeline/{label}", duration,
+             lambda a=audio, r=reference: pipeline(a, r)),
+        ]
+    backend = "onnx" if acoustic_model.backend is not None else "log-mel"
+    return cases, backend
+
+
+def run_benchmarks(config: Config, repeats: int = 5, pattern: str = "") -> Dict[str, Any]:
+    """Run all benchmarks.
+
+    Args:
+        config: Configuration object
+        repeats: Timed runs per benchmark
+        pattern: Only run benchmarks whose name contains this string
+
+    Returns:
+        Dictionary with run metadata and per-benchmark results
+    """
+    results = {}
+    if pattern in "cli_startup":
+        results["cli_startup"] = measure_startup(repeats)
+        print(f"{'cli_startup':<28} {results['cli_startup']['wall_ms']:>10.2f} ms "
+              f"(budget {STARTUP_BUDGET_MS:g} ms)", flush=True)
+    cases, backend = build_benchmarks(config)
+    for name, audio_seconds, func in cases:
+        if pattern in name:
+            results[name] = measure(func, audio_seconds, repeats)
+            print(f"{name:<28} {results[name]['wall_ms']:>10.2f} ms "
+                  f"{results[name]['throughput']:>10.1f} x "
+                  f"{results[name]['peak_mb']:>9.2f} MB", flush=True)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+            "acoustic_backend": backend,
+        },
+        "results": results,
+    }
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any],
+                    time_threshold: float = 0.25,
+                    memory_threshold: float = 0.10,
+                    min_delta: Dict[str, float] = None) -> List[str]:
+    """Find regressions against a baseline.
+
+    Args:
+        results: Output of ``run_benchmarks``
+        baseline: Stored output of an earlier run
+        time_threshold: Allowed relative increase in wall time
+        memory_threshold: Allowed relative increase in peak memory
+        min_delta: Absolute increase per metric below which changes are
+            treated as noise. Defaults to 0.5 ms and 0.05 MB.
+
+    Returns:
+        One message per regressed metric or exceeded budget
+    """
+    if min_delta is None:
+        min_delta = {"wall_ms": 0.5, "peak_mb": 0.05}
+    regressions = []
+    for name, current in results["results"].items():
+        budget = current.get("budget_ms")
+        if budget is not None and current["wall_ms"] > budget:
+            regressions.append(f"{name} wall_ms: {current['wall_ms']:g} "
+                               f"over budget {budget:g}")
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric, threshold in (("wall_ms", time_threshold), ("peak_mb", memory_threshold)):
+            if metric not in previous or metric not in current:
+                continue
+            before, after = previous[metric], current[metric]
+            if after > before * (1.0 + threshold) and after - before > min_delta[metric]:
+                regressions.append(f"{name} {metric}: {before:g} -> {after:g} "
+                                   f"(+{(after / before - 1.0) * 100:.0f}%, "
+                                   f"limit +{threshold * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    """Benchmark command-line entry point."""
+    parser = argparse.ArgumentParser(description="Accent Correction Tool benchmarks")
+    parser.add_argument("--config", type=str, default=str(ROOT / "config.yaml"),
+                        help="Path to configuration file")
+    parser.add_argument("--output", type=str, default="benchmark_results.json",
+                        help="Where to write this run's results")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_FILE),
+                        help="Baseline results to compare against")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--filter", type=str, default="",
+                        help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--time-threshold", type=float, default=0.25,
+                        help="Allowed relative wall time increase")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="Allowed relative peak memory increase")
+    args = parser.parse_args()
+
+    setup_logging("WARNING", enqueue=False)
+    results = run_benchmarks(Config(args.config), args.repeats, args.filter)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Updated baseline {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("acoustic_backend") != results["meta"]["acoustic_backend"]:
+        print("Warning: baseline was recorded with the "
+              f"{baseline.get('meta', {}).get('acoustic_backend')} acoustic backend")
+    regressions = compare_results(results, baseline, args.time_threshold,
+                                  args.memory_threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
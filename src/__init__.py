@@ -9,11 +9,19 @@ __version__ = "0.1.0"
 __author__ = "Nadav Koplovich"
 __email__ = "koplonadav@gmail.com"
 
-from .audio import AudioProcessor
-from .models import AcousticModel, VADModel
-from .feedback import FeedbackEngine
-from .personalization import PersonalizationEngine
-from .utils import Config, Logger
+from .utils.lazy import lazy_exports
+
+# Subsystems are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AudioProcessor": ".audio",
+    "AcousticModel": ".models",
+    "VADModel": ".models",
+    "FeedbackEngine": ".feedback",
+    "PersonalizationEngine": ".personalization",
+    "Config": ".utils",
+    "Logger": ".utils",
+    "ComponentRegistry": ".components",
+})
 
 __all__ = [
     "AudioProcessor",
@@ -23,4 +31,5 @@ __all__ = [
     "PersonalizationEngine",
     "Config",
     "Logger",
-] 
\ No newline at end of file
+    "ComponentRegistry",
+]
@@ -2,6 +2,22 @@
 Audio processing modules for the accent correction tool.
 """
 
-from .processor import AudioProcessor
+from ..utils.lazy import lazy_exports
 
-__all__ = ["AudioProcessor"] 
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AudioProcessor": ".processor",
+    "RingBuffer": ".ring_buffer",
+    "read_wav_info": ".wav_io",
+    "open_wav": ".wav_io",
+    "read_blocks": ".wav_io",
+    "write_wav": ".wav_io",
+})
+
+__all__ = [
+    "AudioProcessor",
+    "RingBuffer",
+    "read_wav_info",
+    "open_wav",
+    "read_blocks",
+    "write_wav",
+]
@@ -2,10 +2,18 @@
 Audio processing for the accent correction tool.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Iterator, Iterable, Dict, Union
 import numpy as np
 from ..utils.config import Config
 from ..utils.logger import get_logger
+from ..utils.audio_utils import resample_audio, StreamingResampler
+from .ring_buffer import RingBuffer
+from . import wav_io
+
+try:
+    import pyaudio
+except ImportError:  # pragma: no cover - depends on system portaudio
+    pyaudio = None
 
 
 class AudioProcessor:
@@ -21,9 +29,92 @@ class AudioProcessor:
         self.logger = get_logger("AudioProcessor")
         self.sample_rate = config.get("audio.sample_rate", 16000)
         self.chunk_duration = config.get("audio.chunk_duration", 0.5)
+        self.chunk_size = int(round(self.chunk_duration * self.sample_rate))
+        self.ring_buffer_chunks = config.get("audio.ring_buffer_chunks", 16)
+        
+        self._ring_buffer: Optional[RingBuffer] = None
+        self._pyaudio = None
+        self._stream = None
         
         self.logger.info(f"Initialized AudioProcessor with sample_rate={self.sample_rate}")
     
+    def start_stream(self) -> None:
+        """Start callback-driven capture into the ring buffer."""
+        if self._stream is not None:
+            return
+        if pyaudio is None:
+            raise RuntimeError("pyaudio is required for streaming audio capture")
+        
+        self._ring_buffer = RingBuffer(self.chunk_size, self.ring_buffer_chunks,
+                                       chunk_duration=self.chunk_duration)
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paFloat32,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size // 4,
+            stream_callback=self._audio_callback
+        )
+        self._stream.start_stream()
+        self.logger.info(f"Started audio stream with {self.ring_buffer_chunks} x "
+                         f"{self.chunk_size} sample ring buffer")
+    
+    def stop_stream(self) -> None:
+        """Stop streaming capture and release the audio device."""
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+        if self._ring_buffer is not None:
+            self._ring_buffer.close()
+            self.logger.info(f"Stopped audio stream: {self._ring_buffer.get_stats()}")
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback; runs on the driver thread."""
+        ring_buffer = self._ring_buffer
+        if status & pyaudio.paInputOverflow:
+            ring_buffer.overruns += 1
+        ring_buffer.write(np.frombuffer(in_data, dtype=np.float32))
+        return (None, pyaudio.paContinue)
+    
+    def stream_chunks(self, timeout: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Yield captured audio chunks of ``chunk_duration`` seconds.
+        
+        Chunks are read-only views into the capture ring buffer. A view is
+        only valid until the next chunk is requested; copy it if it must
+        outlive the iteration step.
+        
+        Args:
+            timeout: Seconds to wait for each chunk. None waits indefinitely.
+            
+        Yields:
+            Audio chunks as float32 numpy arrays
+        """
+        if self._stream is None:
+            self.start_stream()
+        
+        ring_buffer = self._ring_buffer
+        while True:
+            chunk = ring_buffer.read_chunk(timeout)
+            if chunk is None:
+                return
+            yield chunk
+    
+    def get_stream_stats(self) -> Dict[str, int]:
+        """Get ring buffer overrun/underrun counters.
+        
+        Returns:
+            Dictionary of capture statistics
+        """
+        if self._ring_buffer is None:
+            return {"overruns": 0, "underruns": 0, "dropped_samples": 0,
+                    "buffered_samples": 0}
+        return self._ring_buffer.get_stats()
+    
     def capture_audio(self, duration: Optional[float] = None) -> np.ndarray:
         """Capture audio from microphone.
         
@@ -37,10 +128,20 @@ class AudioProcessor:
             duration = self.chunk_duration
             
         self.logger.info(f"Capturing {duration}s of audio")
-        # TODO: Implement actual audio capture
-        # For now, return dummy data
         samples = int(duration * self.sample_rate)
-        return np.zeros(samples, dtype=np.float32)
+        audio_data = np.zeros(samples, dtype=np.float32)
+        if self._stream is None:
+            return audio_data
+        
+        # Fill from the running stream; the unused tail of the last chunk is discarded
+        filled = 0
+        for chunk in self.stream_chunks():
+            count = min(len(chunk), samples - filled)
+            audio_data[filled:filled + count] = chunk[:count]
+            filled += count
+            if filled >= samples:
+                break
+        return audio_data
     
     def process_audio(self, audio_data: np.ndarray) -> np.ndarray:
         """Process audio data (normalize, filter, etc.).
@@ -54,25 +155,57 @@ class AudioProcessor:
         # TODO: Implement audio processing
         return audio_data
     
-    def save_audio(self, audio_data: np.ndarray, filename: str) -> None:
+    def save_audio(self, audio_data: Union[np.ndarray, Iterable[np.ndarray]],
+                   filename: str) -> None:
         """Save audio data to file.
         
+        Samples are converted and written block by block, so saving never
+        materializes a second full-length buffer.
+        
         Args:
-            audio_data: Audio data to save
+            audio_data: Audio data to save, or an iterable of audio blocks
             filename: Output filename
         """
-        # TODO: Implement audio saving
         self.logger.info(f"Saving audio to {filename}")
+        wav_io.write_wav(filename, audio_data, self.sample_rate)
     
     def load_audio(self, filename: str) -> np.ndarray:
         """Load audio data from file.
         
+        The file is memory-mapped. Mono 32-bit float recordings at the
+        processor sample rate are returned as a read-only view of the file
+        without copying; other formats are converted to mono float32.
+        
         Args:
             filename: Input filename
             
         Returns:
             Audio data as numpy array
         """
-        # TODO: Implement audio loading
         self.logger.info(f"Loading audio from {filename}")
-        return np.zeros(16000, dtype=np.float32)  # 1 second of silence 
\ No newline at end of file
+        samples, info = wav_io.open_wav(filename)
+        audio_data = wav_io.to_float32(samples)
+        if info.sample_rate != self.sample_rate:
+            audio_data = resample_audio(audio_data, info.sample_rate, self.sample_rate)
+        return audio_data
+    
+    def read_blocks(self, filename: str, block_seconds: float) -> Iterator[np.ndarray]:
+        """Iterate over an audio file in blocks at the processor sample rate.
+        
+        Args:
+            filename: Input filename
+            block_seconds: Block duration in seconds
+            
+        Yields:
+            Mono float32 audio blocks
+        """
+        info = wav_io.read_wav_info(filename)
+        blocks = wav_io.read_blocks(filename, block_seconds)
+        if info.sample_rate == self.sample_rate:
+            yield from blocks
+            return
+        
+        resampler = StreamingResampler(info.sample_rate, self.sample_rate)
+        for block in blocks:
+            yield resampler.process(block)
+        yield resampler.flush()
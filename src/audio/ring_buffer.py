@@ -0,0 +1,154 @@
+"""
+Preallocated ring buffer for streaming audio capture.
+"""
+
+import threading
+import time
+from typing import Optional, Dict
+import numpy as np
+
+
+class RingBuffer:
+    """Single-producer / single-consumer float32 ring buffer.
+
+    The producer (the audio driver callback) only advances the write position
+    and the consumer only advances the read position. Both are monotonically
+    increasing sample counters that are published with a single assignment, so
+    neither side needs a lock. The capacity is a whole number of chunks, which
+    means a chunk never straddles the wrap-around point and can be handed to
+    the consumer as a view instead of a copy.
+    """
+
+    def __init__(self, chunk_size: int, num_chunks: int = 16,
+                 dtype: type = np.float32, chunk_duration: Optional[float] = None):
+        """Initialize ring buffer.
+
+        Args:
+            chunk_size: Number of samples per chunk handed to the consumer
+            num_chunks: Capacity of the buffer in chunks (at least 2)
+            dtype: Sample data type
+            chunk_duration: Seconds of audio in a chunk. A consumer waiting
+                longer than this for a chunk was starved and counts an
+                underrun; None counts only waits that time out.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if num_chunks < 2:
+            raise ValueError(f"num_chunks must be at least 2, got {num_chunks}")
+
+        self.chunk_size = chunk_size
+        self.chunk_duration = chunk_duration
+        self.capacity = chunk_size * num_chunks
+        self._buffer = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+        self._holding = False
+        self._closed = False
+        self._data_ready = threading.Event()
+
+        # Written by the producer only
+        self.overruns = 0
+        self.dropped_samples = 0
+        # Written by the consumer only
+        self.underruns = 0
+
+    def available(self) -> int:
+        """Number of written samples not yet released by the consumer."""
+        return self._write_pos - self._read_pos
+
+    def write(self, samples: np.ndarray) -> int:
+        """Copy samples into the buffer (producer side).
+
+        When the buffer is full the newest samples are dropped and counted as
+        an overrun; data the consumer may still hold a view of is never
+        overwritten.
+
+        Args:
+            samples: 1-D array of samples
+
+        Returns:
+            Number of samples actually written
+        """
+        n = len(samples)
+        free = self.capacity - (self._write_pos - self._read_pos)
+        if n > free:
+            self.overruns += 1
+            self.dropped_samples += n - free
+            n = free
+        if n == 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < n:
+            self._buffer[:n - first] = samples[first:n]
+
+        # Publish only after the copy so the consumer never sees stale samples
+        self._write_pos += n
+        self._data_ready.set()
+        return n
+
+    def read_chunk(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Get the next chunk as a read-only view (consumer side).
+
+        The view stays valid until the next call to ``read_chunk``, which
+        releases it back to the producer.
+
+        Waiting for the producer is normal when the consumer keeps up; only
+        a wait longer than ``chunk_duration``, or one that times out, counts
+        as an underrun.
+
+        Args:
+            timeout: Seconds to wait for data. None waits indefinitely.
+
+        Returns:
+            View of ``chunk_size`` samples, or None on timeout or close
+        """
+        if self._holding:
+            self._read_pos += self.chunk_size
+            self._holding = False
+
+        wait_start = None
+        while self._write_pos - self._read_pos < self.chunk_size:
+            if self._closed:
+                return None
+            if wait_start is None:
+                wait_start = time.monotonic()
+            self._data_ready.clear()
+            # Re-check after clearing so a write between the test and the
+            # clear is not lost
+            if self._write_pos - self._read_pos >= self.chunk_size:
+                break
+            if not self._data_ready.wait(timeout):
+                if timeout and (self.chunk_duration is None or self._starved(wait_start)):
+                    self.underruns += 1
+                return None
+
+        if wait_start is not None and self.chunk_duration is not None \
+                and self._starved(wait_start):
+            self.underruns += 1
+
+        start = self._read_pos % self.capacity
+        chunk = self._buffer[start:start + self.chunk_size]
+        chunk.flags.writeable = False
+        self._holding = True
+        return chunk
+
+    def _starved(self, wait_start: float) -> bool:
+        """Whether a wait begun at ``wait_start`` outlasted a chunk of audio."""
+        return time.monotonic() - wait_start > self.chunk_duration
+
+    def close(self) -> None:
+        """Wake up and terminate a consumer waiting for data."""
+        self._closed = True
+        self._data_ready.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get overrun/underrun counters."""
+        return {
+            "overruns": self.overruns,
+            "underruns": self.underruns,
+            "dropped_samples": self.dropped_samples,
+            "buffered_samples": self.available(),
+        }
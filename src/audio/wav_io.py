@@ -0,0 +1,203 @@
+"""
+Memory-mapped WAV file I/O.
+"""
+
+import struct
+from pathlib import Path
+from typing import NamedTuple, Iterator, Iterable, Union, Tuple
+import numpy as np
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Samples written per block when saving a whole array
+WRITE_BLOCK_SIZE = 65536
+
+_PCM_DTYPES = {1: np.dtype("u1"), 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+_FLOAT_DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+
+class WavInfo(NamedTuple):
+    """Layout of a WAV file's sample data."""
+    sample_rate: int
+    channels: int
+    dtype: np.dtype
+    data_offset: int
+    num_frames: int
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return self.num_frames / self.sample_rate
+
+
+def read_wav_info(filename: Union[str, Path]) -> WavInfo:
+    """Parse a WAV header without reading sample data.
+
+    Args:
+        filename: WAV file path
+
+    Returns:
+        Sample layout of the file
+
+    Raises:
+        ValueError: If the file is not a PCM or IEEE float WAV file
+    """
+    with open(filename, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"Not a WAV file: {filename}")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in WAV file: {filename}")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if chunk_size % 2:
+                    f.seek(1, 1)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV data chunk precedes fmt chunk: {filename}")
+                data_offset = f.tell()
+                break
+            else:
+                # Chunks are word-aligned
+                f.seek(chunk_size + chunk_size % 2, 1)
+
+        file_size = f.seek(0, 2)
+
+    format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The sub-format GUID starts with the actual format tag
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+
+    sample_width = bits // 8
+    if format_tag == WAVE_FORMAT_PCM and sample_width in _PCM_DTYPES:
+        dtype = _PCM_DTYPES[sample_width]
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and sample_width in _FLOAT_DTYPES:
+        dtype = _FLOAT_DTYPES[sample_width]
+    else:
+        raise ValueError(f"Unsupported WAV format (tag={format_tag}, bits={bits}): {filename}")
+
+    # Streaming writers may leave the data size as 0 or 0xFFFFFFFF
+    frame_bytes = sample_width * channels
+    data_size = file_size - data_offset
+    if 0 < chunk_size < data_size:
+        data_size = chunk_size
+    return WavInfo(sample_rate, channels, dtype, data_offset, data_size // frame_bytes)
+
+
+def open_wav(filename: Union[str, Path]) -> Tuple[np.ndarray, WavInfo]:
+    """Memory-map the samples of a WAV file.
+
+    Args:
+        filename: WAV file path
+
+    Returns:
+        Tuple of (read-only array of shape (frames, channels) in the file's
+        sample type, file layout)
+    """
+    info = read_wav_info(filename)
+    if info.num_frames == 0:
+        return np.zeros((0, info.channels), dtype=info.dtype), info
+    samples = np.memmap(filename, dtype=info.dtype, mode="r", offset=info.data_offset,
+                        shape=(info.num_frames, info.channels))
+    return samples, info
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert samples to mono float32 in [-1, 1].
+
+    Mono float32 input is returned as is, without a copy.
+
+    Args:
+        samples: Array of shape (frames,) or (frames, channels)
+
+    Returns:
+        Mono float32 samples
+    """
+    if samples.ndim == 2:
+        if samples.shape[1] == 1:
+            samples = samples[:, 0]
+        else:
+            samples = samples.mean(axis=1, dtype=np.float32)
+
+    kind, itemsize = samples.dtype.kind, samples.dtype.itemsize
+    if kind == "f":
+        return samples.astype(np.float32, copy=False)
+    if kind == "u":
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    return samples.astype(np.float32) / float(2 ** (8 * itemsize - 1))
+
+
+def read_blocks(filename: Union[str, Path], block_seconds: float) -> Iterator[np.ndarray]:
+    """Iterate over a WAV file in fixed-duration blocks.
+
+    Only one block at a time is converted to float32, so memory use is
+    bounded by the block size regardless of file length.
+
+    Args:
+        filename: WAV file path
+        block_seconds: Block duration in seconds
+
+    Yields:
+        Mono float32 blocks; the last block may be shorter
+    """
+    samples, info = open_wav(filename)
+    block_size = max(1, int(round(block_seconds * info.sample_rate)))
+    for start in range(0, info.num_frames, block_size):
+        yield to_float32(samples[start:start + block_size])
+
+
+def write_wav(filename: Union[str, Path],
+              audio: Union[np.ndarray, Iterable[np.ndarray]],
+              sample_rate: int,
+              sample_width: int = 2) -> int:
+    """Write mono float audio to a WAV file block by block.
+
+    Args:
+        filename: Output path
+        audio: Array of samples in [-1, 1], or an iterable of such blocks
+        sample_rate: Sample rate in Hz
+        sample_width: Bytes per sample; 2 writes 16-bit PCM, 4 writes 32-bit float
+
+    Returns:
+        Number of frames written
+    """
+    if sample_width == 2:
+        format_tag, dtype = WAVE_FORMAT_PCM, np.dtype("<i2")
+    elif sample_width == 4:
+        format_tag, dtype = WAVE_FORMAT_IEEE_FLOAT, np.dtype("<f4")
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    if isinstance(audio, np.ndarray):
+        blocks = [audio[i:i + WRITE_BLOCK_SIZE] for i in range(0, len(audio), WRITE_BLOCK_SIZE)]
+    else:
+        blocks = audio
+
+    Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    num_frames = 0
+    with open(filename, "wb") as f:
+        f.write(struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 0, b"WAVE", b"fmt ", 16,
+                            format_tag, 1, sample_rate, sample_rate * sample_width,
+                            sample_width, 8 * sample_width, b"data", 0))
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float32)
+            if dtype.kind == "i":
+                block = np.clip(block * 32767.0, -32768.0, 32767.0)
+            f.write(block.astype(dtype))
+            num_frames += len(block)
+
+        data_size = num_frames * sample_width
+        f.seek(4)
+        f.write(struct.pack("<I", 36 + data_size))
+        f.seek(40)
+        f.write(struct.pack("<I", data_size))
+    return num_frames
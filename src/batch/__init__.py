@@ -0,0 +1,12 @@
+"""
+Offline batch scoring for the accent correction tool.
+"""
+
+from ..utils.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BatchRunner": ".runner",
+    "load_manifest": ".runner",
+})
+
+__all__ = ["BatchRunner", "load_manifest"]
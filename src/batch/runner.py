@@ -0,0 +1,261 @@
+"""
+Parallel offline scoring of recording corpora.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Set
+import numpy as np
+from ..utils.config import Config
+from ..utils.logger import get_logger
+from ..utils.profiling import LatencyTracer
+from ..utils.phoneme_utils import get_tokenizer
+
+
+# Sidecar file with the reference phonemes (IPA) of a recording
+PHONEME_SUFFIX = ".phonemes"
+
+# Per-process components, created once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def load_manifest(source: str) -> List[Dict[str, Any]]:
+    """List the recordings to score.
+
+    ``source`` is either a directory, scanned recursively for ``*.wav`` files
+    (with optional ``<name>.phonemes`` sidecars), or a JSONL manifest with
+    one ``{"audio": path, "phonemes": [...], "id": ...}`` object per line.
+    Phonemes given as an IPA string are split with the phoneme tokenizer.
+    Relative manifest paths are resolved against the manifest's directory.
+
+    Args:
+        source: Directory or manifest path
+
+    Returns:
+        List of items with ``id``, ``audio`` and ``phonemes`` (or None)
+    """
+    source_path = Path(source)
+    items = []
+    if source_path.is_dir():
+        for audio_path in sorted(source_path.rglob("*.wav")):
+            phoneme_file = audio_path.with_suffix(PHONEME_SUFFIX)
+            phonemes = None
+            if phoneme_file.exists():
+                phonemes = get_tokenizer().tokenize(phoneme_file.read_text(encoding="utf-8"))
+            items.append({
+                "id": str(audio_path.relative_to(source_path)),
+                "audio": str(audio_path),
+                "phonemes": phonemes
+            })
+        return items
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            audio_path = Path(entry["audio"])
+            if not audio_path.is_absolute():
+                audio_path = source_path.parent / audio_path
+            phonemes = entry.get("phonemes")
+            if isinstance(phonemes, str):
+                phonemes = get_tokenizer().tokenize(phonemes)
+            items.append({
+                "id": str(entry.get("id", entry["audio"])),
+                "audio": str(audio_path),
+                "phonemes": phonemes
+            })
+    return items
+
+
+def read_checkpoint(output_path: Path) -> Set[str]:
+    """Collect the IDs already written to an output file.
+
+    The JSONL output doubles as the checkpoint. A partial last line left by
+    an interrupted run is truncated so appending resumes cleanly. Results
+    with an ``error`` do not count, so failed recordings are scored again;
+    their new result is appended after the failed one.
+
+    Args:
+        output_path: Results file
+
+    Returns:
+        IDs of recordings that already have a successful result
+    """
+    done = set()
+    if not output_path.exists():
+        return done
+
+    with open(output_path, "rb+") as f:
+        valid_size = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                result = json.loads(line)
+                result_id = result["id"]
+            except (ValueError, KeyError, TypeError):
+                break
+            if "error" in result:
+                done.discard(result_id)
+            else:
+                done.add(result_id)
+            valid_size += len(line)
+        f.truncate(valid_size)
+    return done
+
+
+def _init_worker(config_path: str, overrides: Dict[str, Any], language: str) -> None:
+    """Build the scoring components once per worker process."""
+    from ..components import ComponentRegistry
+
+    config = Config(config_path)
+    for key, value in overrides.items():
+        config.set(key, value)
+    # Parallelism comes from processes; one inference thread each avoids
+    # oversubscribing the cores
+    config.set("performance.num_threads", 1)
+    config.set("performance.session_pool_size", 1)
+    # Offline results have no use for audio hints; skip the TTS renderer
+    config.set("feedback.audio_hints", False)
+
+    components = ComponentRegistry(config)
+    components.acoustic_model.load()
+    _worker["language"] = language
+    _worker["components"] = components
+
+
+def _score_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Score one recording in a worker process."""
+    result = {"id": item["id"], "audio": item["audio"]}
+    components = _worker["components"]
+    trace = components.tracer.start(item["id"])
+    try:
+        audio_processor = components.audio_processor
+        acoustic_model = components.acoustic_model
+        with trace.span("load"):
+            audio_data = audio_processor.load_audio(item["audio"])
+        result["duration"] = len(audio_data) / audio_processor.sample_rate
+
+        with trace.span("vad"):
+            segments = components.vad_model.detect_speech(audio_data)
+        if not segments:
+            result["phoneme_scores"] = []
+            result["feedback"] = []
+            return result
+
+        # Score only the span that contains speech
+        offset = segments[0][0]
+        start = int(offset * audio_processor.sample_rate)
+        end = int(segments[-1][1] * audio_processor.sample_rate)
+        speech = np.asarray(audio_data[start:end])
+
+        with trace.span("features"):
+            log_probs = acoustic_model.compute_log_probs(speech)
+        with trace.span("scoring"):
+            if item.get("phonemes"):
+                scores = acoustic_model.align_log_probs(log_probs, item["phonemes"])
+            else:
+                scores = acoustic_model.decode_log_probs(log_probs)
+        for score in scores:
+            score["start_time"] += offset
+            score["end_time"] += offset
+
+        result["phoneme_scores"] = scores
+        with trace.span("feedback"):
+            result["feedback"] = components.feedback_engine.generate_feedback(
+                scores, _worker["language"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        # Timings are aggregated by the parent's tracer
+        if trace.stages:
+            result["latency"] = dict(trace.stages, total=trace.elapsed)
+    return result
+
+
+class BatchRunner:
+    """Scores a corpus of recordings across a process pool.
+
+    Each worker process loads the models once and scores recordings
+    independently. Results are appended to a JSONL file as they complete,
+    and recordings already present in that file are skipped, so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, config: Config, language: str = "english",
+                 num_workers: Optional[int] = None):
+        """Initialize batch runner.
+
+        Args:
+            config: Configuration object
+            language: Target language
+            num_workers: Worker processes. Defaults to the number of CPUs.
+        """
+        self.config = config
+        self.language = language
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.logger = get_logger("BatchRunner")
+        # Recordings are scored offline, so the live feedback budget does not apply
+        self.tracer = LatencyTracer(config, check_budget=False)
+
+    def run(self, source: str, output: str) -> Dict[str, int]:
+        """Score every recording in a directory or manifest.
+
+        Args:
+            source: Directory or JSONL manifest of recordings
+            output: JSONL results file, also used as the resume checkpoint
+
+        Returns:
+            Counts of ``scored``, ``failed`` and ``skipped`` recordings
+        """
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        items = load_manifest(source)
+        done = read_checkpoint(output_path)
+        pending = [item for item in items if item["id"] not in done]
+        stats = {"scored": 0, "failed": 0, "skipped": len(items) - len(pending)}
+
+        self.logger.info(f"Scoring {len(pending)} of {len(items)} recordings "
+                         f"with {self.num_workers} workers")
+        if not pending:
+            return stats
+
+        with open(output_path, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                initializer=_init_worker,
+                initargs=(str(self.config.config_path.resolve()), self.config.overrides,
+                          self.language)) as executor:
+            for result in self._run_bounded(executor, iter(pending)):
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                latency = result.get("latency")
+                if latency:
+                    total = latency.pop("total")
+                    self.tracer.record(latency, total, result["id"])
+                if "error" in result:
+                    stats["failed"] += 1
+                    self.logger.warning(f"Failed to score {result['id']}: {result['error']}")
+                else:
+                    stats["scored"] += 1
+
+        self.logger.info(f"Batch scoring finished: {stats}")
+        if self.tracer.enabled:
+            self.tracer.log_report()
+        return stats
+
+    def _run_bounded(self, executor: ProcessPoolExecutor,
+                     items: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Keep a bounded number of items in flight and yield results as they finish."""
+        max_in_flight = 2 * self.num_workers
+        in_flight = set()
+        for item in items:
+            in_flight.add(executor.submit(_score_item, item))
+            if len(in_flight) >= max_in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+        for future in in_flight:
+            yield future.result()
@@ -0,0 +1,120 @@
+"""
+Registry of lazily constructed application components.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, List
+from .utils.config import Config
+from .utils.logger import get_logger
+
+
+# Built-in components as "module:Class"; each class takes the Config
+DEFAULT_COMPONENTS = {
+    "audio_processor": ".audio.processor:AudioProcessor",
+    "vad_model": ".models.vad:VADModel",
+    "acoustic_model": ".models.acoustic:AcousticModel",
+    "feedback_engine": ".feedback.engine:FeedbackEngine",
+    "personalization_engine": ".personalization.engine:PersonalizationEngine",
+    "g2p": ".g2p.service:G2PService",
+    "tracer": ".utils.profiling:LatencyTracer",
+}
+
+
+class ComponentRegistry:
+    """Builds each application component on first use.
+
+    Components are created once, by importing their module only when they
+    are first requested, so a command pays only for the engines it uses.
+    Access is thread-safe and also available as attributes, e.g.
+    ``registry.acoustic_model``.
+    """
+
+    def __init__(self, config: Config):
+        """Initialize component registry.
+
+        Args:
+            config: Configuration object passed to every component
+        """
+        self.config = config
+        self.logger = get_logger("ComponentRegistry")
+        self._factories: Dict[str, Callable[[Config], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+        for name, target in DEFAULT_COMPONENTS.items():
+            self.register(name, _import_factory(target))
+
+    def register(self, name: str, factory: Callable[[Config], Any]) -> None:
+        """Register or replace a component factory.
+
+        Args:
+            name: Component name
+            factory: Callable building the component from the Config
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Get a component, building it on first use.
+
+        Args:
+            name: Component name
+
+        Returns:
+            Component instance
+
+        Raises:
+            KeyError: If no component is registered under ``name``
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown component: {name}")
+                instance = self._factories[name](self.config)
+                self._instances[name] = instance
+                self.logger.info(f"Initialized {name}")
+        return instance
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a component has been built."""
+        return name in self._instances
+
+    @property
+    def loaded(self) -> List[str]:
+        """Names of the components built so far."""
+        return list(self._instances)
+
+    def close(self) -> None:
+        """Close the components built so far that hold resources, newest first."""
+        with self._lock:
+            instances = list(self._instances.items())
+        for name, instance in reversed(instances):
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                self.logger.error(f"Failed to close {name}: {e}")
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._factories:
+            raise AttributeError(name)
+        return self.get(name)
+
+
+def _import_factory(target: str) -> Callable[[Config], Any]:
+    """Build a factory that imports ``module:Class`` only when called."""
+    module_name, class_name = target.split(":")
+
+    def factory(config: Config) -> Any:
+        return getattr(importlib.import_module(module_name, __package__), class_name)(config)
+
+    return factory
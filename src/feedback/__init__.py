@@ -2,6 +2,11 @@
 Feedback generation for the accent correction tool.
 """
 
-from .engine import FeedbackEngine
+from ..utils.lazy import lazy_exports
 
-__all__ = ["FeedbackEngine"] 
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "FeedbackEngine": ".engine",
+    "AudioHintStore": ".hints",
+})
+
+__all__ = ["FeedbackEngine", "AudioHintStore"]
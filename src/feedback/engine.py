@@ -2,22 +2,30 @@
 Feedback generation engine for the accent correction tool.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from ..utils.config import Config
 from ..utils.logger import get_logger
+from .hints import AudioHintStore
 
 
 class FeedbackEngine:
     """Feedback generation engine for pronunciation correction."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, hint_store: Optional[AudioHintStore] = None):
         """Initialize feedback engine.
         
         Args:
             config: Configuration object
+            hint_store: Store of pre-rendered audio hints. Created from the
+                config when ``feedback.audio_hints`` is enabled.
         """
         self.config = config
         self.logger = get_logger("FeedbackEngine")
+        self.stream_logger = get_logger("FeedbackEngine", rate_limit=1.0)
+        
+        if hint_store is None and config.settings.feedback.audio_hints:
+            hint_store = AudioHintStore(config)
+        self.hint_store = hint_store
         
         self.logger.info("Initialized FeedbackEngine")
     
@@ -32,21 +40,34 @@ class FeedbackEngine:
         Returns:
             List of feedback items
         """
-        # TODO: Implement feedback generation
-        self.logger.info(f"Generating feedback for {language}")
+        self.stream_logger.debug("Generating feedback for {}", language)
         
         feedback = []
         for score in phoneme_scores:
-            if score["score"] < self.config.get("scoring.threshold", 0.6):
-                feedback.append({
-                    "phoneme": score["phoneme"],
-                    "message": f"Improve pronunciation of {score['phoneme']}",
-                    "articulatory_guide": self._get_articulatory_guide(score["phoneme"]),
-                    "audio_hint": self._generate_audio_hint(score["phoneme"])
-                })
+            item = self.phoneme_feedback(score)
+            if item is not None:
+                feedback.append(item)
         
         return feedback
     
+    def phoneme_feedback(self, score: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Generate feedback for one phoneme as soon as its score is final.
+        
+        Args:
+            score: Phoneme score
+            
+        Returns:
+            Feedback item, or None if the phoneme was pronounced well enough
+        """
+        if score["score"] >= self.config.settings.scoring.threshold:
+            return None
+        return {
+            "phoneme": score["phoneme"],
+            "message": f"Improve pronunciation of {score['phoneme']}",
+            "articulatory_guide": self._get_articulatory_guide(score["phoneme"]),
+            "audio_hint": self._generate_audio_hint(score["phoneme"])
+        }
+    
     def _get_articulatory_guide(self, phoneme: str) -> str:
         """Get articulatory guide for a phoneme.
         
@@ -65,14 +86,28 @@ class FeedbackEngine:
         }
         return guides.get(phoneme, f"Practice {phoneme} pronunciation")
     
-    def _generate_audio_hint(self, phoneme: str) -> str:
-        """Generate audio hint for a phoneme.
+    def warm_up(self, languages: Optional[Iterable[str]] = None) -> None:
+        """Start pre-rendering audio hints in the background.
+        
+        Args:
+            languages: Languages whose phoneme inventories to render.
+                Defaults to the enabled languages.
+        """
+        if self.hint_store is not None:
+            self.hint_store.warm_up(languages)
+    
+    def _generate_audio_hint(self, phoneme: str) -> Optional[str]:
+        """Get the audio hint for a phoneme.
+        
+        Never waits on speech synthesis: a hint that is not rendered yet is
+        queued for the background renderer and omitted from this feedback.
         
         Args:
             phoneme: Phoneme symbol
             
         Returns:
-            Audio hint file path
+            Audio hint file path, or None if not available yet
         """
-        # TODO: Implement TTS audio generation
-        return f"audio_hints/{phoneme}.wav" 
\ No newline at end of file
+        if self.hint_store is None:
+            return None
+        return self.hint_store.path_for(phoneme)
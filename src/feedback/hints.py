@@ -0,0 +1,247 @@
+"""
+Pre-rendered, content-addressed audio hints.
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import weakref
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Tuple
+import numpy as np
+from ..utils.config import Config
+from ..utils.logger import get_logger
+from ..utils.phoneme_utils import get_exemplar_word, get_phoneme_set
+from ..audio import wav_io
+
+
+# (samples, sample rate) for a text and voice
+Synthesizer = Callable[[str, str], Tuple[np.ndarray, int]]
+
+
+def _reset_in_child(store_ref: "weakref.ref") -> None:
+    """Fork handler: the renderer thread and its locks do not survive a fork."""
+    store = store_ref()
+    if store is not None:
+        store._reset_renderer()
+
+
+def hint_key(phoneme: str, voice: str, model: str, text: Optional[str] = None) -> str:
+    """Content address of a hint.
+
+    Args:
+        phoneme: Phoneme symbol
+        voice: TTS voice
+        model: TTS model name
+        text: Text synthesized for the phoneme, if not the symbol itself
+
+    Returns:
+        Hex SHA-1 of the phoneme, voice, model and text
+    """
+    content = f"{phoneme}|{voice}|{model}"
+    if text is not None:
+        content += f"|{text}"
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class AudioHintStore:
+    """Disk cache of synthesized phoneme hints with an in-memory PCM LRU.
+
+    Hints are WAV files named by ``hint_key``, so a change of voice or model
+    never serves stale audio. Each hint is the voice reading an exemplar
+    word of the phoneme in ``models.tts.language``; phonemes without one
+    have no hint. Rendering only happens on a background
+    thread: ``warm_up`` queues every phoneme of the given languages, and
+    lookups of hints that are not rendered yet queue them and return None
+    instead of waiting on TTS.
+    """
+
+    def __init__(self, config: Config, synthesizer: Optional[Synthesizer] = None):
+        """Initialize hint store.
+
+        Args:
+            config: Configuration object
+            synthesizer: Renders ``(text, voice)`` to ``(samples, sample_rate)``.
+                Defaults to Coqui TTS with ``models.tts.model_path`` and
+                ``models.tts.config_path``.
+        """
+        self.config = config
+        self.logger = get_logger("AudioHintStore")
+        self.model = config.get("models.tts.model", "coqui-tts")
+        self.model_path = config.get("models.tts.model_path", "data/models/tts_model")
+        self.config_path = config.get("models.tts.config_path",
+                                      str(Path(self.model_path) / "config.json"))
+        self.voice = config.get("models.tts.voice", "en_female")
+        self.language = config.get("models.tts.language", "english")
+        self.hint_dir = Path(config.get("feedback.audio_hint_dir", "data/audio/hints"))
+        self.memory_size = max(0, config.get("feedback.hint_cache_size", 64))
+        self._synthesizer = synthesizer
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._tts_failed = False
+        self._reset_renderer()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=partial(_reset_in_child, weakref.ref(self)))
+
+    def _reset_renderer(self) -> None:
+        """Start with no render queue, renderer thread or loaded TTS model."""
+        self._memory_lock = threading.Lock()
+        self._pending: "queue.Queue[str]" = queue.Queue()
+        self._queued = set()
+        self._queued_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._tts: Any = None
+        self._speakers: frozenset = frozenset()
+
+    def path(self, phoneme: str) -> Path:
+        """Disk location of a phoneme's hint, whether rendered or not."""
+        key = hint_key(phoneme, self.voice, self.model, get_exemplar_word(phoneme, self.language))
+        return self.hint_dir / key[:2] / f"{key}.wav"
+
+    def path_for(self, phoneme: str) -> Optional[str]:
+        """Path of a rendered hint.
+
+        Args:
+            phoneme: Phoneme symbol
+
+        Returns:
+            File path, or None if the hint is not rendered yet; it is then
+            queued for rendering if the phoneme has an exemplar word
+        """
+        path = self.path(phoneme)
+        if path.exists():
+            return str(path)
+        self._enqueue([phoneme])
+        return None
+
+    def get(self, phoneme: str) -> Optional[np.ndarray]:
+        """Decoded PCM of a hint.
+
+        Args:
+            phoneme: Phoneme symbol
+
+        Returns:
+            Float32 samples, or None if the hint is not rendered yet; it is
+            then queued for rendering
+        """
+        path = self.path(phoneme)
+        key = path.stem
+        with self._memory_lock:
+            samples = self._memory.get(key)
+            if samples is not None:
+                self._memory.move_to_end(key)
+                return samples
+
+        if not path.exists():
+            self._enqueue([phoneme])
+            return None
+
+        samples, _ = wav_io.open_wav(path)
+        samples = np.array(wav_io.to_float32(samples))
+        samples.setflags(write=False)
+        with self._memory_lock:
+            self._memory[key] = samples
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+        return samples
+
+    def warm_up(self, languages: Optional[Iterable[str]] = None) -> None:
+        """Render hints for whole phoneme inventories in the background.
+
+        Args:
+            languages: Languages to cover. Defaults to the enabled languages.
+        """
+        if languages is None:
+            languages = self.config.get_enabled_languages()
+        phonemes = set()
+        for language in languages:
+            phonemes |= get_phoneme_set(language)
+        self._enqueue(sorted(phonemes))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued hints are rendered.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._pending.join(), done.set()),
+                         daemon=True).start()
+        return done.wait(timeout)
+
+    def _enqueue(self, phonemes: Iterable[str]) -> None:
+        """Queue hints that are neither rendered nor already queued."""
+        if self._tts_failed:
+            return
+        with self._queued_lock:
+            for phoneme in phonemes:
+                if get_exemplar_word(phoneme, self.language) is None:
+                    continue
+                if phoneme not in self._queued and not self.path(phoneme).exists():
+                    self._queued.add(phoneme)
+                    self._pending.put(phoneme)
+            if self._worker is None and not self._pending.empty():
+                self._worker = threading.Thread(target=self._render_loop,
+                                                name="hint-renderer", daemon=True)
+                self._worker.start()
+
+    def _render_loop(self) -> None:
+        """Background thread: render queued hints one at a time."""
+        while True:
+            phoneme = self._pending.get()
+            try:
+                if not self._tts_failed:
+                    self._render(phoneme)
+            except Exception as e:
+                self.logger.warning(f"Failed to render hint for {phoneme}: {e}")
+            finally:
+                with self._queued_lock:
+                    self._queued.discard(phoneme)
+                self._pending.task_done()
+
+    def _render(self, phoneme: str) -> None:
+        """Synthesize one hint and write it atomically."""
+        path = self.path(phoneme)
+        if path.exists():
+            return
+        synthesize = self._synthesizer or self._coqui_synthesize
+        samples, sample_rate = synthesize(get_exemplar_word(phoneme, self.language), self.voice)
+        if samples is None:
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        wav_io.write_wav(temp_path, np.asarray(samples, dtype=np.float32), sample_rate)
+        os.replace(temp_path, path)
+
+    def _coqui_synthesize(self, text: str, voice: str) -> Tuple[Optional[np.ndarray], int]:
+        """Render with Coqui TTS, loading the model on first use."""
+        if self._tts is None:
+            # Imported here: loading Coqui pulls in torch
+            try:
+                from TTS.api import TTS
+            except ImportError:  # pragma: no cover - optional TTS backend
+                self.logger.warning("Coqui TTS not installed, audio hints are disabled")
+                self._tts_failed = True
+                return None, 0
+            try:
+                self._tts = TTS(model_path=self.model_path, config_path=self.config_path)
+            except Exception as e:
+                self.logger.warning(f"Failed to load TTS model from {self.model_path}, "
+                                    f"audio hints are disabled: {e}")
+                self._tts_failed = True
+                return None, 0
+            self.logger.info(f"Loaded TTS model from {self.model_path}")
+            self._speakers = frozenset(getattr(self._tts, "speakers", None) or ())
+            if self._speakers and voice not in self._speakers:
+                self.logger.warning(f"Voice {voice} is not a speaker of the TTS model, "
+                                    f"using its default speaker")
+        speaker = voice if voice in self._speakers else None
+        samples = self._tts.tts(text, speaker=speaker)
+        return np.asarray(samples, dtype=np.float32), self._tts.synthesizer.output_sample_rate
@@ -0,0 +1,12 @@
+"""
+Grapheme-to-phoneme conversion for the accent correction tool.
+"""
+
+from ..utils.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "G2PService": ".service",
+    "TranscriptionCache": ".cache",
+})
+
+__all__ = ["G2PService", "TranscriptionCache"]
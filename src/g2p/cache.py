@@ -0,0 +1,152 @@
+"""
+Size-bounded transcription cache backed by SQLite.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# (language, accent, normalized text)
+CacheKey = Tuple[str, str, str]
+
+
+class TranscriptionCache:
+    """Two-level LRU cache of phoneme transcriptions.
+
+    A small in-memory LRU answers repeated prompts without touching disk.
+    Misses fall through to an SQLite table that survives restarts and is
+    kept under ``max_entries`` by evicting the least recently used rows.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]],
+                 max_entries: int = 100000,
+                 memory_size: int = 4096):
+        """Initialize transcription cache.
+
+        Args:
+            path: SQLite database file, or None for an in-memory-only cache
+            max_entries: Maximum rows kept on disk
+            memory_size: Maximum entries kept in the in-memory LRU
+        """
+        self.max_entries = max(1, max_entries)
+        self.memory_size = max(0, memory_size)
+        self._memory: "OrderedDict[CacheKey, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS transcriptions ("
+                " language TEXT NOT NULL, accent TEXT NOT NULL, text TEXT NOT NULL,"
+                " phonemes TEXT NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (language, accent, text))")
+            self._db.execute("CREATE INDEX IF NOT EXISTS transcriptions_last_used "
+                             "ON transcriptions (last_used)")
+            self._db.commit()
+
+    def get_many(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, Tuple[str, ...]]:
+        """Look up several transcriptions.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached phonemes for the keys that were found
+        """
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                phonemes = self._memory.get(key)
+                if phonemes is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = phonemes
+
+            if missing and self._db is not None:
+                now = time.time()
+                touched = False
+                for key in missing:
+                    row = self._db.execute(
+                        "SELECT phonemes FROM transcriptions "
+                        "WHERE language = ? AND accent = ? AND text = ?", key).fetchone()
+                    if row is not None:
+                        found[key] = tuple(row[0].split(" ")) if row[0] else ()
+                        self._remember(key, found[key])
+                        self._db.execute(
+                            "UPDATE transcriptions SET last_used = ? "
+                            "WHERE language = ? AND accent = ? AND text = ?", (now,) + key)
+                        touched = True
+                if touched:
+                    self._db.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[CacheKey, List[str]]) -> None:
+        """Store transcriptions in one transaction.
+
+        Args:
+            items: Phonemes by cache key
+        """
+        if not items:
+            return
+        with self._lock:
+            for key, phonemes in items.items():
+                self._remember(key, tuple(phonemes))
+            if self._db is None:
+                return
+
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO transcriptions VALUES (?, ?, ?, ?, ?)",
+                [key + (" ".join(phonemes), now) for key, phonemes in items.items()])
+            (count,) = self._db.execute("SELECT COUNT(*) FROM transcriptions").fetchone()
+            if count > self.max_entries:
+                # Evict down to 90% so eviction does not run on every insert
+                excess = count - int(self.max_entries * 0.9)
+                self._db.execute(
+                    "DELETE FROM transcriptions WHERE rowid IN (SELECT rowid FROM "
+                    "transcriptions ORDER BY last_used LIMIT ?)", (excess,))
+            self._db.commit()
+
+    def _remember(self, key: CacheKey, phonemes: Tuple[str, ...]) -> None:
+        """Insert into the in-memory LRU; the caller holds the lock."""
+        if self.memory_size == 0:
+            return
+        self._memory[key] = phonemes
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Number of entries on disk, or in memory without a database."""
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM transcriptions").fetchone()[0]
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory level, keeping the disk cache."""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,169 @@
+"""
+Grapheme-to-phoneme conversion with long-lived backends and caching.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+from ..utils.config import Config
+from ..utils.logger import get_logger
+from ..utils.phoneme_utils import get_tokenizer
+from .cache import TranscriptionCache, CacheKey
+
+try:
+    from phonemizer.backend import EspeakBackend
+    from phonemizer.separator import Separator
+except ImportError:  # pragma: no cover - optional G2P backend
+    EspeakBackend = None
+    Separator = None
+
+
+# espeak-ng voice per (language, accent); accent None is the language default
+ESPEAK_VOICES = {
+    ("english", None): "en-us",
+    ("english", "general_american"): "en-us",
+    ("english", "received_pronunciation"): "en-gb",
+    ("arabic", None): "ar",
+    ("hebrew", None): "he",
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize prompt text into a cache key.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        NFKC, case-folded text with punctuation removed and whitespace collapsed
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+def _create_espeak_backend(voice: str) -> Any:
+    """Start an espeak-ng phonemizer backend for a voice."""
+    if EspeakBackend is None:
+        raise RuntimeError("phonemizer is required for espeak-ng G2P")
+    return EspeakBackend(voice, preserve_punctuation=False, with_stress=False,
+                         language_switch="remove-flags")
+
+
+class G2PService:
+    """Converts prompt text to phonemes.
+
+    One backend per voice is created on first use and kept for the life of
+    the service, so the espeak-ng startup cost is paid once. Prompts that
+    miss the cache are phonemized together in batches, and every result is
+    stored in a size-bounded on-disk cache keyed by language, accent and
+    normalized text, fronted by an in-memory LRU. Backend output is split
+    with the language's phoneme tokenizer, so phones espeak leaves joined
+    are matched against the inventory. Each backend is used by one thread
+    at a time.
+    """
+
+    def __init__(self, config: Config,
+                 backend_factory: Optional[Callable[[str], Any]] = None):
+        """Initialize G2P service.
+
+        Args:
+            config: Configuration object
+            backend_factory: Creates a backend for an espeak voice; the
+                backend must provide ``phonemize(texts, separator=..., strip=True)``.
+                Defaults to phonemizer's espeak-ng backend.
+        """
+        self.config = config
+        self.logger = get_logger("G2PService")
+        self.batch_size = max(1, config.get("g2p.batch_size", 64))
+        self.backend_factory = backend_factory or _create_espeak_backend
+
+        cache_path = config.get("g2p.cache_path", "data/cache/g2p.sqlite")
+        self.cache = TranscriptionCache(
+            cache_path,
+            max_entries=config.get("g2p.cache_max_entries", 100000),
+            memory_size=config.get("g2p.memory_cache_size", 4096)
+        )
+
+        self._backends: Dict[str, Any] = {}
+        self._phonemize_locks: Dict[str, threading.Lock] = {}
+        self._backend_lock = threading.Lock()
+
+        self.logger.info(f"Initialized G2PService with cache at {cache_path}")
+
+    def _voice(self, language: str, accent: Optional[str]) -> str:
+        """espeak voice for a language and accent."""
+        voice = ESPEAK_VOICES.get((language, accent)) or ESPEAK_VOICES.get((language, None))
+        if voice is None:
+            raise ValueError(f"Unsupported language: {language}")
+        return voice
+
+    def _backend(self, voice: str) -> Any:
+        """Get the long-lived backend of a voice, starting it on first use."""
+        backend = self._backends.get(voice)
+        if backend is None:
+            with self._backend_lock:
+                backend = self._backends.get(voice)
+                if backend is None:
+                    backend = self.backend_factory(voice)
+                    self._phonemize_locks[voice] = threading.Lock()
+                    self._backends[voice] = backend
+                    self.logger.info(f"Started G2P backend for {voice}")
+        return backend
+
+    def transcribe(self, text: str, language: str) -> List[str]:
+        """Convert one prompt to phonemes.
+
+        Args:
+            text: Prompt text
+            language: Target language
+
+        Returns:
+            Phoneme symbols
+        """
+        return self.transcribe_batch([text], language)[0]
+
+    def transcribe_batch(self, texts: List[str], language: str) -> List[List[str]]:
+        """Convert several prompts to phonemes.
+
+        Args:
+            texts: Prompt texts
+            language: Target language
+
+        Returns:
+            Phoneme symbols per prompt, in input order
+        """
+        accent = self.config.get(f"languages.{language}.accent") or ""
+        keys: List[CacheKey] = [(language, accent, normalize_text(t)) for t in texts]
+        found = self.cache.get_many(keys)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing:
+            voice = self._voice(language, accent or None)
+            backend = self._backend(voice)
+            transcribed = {}
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                with self._phonemize_locks[voice]:
+                    outputs = self._phonemize(backend, [key[2] for key in batch], language)
+                transcribed.update(zip(batch, outputs))
+            self.cache.put_many(transcribed)
+            found.update(transcribed)
+
+        return [list(found[key]) for key in keys]
+
+    def _phonemize(self, backend: Any, texts: List[str], language: str) -> List[List[str]]:
+        """Run one backend batch and tokenize each output into phonemes."""
+        separator = Separator(phone=" ", word=" ", syllable="") if Separator else None
+        outputs = backend.phonemize(texts, separator=separator, strip=True)
+        tokenizer = get_tokenizer(language)
+        return [tokenizer.tokenize(output) for output in outputs]
+
+    def close(self) -> None:
+        """Release the backends and close the cache."""
+        with self._backend_lock:
+            self._backends.clear()
+            self._phonemize_locks.clear()
+        self.cache.close()
@@ -12,11 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.config import Config
 from src.utils.logger import setup_logging, get_logger
-from src.audio.processor import AudioProcessor
-from src.models.vad import VADModel
-from src.models.acoustic import AcousticModel
-from src.feedback.engine import FeedbackEngine
-from src.personalization.engine import PersonalizationEngine
+from src.components import ComponentRegistry
 
 
 def main():
@@ -51,9 +47,25 @@ def main():
         "--mode", 
         type=str, 
         default="desktop",
-        choices=["desktop", "web"],
+        choices=["desktop", "web", "batch"],
         help="Application mode"
     )
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="Batch mode: directory of WAV files or JSONL manifest"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="results.jsonl",
+        help="Batch mode: JSONL results file, resumed if it exists"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Batch mode: number of worker processes"
+    )
     
     args = parser.parse_args()
     
@@ -66,52 +78,27 @@ def main():
         config = Config(args.config)
         logger.info(f"Loaded configuration from {args.config}")
         
-        # Initialize components
-        logger.info("Initializing components...")
-        
-        # Audio processor
-        audio_processor = AudioProcessor(config)
-        logger.info("Audio processor initialized")
-        
-        # VAD model
-        vad_model = VADModel(config)
-        logger.info("VAD model initialized")
-        
-        # Acoustic model
-        acoustic_model = AcousticModel(config)
-        logger.info("Acoustic model initialized")
+        if args.mode == "batch":
+            # Workers build their own components, so none are created here
+            if not args.input:
+                parser.error("--input is required in batch mode")
+            run_batch_mode(config, args.input, args.output, args.workers, args.language)
+            return
         
-        # Feedback engine
-        feedback_engine = FeedbackEngine(config)
-        logger.info("Feedback engine initialized")
-        
-        # Personalization engine
-        personalization_engine = PersonalizationEngine(config)
-        logger.info("Personalization engine initialized")
+        # Components are built on first use by the mode that needs them
+        components = ComponentRegistry(config)
         
         # Start the application
         logger.info(f"Starting in {args.mode} mode for {args.language}")
         
-        if args.mode == "desktop":
-            run_desktop_mode(
-                config, 
-                audio_processor, 
-                vad_model, 
-                acoustic_model, 
-                feedback_engine, 
-                personalization_engine,
-                args.language
-            )
-        elif args.mode == "web":
-            run_web_mode(
-                config, 
-                audio_processor, 
-                vad_model, 
-                acoustic_model, 
-                feedback_engine, 
-                personalization_engine,
-                args.language
-            )
+        try:
+            if args.mode == "desktop":
+                run_desktop_mode(config, components, args.language)
+            elif args.mode == "web":
+                run_web_mode(config, components, args.language)
+        finally:
+            # Commits the last progress writes still queued in the background
+            components.close()
         
     except KeyboardInterrupt:
         logger.info("Application interrupted by user")
@@ -121,11 +108,11 @@ def main():
         sys.exit(1)
 
 
-def run_desktop_mode(config, audio_processor, vad_model, acoustic_model, 
-                     feedback_engine, personalization_engine, language):
+def run_desktop_mode(config, components, language):
     """Run desktop mode application."""
     logger = get_logger("desktop")
     logger.info("Starting desktop mode")
+    components.feedback_engine.warm_up()
     
     # TODO: Implement desktop GUI or CLI interface
     logger.info("Desktop mode not yet implemented")
@@ -135,27 +122,64 @@ def run_desktop_mode(config, audio_processor, vad_model, acoustic_model,
     
     # Test audio capture
     logger.info("Testing audio capture...")
-    # audio_processor.test_capture()
+    # components.audio_processor.test_capture()
     
     # Test VAD
     logger.info("Testing VAD...")
-    # vad_model.test()
+    # components.vad_model.test()
     
     # Test acoustic model
     logger.info("Testing acoustic model...")
-    # acoustic_model.test()
+    # components.acoustic_model.test()
     
     logger.info("Basic tests completed")
 
 
-def run_web_mode(config, audio_processor, vad_model, acoustic_model, 
-                 feedback_engine, personalization_engine, language):
+def run_batch_mode(config, input_path, output_path, num_workers, language):
+    """Run offline batch scoring mode."""
+    logger = get_logger("batch")
+    logger.info(f"Starting batch mode on {input_path}")
+    
+    from src.batch.runner import BatchRunner
+    
+    runner = BatchRunner(config, language, num_workers or config.get("performance.num_workers"))
+    stats = runner.run(input_path, output_path)
+    logger.info(f"Wrote results to {output_path}: {stats['scored']} scored, "
+                f"{stats['failed']} failed, {stats['skipped']} already done")
+
+
+def run_web_mode(config, components, language):
     """Run web mode application."""
     logger = get_logger("web")
     logger.info("Starting web mode")
     
-    # TODO: Implement web interface
-    logger.info("Web mode not yet implemented")
+    from src.web.server import WebServer
+    
+    server = WebServer(config, components, language)
+    workers = config.get("web.workers", 1)
+    if workers == 1:
+        components.feedback_engine.warm_up()
+        server.run()
+        return
+    
+    # Bind once and fork: the workers accept on the same socket and share
+    # the acoustic model weights loaded by the supervisor
+    from src.supervisor import PreforkSupervisor
+    
+    def serve(index, registry):
+        try:
+            server.run()
+        finally:
+            registry.close()
+    
+    server.listen()
+    PreforkSupervisor(
+        config,
+        components,
+        serve,
+        num_workers=workers,
+        report_interval=config.get("web.memory_report_interval", 60.0)
+    ).run(on_start=components.feedback_engine.warm_up)  # renders hints after forking
 
 
 if __name__ == "__main__":
@@ -2,7 +2,12 @@
 Machine learning models for the accent correction tool.
 """
 
-from .acoustic import AcousticModel
-from .vad import VADModel
+from ..utils.lazy import lazy_exports
 
-__all__ = ["AcousticModel", "VADModel"] 
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AcousticModel": ".acoustic",
+    "VADModel": ".vad",
+    "VADSession": ".vad",
+})
+
+__all__ = ["AcousticModel", "VADModel", "VADSession"]
@@ -2,10 +2,38 @@
 Acoustic model for phoneme recognition and scoring.
 """
 
+import json
+import threading
+from pathlib import Path
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..utils.config import Config
 from ..utils.logger import get_logger
+from ..utils.audio_utils import compute_spectrogram
+from ..utils.phoneme_utils import PHONEME_SYMBOLS, encode_phonemes
+from . import onnx_backend
+from .onnx_backend import OnnxSessionPool
+from .alignment import ctc_viterbi, segment_path, ctc_greedy_segments, IncrementalAligner
+
+
+# wav2vec2-style encoders emit one frame per 20 ms with a 25 ms receptive field
+FRAME_SHIFT = 320
+RECEPTIVE_FIELD = 400
+# Feature size of the log-mel fallback used when no model is installed
+FALLBACK_FEATURE_DIM = 80
+BLANK_TOKEN = "<pad>"
+
+
+def count_frames(num_samples: int) -> int:
+    """Number of encoder frames produced for a number of input samples."""
+    return max(0, (num_samples - RECEPTIVE_FIELD) // FRAME_SHIFT + 1)
+
+
+def log_softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable log-softmax over the last axis."""
+    logits = np.asarray(logits, dtype=np.float32)
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
 
 
 class AcousticModel:
@@ -19,10 +47,106 @@ class AcousticModel:
         """
         self.config = config
         self.logger = get_logger("AcousticModel")
+        self.stream_logger = get_logger("AcousticModel", rate_limit=1.0)
         self.model_type = config.get("models.acoustic.model", "wav2vec2-xlsr-53")
+        self.model_path = Path(config.get("models.acoustic.model_path",
+                                          "data/models/wav2vec2-xlsr-53"))
+        self.quantized = config.get("models.acoustic.quantized", True)
+        self.sample_rate = config.get("audio.sample_rate", 16000)
+        
+        self.frame_duration = FRAME_SHIFT / self.sample_rate
+        self.alignment_beam = config.get("scoring.alignment_beam", 10.0) or None
+        
+        self._backend: Optional[OnnxSessionPool] = None
+        self._backend_lock = threading.Lock()
+        self._backend_resolved = False
+        self._vocabulary: Optional[Dict[str, int]] = None
+        self._id_to_phoneme: List[str] = []
+        self._label_phoneme_ids: Optional[np.ndarray] = None
         
         self.logger.info(f"Initialized AcousticModel with type={self.model_type}")
     
+    @property
+    def backend(self) -> Optional[OnnxSessionPool]:
+        """ONNX Runtime session pool, or None if no model is available.
+        
+        The model file is resolved on first access; sessions are created on
+        first inference.
+        """
+        if not self._backend_resolved:
+            with self._backend_lock:
+                if not self._backend_resolved:
+                    self._backend = self._create_backend()
+                    self._backend_resolved = True
+        return self._backend
+    
+    def _create_backend(self) -> Optional[OnnxSessionPool]:
+        """Create the session pool for the configured model."""
+        if not onnx_backend.is_available():
+            self.logger.warning("onnxruntime not installed, using log-mel features")
+            return None
+        
+        model_file = onnx_backend.resolve_model_file(self.model_path, self.quantized)
+        if model_file is None:
+            self.logger.warning(f"No ONNX model found at {self.model_path}, "
+                                "using log-mel features")
+            return None
+        
+        return OnnxSessionPool(
+            model_file,
+            pool_size=self.config.get("performance.session_pool_size", 2),
+            num_threads=self.config.get("performance.num_threads", 4),
+            use_gpu=self.config.get("performance.use_gpu", False)
+        )
+    
+    def load(self) -> None:
+        """Load model weights now instead of on first inference."""
+        if self.backend is not None:
+            self.backend.load()
+    
+    def share_weights(self) -> bool:
+        """Put the model weights in shared memory for forked workers.
+        
+        Call in the supervisor before forking, instead of ``load``.
+        
+        Returns:
+            True if the weights are shared
+        """
+        if self.backend is None:
+            return False
+        return self.backend.share_weights()
+    
+    @property
+    def output_dim(self) -> Optional[int]:
+        """Size of each encoder output frame, or None if the model doesn't declare it."""
+        backend = self.backend
+        if backend is None:
+            return FALLBACK_FEATURE_DIM
+        backend.load()
+        dim = backend.output_shapes[0][-1]
+        return dim if isinstance(dim, int) else None
+    
+    def _forward(self, audio_data: np.ndarray) -> np.ndarray:
+        """Run the encoder on one utterance.
+        
+        Args:
+            audio_data: Audio samples at the model sample rate
+            
+        Returns:
+            Encoder output of shape (frames, dim), one frame per FRAME_SHIFT samples
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        backend = self.backend
+        if backend is None:
+            return compute_spectrogram(audio_data, self.sample_rate, n_fft=RECEPTIVE_FIELD,
+                                       hop_length=FRAME_SHIFT, n_mels=FALLBACK_FEATURE_DIM)
+        
+        # wav2vec2 expects zero-mean, unit-variance input
+        normalized = (audio_data - audio_data.mean()) / np.sqrt(audio_data.var() + 1e-7)
+        with backend.acquire() as session:
+            outputs = session.run({session.input_names[0]: normalized[np.newaxis, :]})
+            return outputs[0][0].copy()
+    
     def extract_features(self, audio_data: np.ndarray) -> np.ndarray:
         """Extract acoustic features from audio.
         
@@ -30,35 +154,144 @@ class AcousticModel:
             audio_data: Audio data as numpy array
             
         Returns:
-            Acoustic features as numpy array
+            Acoustic features as numpy array of shape (frames, dim)
+        """
+        self.stream_logger.debug("Extracting acoustic features from {} samples", len(audio_data))
+        return self._forward(audio_data)
+    
+    def create_stream(self) -> "StreamingFeatureExtractor":
+        """Create a chunked feature extractor using the configured context.
+        
+        Windows advance by ``models.acoustic.stream_chunk_duration``, not the
+        capture chunk, so live frames lag the audio by at most one short step
+        plus the right context.
+        
+        Returns:
+            New streaming feature extractor
+        """
+        return StreamingFeatureExtractor(
+            self,
+            chunk_duration=self.config.get("models.acoustic.stream_chunk_duration", 0.1),
+            left_context=self.config.get("models.acoustic.left_context", 1.0),
+            right_context=self.config.get("models.acoustic.right_context", 0.2)
+        )
+    
+    @property
+    def vocabulary(self) -> Dict[str, int]:
+        """Mapping of output label to model output index."""
+        if self._vocabulary is None:
+            self._load_vocabulary()
+        return self._vocabulary
+    
+    @property
+    def phoneme_labels(self) -> List[str]:
+        """Output label for each model output index."""
+        if self._vocabulary is None:
+            self._load_vocabulary()
+        return self._id_to_phoneme
+    
+    def _load_vocabulary(self) -> None:
+        """Read ``vocab.json`` next to the model, or build the vocabulary
+        from the global phoneme table (label ``i + 1`` is phoneme ID ``i``)."""
+        model_dir = self.model_path if self.model_path.is_dir() else self.model_path.parent
+        vocab_file = model_dir / "vocab.json"
+        if vocab_file.exists():
+            with open(vocab_file, "r", encoding="utf-8") as f:
+                vocabulary = json.load(f)
+        else:
+            vocabulary = {BLANK_TOKEN: 0}
+            vocabulary.update({p: i + 1 for i, p in enumerate(PHONEME_SYMBOLS)})
+        
+        id_to_phoneme = [""] * (max(vocabulary.values()) + 1)
+        for phoneme, index in vocabulary.items():
+            id_to_phoneme[index] = phoneme
+        self._id_to_phoneme = id_to_phoneme
+        self._label_phoneme_ids = encode_phonemes(id_to_phoneme)
+        self._vocabulary = vocabulary
+    
+    @property
+    def label_phoneme_ids(self) -> np.ndarray:
+        """Global phoneme ID of each model output index (-1 for blank and
+        labels outside the phoneme table), for scoring on integer arrays."""
+        if self._vocabulary is None:
+            self._load_vocabulary()
+        return self._label_phoneme_ids
+    
+    @property
+    def blank_id(self) -> int:
+        """Output index of the CTC blank label."""
+        return self.vocabulary.get(BLANK_TOKEN, 0)
+    
+    def compute_log_probs(self, audio_data: np.ndarray) -> np.ndarray:
+        """Compute frame-level phoneme log posteriors.
+        
+        Args:
+            audio_data: Audio data as numpy array
+            
+        Returns:
+            Log posteriors of shape (frames, vocabulary size). Without a
+            model, posteriors are uniform.
+        """
+        if self.backend is not None:
+            return log_softmax(self._forward(audio_data))
+        
+        num_labels = len(self.vocabulary)
+        return np.full((count_frames(len(audio_data)), num_labels), -np.log(num_labels),
+                       dtype=np.float32)
+    
+    def frames_to_log_probs(self, frames: np.ndarray) -> np.ndarray:
+        """Compute log posteriors from encoder frames, e.g. a slice of a
+        ``StreamingFeatureExtractor``'s features.
+        
+        Args:
+            frames: Encoder output of shape (frames, dim)
+        
+        Returns:
+            Log posteriors of shape (frames, vocabulary size). Without a
+            model, posteriors are uniform.
         """
-        # TODO: Implement feature extraction
-        self.logger.info("Extracting acoustic features")
+        if self.backend is not None:
+            return log_softmax(frames)
         
-        # For now, return dummy features
-        return np.random.randn(100, 768)  # Dummy features
+        num_labels = len(self.vocabulary)
+        return np.full((len(frames), num_labels), -np.log(num_labels), dtype=np.float32)
     
     def get_phoneme_scores(self, audio_data: np.ndarray) -> List[Dict[str, Any]]:
         """Get phoneme-level scores for audio.
         
+        Phonemes are recognized with best-path CTC decoding.
+        
         Args:
             audio_data: Audio data as numpy array
             
         Returns:
             List of phoneme scores with timing information
         """
-        # TODO: Implement phoneme scoring
-        self.logger.info("Computing phoneme scores")
+        self.stream_logger.debug("Computing phoneme scores for {} samples", len(audio_data))
+        return self.decode_log_probs(self.compute_log_probs(audio_data))
+    
+    def decode_log_probs(self, log_probs: np.ndarray) -> List[Dict[str, Any]]:
+        """Decode log posteriors into recognized phoneme segments.
         
-        # For now, return dummy scores
+        Args:
+            log_probs: Log posteriors of shape (frames, vocabulary size)
+            
+        Returns:
+            List of phoneme scores with timing information
+        """
+        labels = self.phoneme_labels
+        segments = ctc_greedy_segments(log_probs, self.blank_id)
         return [
             {
-                "phoneme": "θ",
-                "start_time": 0.0,
-                "end_time": 0.1,
-                "score": 0.8,
-                "confidence": 0.9
+                "phoneme": labels[token],
+                "start_time": start * self.frame_duration,
+                "end_time": end * self.frame_duration,
+                "score": score,
+                "confidence": score
             }
+            for token, start, end, score in zip(
+                segments["token"].tolist(), segments["start"].tolist(),
+                segments["end"].tolist(), segments["score"].tolist())
         ]
     
     def align_phonemes(self, audio_data: np.ndarray, 
@@ -71,18 +304,210 @@ class AcousticModel:
             
         Returns:
             List of aligned phonemes with timing and scores
+            
+        Raises:
+            ValueError: If a phoneme is not in the model vocabulary or the
+                audio is too short for the reference
         """
-        # TODO: Implement forced alignment
-        self.logger.info("Performing phoneme alignment")
+        self.stream_logger.debug("Aligning {} phonemes", len(reference_phonemes))
+        return self.align_log_probs(self.compute_log_probs(audio_data), reference_phonemes)
+    
+    def align_log_probs(self, log_probs: np.ndarray,
+                        reference_phonemes: List[str]) -> List[Dict[str, Any]]:
+        """Force-align reference phonemes to precomputed log posteriors.
         
-        # For now, return dummy alignment
+        Args:
+            log_probs: Log posteriors of shape (frames, vocabulary size)
+            reference_phonemes: List of reference phonemes
+            
+        Returns:
+            List of aligned phonemes with timing and scores
+        """
+        if not reference_phonemes:
+            return []
+        
+        tokens = self._reference_tokens(reference_phonemes)
+        path = ctc_viterbi(log_probs, tokens, self.blank_id)
+        
+        return self.segment_scores(reference_phonemes,
+                                   segment_path(path, log_probs, tokens, self.blank_id))
+    
+    def create_aligner(self, reference_phonemes: List[str]) -> IncrementalAligner:
+        """Create an aligner that finalizes phonemes while frames still arrive.
+        
+        Args:
+            reference_phonemes: List of reference phonemes
+            
+        Returns:
+            Incremental aligner; convert its segments with ``segment_scores``
+            
+        Raises:
+            ValueError: If a phoneme is not in the model vocabulary
+        """
+        return IncrementalAligner(self._reference_tokens(reference_phonemes), self.blank_id,
+                                  self.alignment_beam)
+    
+    def segment_scores(self, reference_phonemes: List[str],
+                       segments: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Turn aligned token segments into phoneme scores.
+        
+        Args:
+            reference_phonemes: List of reference phonemes
+            segments: Output of ``segment_path`` or of an ``IncrementalAligner``,
+                whose ``index`` selects the reference phonemes
+            
+        Returns:
+            List of aligned phonemes with timing and scores
+        """
+        if "index" in segments:
+            phonemes = [reference_phonemes[i] for i in segments["index"].tolist()]
+        else:
+            phonemes = reference_phonemes
+        labels = self.phoneme_labels
         return [
             {
                 "phoneme": phoneme,
-                "start_time": i * 0.1,
-                "end_time": (i + 1) * 0.1,
-                "score": 0.7,
-                "confidence": 0.8
+                "recognized": labels[recognized],
+                "start_time": start * self.frame_duration,
+                "end_time": end * self.frame_duration,
+                "score": score,
+                "confidence": confidence
             }
-            for i, phoneme in enumerate(reference_phonemes)
-        ] 
\ No newline at end of file
+            for phoneme, recognized, start, end, score, confidence in zip(
+                phonemes, segments["recognized"].tolist(),
+                segments["start"].tolist(), segments["end"].tolist(),
+                segments["score"].tolist(), segments["confidence"].tolist())
+        ]
+    
+    def _reference_tokens(self, reference_phonemes: List[str]) -> List[int]:
+        """Vocabulary IDs of reference phonemes."""
+        vocabulary = self.vocabulary
+        unknown = [p for p in reference_phonemes if p not in vocabulary]
+        if unknown:
+            raise ValueError(f"Phonemes not in model vocabulary: {unknown}")
+        return [vocabulary[p] for p in reference_phonemes]
+
+
+class StreamingFeatureExtractor:
+    """Chunked encoder inference with fixed left/right context.
+    
+    Audio is encoded in fixed windows of ``left_context + chunk + right_context``
+    samples. Only the frames belonging to the chunk are kept; the window then
+    slides forward by one chunk. Every window has the same shape, so per-chunk
+    cost stays constant regardless of utterance length, at the price of
+    ``right_context`` seconds of extra latency.
+    """
+    
+    def __init__(self, model: AcousticModel,
+                 chunk_duration: float = 0.5,
+                 left_context: float = 1.0,
+                 right_context: float = 0.2):
+        """Initialize streaming extractor.
+        
+        Args:
+            model: Acoustic model used to encode windows
+            chunk_duration: Audio advanced per window, in seconds
+            left_context: Past audio included in each window, in seconds
+            right_context: Future audio included in each window, in seconds
+        """
+        self.model = model
+        sample_rate = model.sample_rate
+        
+        def to_frames(seconds: float) -> int:
+            return int(round(seconds * sample_rate / FRAME_SHIFT))
+        
+        self.chunk_frames = max(1, to_frames(chunk_duration))
+        self.left_frames = max(0, to_frames(left_context))
+        # A frame spans RECEPTIVE_FIELD samples, so the chunk's last frame
+        # needs at least one frame shift of lookahead
+        self.right_frames = max(1, to_frames(right_context))
+        
+        self.chunk_size = self.chunk_frames * FRAME_SHIFT
+        self.left_size = self.left_frames * FRAME_SHIFT
+        self.right_size = self.right_frames * FRAME_SHIFT
+        self.window_size = self.left_size + self.chunk_size + self.right_size
+        
+        max_frames = int(model.config.get("audio.max_audio_length", 30) * sample_rate / FRAME_SHIFT)
+        self._initial_capacity = max(max_frames, self.chunk_frames)
+        self._output_dim = model.output_dim
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear audio and cached frames to start a new stream."""
+        self._buffer = np.zeros(self.window_size + self.chunk_size, dtype=np.float32)
+        # The first window's left context is silence
+        self._end = self.left_size
+        self._num_samples = 0
+        self._num_frames = 0
+        self._frames: Optional[np.ndarray] = None
+        if self._output_dim is not None:
+            self._frames = np.zeros((self._initial_capacity, self._output_dim), dtype=np.float32)
+    
+    @property
+    def features(self) -> np.ndarray:
+        """All frames computed so far, shape (frames, dim)."""
+        if self._frames is None:
+            return np.zeros((0, self._output_dim or 0), dtype=np.float32)
+        return self._frames[:self._num_frames]
+    
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Add audio and encode every window it completes.
+        
+        Args:
+            chunk: Next audio chunk at the model sample rate
+            
+        Returns:
+            Newly computed frames, shape (new_frames, dim)
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self._end + len(chunk) > len(self._buffer):
+            grown = np.zeros(self._end + len(chunk) + self.chunk_size, dtype=np.float32)
+            grown[:self._end] = self._buffer[:self._end]
+            self._buffer = grown
+        self._buffer[self._end:self._end + len(chunk)] = chunk
+        self._end += len(chunk)
+        self._num_samples += len(chunk)
+        
+        start = self._num_frames
+        while self._end >= self.window_size:
+            self._encode_window(self.chunk_frames)
+        return self.features[start:]
+    
+    def flush(self) -> np.ndarray:
+        """Encode the remaining audio, padding the last window with silence.
+        
+        Returns:
+            Final frames, so that the stream yields one frame per FRAME_SHIFT
+            samples like offline extraction
+        """
+        start = self._num_frames
+        total_frames = count_frames(self._num_samples)
+        while self._num_frames < total_frames:
+            self._buffer[self._end:self.window_size] = 0.0
+            self._end = max(self._end, self.window_size)
+            self._encode_window(min(self.chunk_frames, total_frames - self._num_frames))
+        return self.features[start:]
+    
+    def _encode_window(self, num_frames: int) -> None:
+        """Encode the current window, keep its chunk frames and slide forward."""
+        outputs = self.model._forward(self._buffer[:self.window_size])
+        new_frames = outputs[self.left_frames:self.left_frames + num_frames]
+        self._append(new_frames)
+        
+        # Slide by one chunk; the tail becomes the next window's left context
+        remaining = self._end - self.chunk_size
+        self._buffer[:remaining] = self._buffer[self.chunk_size:self._end]
+        self._end = remaining
+    
+    def _append(self, frames: np.ndarray) -> None:
+        """Append frames to the cache, growing it when full."""
+        if self._frames is None:
+            self._frames = np.zeros((self._initial_capacity, frames.shape[1]), dtype=np.float32)
+        needed = self._num_frames + len(frames)
+        if needed > len(self._frames):
+            grown = np.zeros((max(needed, 2 * len(self._frames)), self._frames.shape[1]),
+                             dtype=np.float32)
+            grown[:self._num_frames] = self._frames[:self._num_frames]
+            self._frames = grown
+        self._frames[self._num_frames:needed] = frames
+        self._num_frames = needed
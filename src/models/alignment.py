@@ -0,0 +1,364 @@
+"""
+CTC alignment over frame-level log posteriors.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+
+def _expand_tokens(tokens: np.ndarray, blank: int) -> np.ndarray:
+    """Interleave blanks around tokens: [b, t1, b, t2, ..., tN, b]."""
+    states = np.full(2 * len(tokens) + 1, blank, dtype=np.int64)
+    states[1::2] = tokens
+    return states
+
+
+def _skip_penalty(states: np.ndarray, blank: int) -> np.ndarray:
+    """Penalty for jumping two states: allowed only between distinct tokens."""
+    penalty = np.full(len(states), -np.inf, dtype=np.float32)
+    allowed = np.zeros(len(states), dtype=bool)
+    allowed[2:] = (states[2:] != blank) & (states[2:] != states[:-2])
+    penalty[allowed] = 0.0
+    return penalty
+
+
+def ctc_viterbi(log_probs: np.ndarray,
+                tokens: Sequence[int],
+                blank: int = 0) -> np.ndarray:
+    """Find the best CTC state path for a token sequence.
+
+    The recurrence runs column by column over the blank-interleaved state
+    lattice: each frame is four vector operations over all states. Columns
+    are kept and the traceback recovers each step from them, so no
+    backpointer array is written in the inner loop.
+
+    Args:
+        log_probs: Frame log posteriors of shape (frames, vocab)
+        tokens: Token IDs to align
+        blank: Blank token ID
+
+    Returns:
+        State index per frame; state ``2 * i + 1`` is token ``i`` and even
+        states are blanks
+
+    Raises:
+        ValueError: If the tokens cannot be aligned to the frames
+    """
+    log_probs = np.asarray(log_probs, dtype=np.float32)
+    tokens = np.asarray(tokens, dtype=np.int64)
+    num_frames = log_probs.shape[0]
+    states = _expand_tokens(tokens, blank)
+    num_states = len(states)
+    if num_frames == 0:
+        raise ValueError("Cannot align tokens to an empty frame sequence")
+
+    emissions = log_probs[:, states]
+    skip_penalty = _skip_penalty(states, blank)
+    # Columns are padded with two -inf cells so the three predecessors of
+    # every state are plain row views
+    alpha = np.full((num_frames, num_states + 2), -np.inf, dtype=np.float32)
+    alpha[0, 2:2 + min(2, num_states)] = emissions[0, :2]
+    column, step, jump = alpha[:, 2:], alpha[:, 1:-1], alpha[:, :-2]
+    best = np.empty(num_states, dtype=np.float32)
+    skip = np.empty(num_states, dtype=np.float32)
+
+    for t in range(1, num_frames):
+        np.maximum(column[t - 1], step[t - 1], out=best)
+        np.add(jump[t - 1], skip_penalty, out=skip)
+        np.maximum(best, skip, out=best)
+        np.add(best, emissions[t], out=column[t])
+
+    final = alpha[-1, 2:]
+    end_state = num_states - 1
+    if num_states > 1 and final[num_states - 2] > final[end_state]:
+        end_state = num_states - 2
+    if not np.isfinite(final[end_state]):
+        raise ValueError(f"Cannot align {len(tokens)} tokens to {num_frames} frames")
+
+    # Re-derive each step's argmax from the stored column (padded index s + 2)
+    path = np.empty(num_frames, dtype=np.int64)
+    penalty = skip_penalty.tolist()
+    state = end_state
+    path[-1] = state
+    for t in range(num_frames - 1, 0, -1):
+        prev = alpha[t - 1]
+        stay, step, jump = prev[state + 2], prev[state + 1], prev[state] + penalty[state]
+        if step > stay and step >= jump:
+            state -= 1
+        elif jump > stay and jump > step:
+            state -= 2
+        path[t - 1] = state
+    return path
+
+
+def segment_path(path: np.ndarray, log_probs: np.ndarray, tokens: Sequence[int],
+                 blank: int = 0) -> Dict[str, np.ndarray]:
+    """Turn a CTC state path into per-token frame segments and scores.
+
+    Args:
+        path: State index per frame from ``ctc_viterbi``
+        log_probs: Frame log posteriors of shape (frames, vocab)
+        tokens: Aligned token IDs
+        blank: Blank token ID
+
+    Returns:
+        Dictionary of per-token arrays: ``start``/``end`` frames (end
+        exclusive), ``score`` (geometric mean posterior of the expected
+        token), ``recognized`` (most likely non-blank token over the
+        segment) and ``confidence`` (its mean posterior)
+    """
+    log_probs = np.asarray(log_probs, dtype=np.float32)
+    tokens = np.asarray(tokens, dtype=np.int64)
+    token_states = 2 * np.arange(len(tokens)) + 1
+
+    # The path never moves backwards, so segments are found by bisection
+    start = np.searchsorted(path, token_states, side="left")
+    end = np.searchsorted(path, token_states, side="right")
+    frame_scores, posteriors = _frame_statistics(path, log_probs, tokens, blank)
+    expected = np.concatenate(([0.0], np.cumsum(frame_scores)))
+    cumulative = np.concatenate((np.zeros((1, posteriors.shape[1])), np.cumsum(posteriors, axis=0)))
+    return _segments_from_sums(start, end, expected, cumulative)
+
+
+def _frame_statistics(path: np.ndarray, log_probs: np.ndarray, tokens: np.ndarray,
+                      blank: int):
+    """Per-frame log posterior of the aligned token (0 off tokens) and non-blank posteriors."""
+    on_token = path % 2 == 1
+    token_index = np.minimum(path // 2, len(tokens) - 1)
+    frame_scores = np.where(on_token, log_probs[np.arange(len(path)), tokens[token_index]], 0.0)
+    posteriors = np.exp(log_probs)
+    posteriors[:, blank] = 0.0
+    return frame_scores, posteriors
+
+
+def _segments_from_sums(start: np.ndarray, end: np.ndarray, expected: np.ndarray,
+                        cumulative: np.ndarray) -> Dict[str, np.ndarray]:
+    """Segment arrays from cumulative frame scores and posteriors indexed by frame."""
+    lengths = np.maximum(end - start, 1)
+    score = np.exp((expected[end] - expected[start]) / lengths)
+    segment_mean = (cumulative[end] - cumulative[start]) / lengths[:, np.newaxis]
+    return {
+        "start": start,
+        "end": end,
+        "score": score,
+        "recognized": segment_mean.argmax(axis=1),
+        "confidence": segment_mean.max(axis=1),
+    }
+
+
+def ctc_greedy_segments(log_probs: np.ndarray, blank: int = 0) -> Dict[str, np.ndarray]:
+    """Best-path CTC decoding into token segments.
+
+    Args:
+        log_probs: Frame log posteriors of shape (frames, vocab)
+        blank: Blank token ID
+
+    Returns:
+        Dictionary of per-segment arrays: ``token``, ``start``/``end`` frames
+        (end exclusive) and ``score`` (mean posterior of the token)
+    """
+    log_probs = np.asarray(log_probs, dtype=np.float32)
+    best = log_probs.argmax(axis=1)
+    change = np.flatnonzero(np.diff(best)) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(best)]))
+    labels = best[starts]
+    keep = labels != blank
+    starts, ends, labels = starts[keep], ends[keep], labels[keep]
+
+    best_posterior = np.exp(log_probs[np.arange(len(best)), best])
+    cumulative = np.concatenate(([0.0], np.cumsum(best_posterior)))
+    return {
+        "token": labels,
+        "start": starts,
+        "end": ends,
+        "score": (cumulative[ends] - cumulative[starts]) / (ends - starts),
+    }
+
+
+class IncrementalAligner:
+    """CTC forced alignment that advances as frames arrive.
+
+    The Viterbi recurrence of ``ctc_viterbi`` runs frame by frame, keeping a
+    backpointer column per frame. After each call to ``extend`` the best
+    paths into every live state are traced back until they meet: frames
+    before that point lie on whichever path wins in the end, so their states
+    are final, and every token whose state the final path has left is
+    returned right away instead of after the utterance.
+
+    Paths that merely survive (e.g. the one still in the leading blank) keep
+    the traceback from meeting, so states scoring more than ``beam`` below
+    the best one are pruned each frame. Without pruning the result is that
+    of ``ctc_viterbi``; with it, the best path can be lost when it falls
+    behind by more than the beam.
+
+    Frames are copied into a buffer that grows by doubling, and the scores
+    and posteriors of each frame are added to running cumulative sums once
+    its state is final, so segmenting stays linear in the utterance length.
+    """
+
+    def __init__(self, tokens: Sequence[int], blank: int = 0, beam: Optional[float] = 10.0):
+        """Initialize aligner.
+
+        Args:
+            tokens: Token IDs to align
+            blank: Blank token ID
+            beam: Log-probability margin below the best state beyond which
+                states are pruned. None keeps all states.
+        """
+        self.tokens = np.asarray(tokens, dtype=np.int64)
+        self.blank = blank
+        self.beam = beam
+        self._states = _expand_tokens(self.tokens, blank)
+        self._skip_penalty = _skip_penalty(self._states, blank)
+        self._alpha: Optional[np.ndarray] = None
+        # Log posteriors of the frames received, in rows [0, num_frames)
+        self._log_probs: Optional[np.ndarray] = None
+        # Running sums over the final path: row t holds frames [0, t)
+        self._expected = np.zeros(1, dtype=np.float64)
+        self._cumulative: Optional[np.ndarray] = None
+        # First frame not covered by the segments returned so far
+        self._segmented = 0
+        # Backpointer column of each frame from _back_start on: the best
+        # predecessor of state s is s - column[s]
+        self._back: List[np.ndarray] = []
+        self._back_start = 1
+        self._path: List[int] = []
+        self.num_frames = 0
+        self.num_final = 0
+
+    @property
+    def path(self) -> np.ndarray:
+        """States of the frames whose alignment is final."""
+        return np.asarray(self._path, dtype=np.int64)
+
+    def extend(self, log_probs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Add frames and return the tokens whose alignment became final.
+
+        Args:
+            log_probs: Log posteriors of the next frames, shape (frames, vocab)
+
+        Returns:
+            ``segment_path`` arrays for the newly final tokens, plus their
+            ``index`` in the token sequence
+        """
+        log_probs = np.asarray(log_probs, dtype=np.float32)
+        if len(log_probs) == 0:
+            return self._final_segments(self.num_final)
+        self._reserve(self.num_frames + len(log_probs), log_probs.shape[1])
+        self._log_probs[self.num_frames:self.num_frames + len(log_probs)] = log_probs
+        emissions = log_probs[:, self._states]
+        num_states = len(self._states)
+
+        start = 0
+        if self._alpha is None:
+            self._alpha = np.full(num_states + 2, -np.inf, dtype=np.float32)
+            self._alpha[2:2 + min(2, num_states)] = emissions[0, :2]
+            self._prune(self._alpha[2:])
+            start = 1
+        for t in range(start, len(emissions)):
+            prev = self._alpha
+            stay, step, jump = prev[2:], prev[1:-1], prev[:-2] + self._skip_penalty
+            back = np.where((step > stay) & (step >= jump), 1,
+                            np.where((jump > stay) & (jump > step), 2, 0)).astype(np.int8)
+            column = np.full(num_states + 2, -np.inf, dtype=np.float32)
+            np.maximum(stay, step, out=column[2:])
+            np.maximum(column[2:], jump, out=column[2:])
+            column[2:] += emissions[t]
+            self._prune(column[2:])
+            self._alpha = column
+            self._back.append(back)
+        self.num_frames += len(log_probs)
+
+        self._commit_converged()
+        return self._final_segments(self._path[-1] // 2 if self._path else 0)
+
+    def finish(self) -> Dict[str, np.ndarray]:
+        """End the utterance and return the tokens not yet final.
+
+        Returns:
+            ``segment_path`` arrays for the remaining tokens, plus ``index``
+
+        Raises:
+            ValueError: If the tokens cannot be aligned to the frames
+        """
+        if self._alpha is None:
+            raise ValueError("Cannot align tokens to an empty frame sequence")
+        final = self._alpha[2:]
+        end_state = len(final) - 1
+        if len(final) > 1 and final[end_state - 1] > final[end_state]:
+            end_state -= 1
+        if not np.isfinite(final[end_state]):
+            raise ValueError(f"Cannot align {len(self.tokens)} tokens to {self.num_frames} frames")
+        self._commit(self.num_frames - 1, end_state)
+        return self._final_segments(len(self.tokens))
+
+    def _reserve(self, frames: int, vocab_size: int) -> None:
+        """Grow the frame buffers to hold at least ``frames`` frames."""
+        capacity = 0 if self._log_probs is None else len(self._log_probs)
+        if frames <= capacity:
+            return
+        capacity = max(frames, 2 * capacity, 64)
+        log_probs = np.empty((capacity, vocab_size), dtype=np.float32)
+        expected = np.empty(capacity + 1, dtype=np.float64)
+        cumulative = np.zeros((capacity + 1, vocab_size), dtype=np.float64)
+        if self._log_probs is not None:
+            log_probs[:self.num_frames] = self._log_probs[:self.num_frames]
+            cumulative[:len(self._path) + 1] = self._cumulative[:len(self._path) + 1]
+        expected[:len(self._path) + 1] = self._expected[:len(self._path) + 1]
+        self._log_probs, self._expected, self._cumulative = log_probs, expected, cumulative
+
+    def _prune(self, column: np.ndarray) -> None:
+        if self.beam is not None:
+            column[column < column.max() - self.beam] = -np.inf
+
+    def _commit_converged(self) -> None:
+        """Fix the frames where the best paths into all live states meet."""
+        states = np.flatnonzero(np.isfinite(self._alpha[2:]))
+        t = self.num_frames - 1
+        while len(states) > 1 and t > len(self._path):
+            states = np.unique(states - self._back[t - self._back_start][states])
+            t -= 1
+        if len(states) == 1:
+            self._commit(t, int(states[0]))
+
+    def _commit(self, frame: int, state: int) -> None:
+        """Trace back from a state known to be on the final path."""
+        if frame < len(self._path):
+            return
+        states = [state]
+        for t in range(frame, len(self._path), -1):
+            state -= int(self._back[t - self._back_start][state])
+            states.append(state)
+        begin = len(self._path)
+        self._path.extend(reversed(states))
+        del self._back[:frame + 1 - self._back_start]
+        self._back_start = frame + 1
+
+        # Add the newly final frames to the running sums
+        frame_scores, posteriors = _frame_statistics(
+            np.asarray(states[::-1], dtype=np.int64), self._log_probs[begin:frame + 1],
+            self.tokens, self.blank)
+        self._expected[begin + 1:frame + 2] = self._expected[begin] + np.cumsum(frame_scores)
+        self._cumulative[begin + 1:frame + 2] = (self._cumulative[begin]
+                                                 + np.cumsum(posteriors, axis=0))
+
+    def _final_segments(self, count: int) -> Dict[str, np.ndarray]:
+        """Segments of tokens ``num_final`` to ``count`` from the final path."""
+        index = np.arange(self.num_final, count)
+        if len(index) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            segments = {"start": empty, "end": empty, "score": empty.astype(np.float64),
+                        "recognized": empty, "confidence": empty.astype(np.float64)}
+        else:
+            # Tokens before num_final end at or before _segmented, so only the
+            # path committed since is searched
+            path = np.asarray(self._path[self._segmented:], dtype=np.int64)
+            token_states = 2 * index + 1
+            start = self._segmented + np.searchsorted(path, token_states, side="left")
+            end = self._segmented + np.searchsorted(path, token_states, side="right")
+            segments = _segments_from_sums(start, end, self._expected, self._cumulative)
+            self._segmented = int(end[-1])
+        segments["index"] = index
+        self.num_final = count
+        return segments
@@ -0,0 +1,317 @@
+"""
+ONNX Runtime inference backend with session pooling.
+"""
+
+import mmap
+import os
+import queue
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Iterator, Optional, Tuple
+import numpy as np
+from ..utils.logger import get_logger
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional inference backend
+    ort = None
+
+try:
+    import onnx
+    from onnx import numpy_helper
+except ImportError:  # pragma: no cover - optional, needed for shared weights
+    onnx = None
+    numpy_helper = None
+
+# Byte alignment of each weight tensor in the shared block
+WEIGHT_ALIGNMENT = 64
+
+
+def is_available() -> bool:
+    """Check whether ONNX Runtime is installed."""
+    return ort is not None
+
+
+def resolve_model_file(model_path: Path, quantized: bool) -> Optional[Path]:
+    """Find the ONNX file to load for a model.
+
+    ``model_path`` may point at an ``.onnx`` file or at a model directory
+    containing ``model.onnx`` and optionally ``model_quantized.onnx``. When a
+    quantized model is requested but only the full-precision export exists,
+    it is dynamically quantized to int8 once and saved next to it. The
+    quantized model is written to a temporary file and renamed into place,
+    so processes resolving the model concurrently never load a partial file.
+
+    Args:
+        model_path: Model file or directory
+        quantized: Whether to prefer the int8 quantized model
+
+    Returns:
+        Path to the ONNX file, or None if no model is available
+    """
+    if model_path.is_file():
+        return model_path
+
+    full_model = model_path / "model.onnx"
+    quantized_model = model_path / "model_quantized.onnx"
+    if not quantized:
+        return full_model if full_model.exists() else None
+    if quantized_model.exists():
+        return quantized_model
+    if not full_model.exists():
+        return None
+
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    get_logger("onnx_backend").info(f"Quantizing {full_model} to {quantized_model}")
+    fd, temp_name = tempfile.mkstemp(suffix=".onnx", prefix=".model_quantized.", dir=model_path)
+    os.close(fd)
+    try:
+        quantize_dynamic(str(full_model), temp_name, weight_type=QuantType.QInt8)
+        os.replace(temp_name, quantized_model)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    return quantized_model
+
+
+class SharedWeights:
+    """Model initializers in one anonymous shared memory block.
+
+    Created before forking worker processes: every worker's sessions use
+    these buffers as their initializers instead of loading their own copy,
+    so the weights are in memory once however many workers there are. The
+    block is a shared mapping outside the Python heap, so reference count
+    updates and garbage collection in the workers never copy its pages.
+    """
+
+    def __init__(self, model_file: Path):
+        """Read the initializers of a model into shared memory.
+
+        Args:
+            model_file: Path to the ONNX model file
+
+        Raises:
+            RuntimeError: If the onnx package is not installed
+        """
+        if onnx is None:
+            raise RuntimeError("onnx is required to share model weights")
+
+        model = onnx.load(str(model_file))
+        tensors = [numpy_helper.to_array(t) for t in model.graph.initializer]
+        offsets = []
+        size = 0
+        for tensor in tensors:
+            offsets.append(size)
+            size += -(-tensor.nbytes // WEIGHT_ALIGNMENT) * WEIGHT_ALIGNMENT
+
+        self._buffer = mmap.mmap(-1, max(size, 1))
+        self.arrays: Dict[str, np.ndarray] = {}
+        for initializer, tensor, offset in zip(model.graph.initializer, tensors, offsets):
+            array = np.frombuffer(self._buffer, dtype=tensor.dtype, count=tensor.size,
+                                  offset=offset).reshape(tensor.shape)
+            array[...] = tensor
+            array.setflags(write=False)
+            self.arrays[initializer.name] = array
+        self.nbytes = size
+        self._ort_values: Dict[str, "ort.OrtValue"] = {}
+        self._ort_values_pid: Optional[int] = None
+
+    def ort_values(self) -> Dict[str, "ort.OrtValue"]:
+        """ONNX Runtime views of the weights, created once per process."""
+        if self._ort_values_pid != os.getpid():
+            self._ort_values = {name: ort.OrtValue.ortvalue_from_numpy(array)
+                                for name, array in self.arrays.items()}
+            self._ort_values_pid = os.getpid()
+        return self._ort_values
+
+
+class PooledSession:
+    """An inference session with a reusable I/O binding.
+
+    Output buffers are allocated by ONNX Runtime the first time an input
+    shape is seen, then kept and bound directly for later calls with the
+    same shapes. Arrays returned by ``run`` are those buffers, so they are
+    only valid while the session is held.
+    """
+
+    def __init__(self, session, max_cached_shapes: int = 8):
+        """Initialize pooled session.
+
+        Args:
+            session: ONNX Runtime inference session
+            max_cached_shapes: Number of input shapes to keep output buffers for
+        """
+        self.session = session
+        self.input_names = [i.name for i in session.get_inputs()]
+        self.output_names = [o.name for o in session.get_outputs()]
+        self._binding = session.io_binding()
+        self._max_cached_shapes = max_cached_shapes
+        self._output_buffers: "OrderedDict[Tuple, List[np.ndarray]]" = OrderedDict()
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """Run the model.
+
+        Args:
+            inputs: Mapping of input name to array
+
+        Returns:
+            Output arrays in model output order
+        """
+        binding = self._binding
+        binding.clear_binding_inputs()
+        binding.clear_binding_outputs()
+
+        # The binding refers to the input memory without owning it; keep
+        # contiguous copies alive until the run has returned
+        bound = []
+        key = []
+        for name, value in inputs.items():
+            value = np.ascontiguousarray(value)
+            bound.append(value)
+            binding.bind_cpu_input(name, value)
+            key.append((name, value.shape, value.dtype.str))
+        key = tuple(key)
+
+        buffers = self._output_buffers.get(key)
+        if buffers is None:
+            for name in self.output_names:
+                binding.bind_output(name, "cpu")
+            self.session.run_with_iobinding(binding)
+            buffers = binding.copy_outputs_to_cpu()
+            self._output_buffers[key] = buffers
+            if len(self._output_buffers) > self._max_cached_shapes:
+                self._output_buffers.popitem(last=False)
+            return buffers
+
+        self._output_buffers.move_to_end(key)
+        for name, buffer in zip(self.output_names, buffers):
+            binding.bind_output(name, "cpu", 0, buffer.dtype, buffer.shape,
+                                buffer.ctypes.data)
+        self.session.run_with_iobinding(binding)
+        return buffers
+
+
+class OnnxSessionPool:
+    """Lazily loaded pool of ONNX Runtime sessions for one model.
+
+    Each caller checks out its own session, so concurrent callers run in
+    parallel instead of serializing on a single session. The intra-op thread
+    budget is split between the pooled sessions.
+    """
+
+    def __init__(self, model_file: Path,
+                 pool_size: int = 2,
+                 num_threads: int = 4,
+                 use_gpu: bool = False,
+                 shared_weights: Optional[SharedWeights] = None):
+        """Initialize session pool. No model is loaded until first use.
+
+        Args:
+            model_file: Path to the ONNX model file
+            pool_size: Number of sessions to create
+            num_threads: Total intra-op threads shared by all sessions
+            use_gpu: Whether to try the CUDA execution provider first
+            shared_weights: Weights to use instead of loading them per session
+        """
+        if ort is None:
+            raise RuntimeError("onnxruntime is required for ONNX inference")
+
+        self.model_file = Path(model_file)
+        self.pool_size = max(1, pool_size)
+        self.num_threads = max(1, num_threads)
+        self.use_gpu = use_gpu
+        self.shared_weights = shared_weights
+        self.logger = get_logger("OnnxSessionPool")
+
+        self._sessions: "queue.Queue[PooledSession]" = queue.Queue()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self.input_names: List[str] = []
+        self.output_names: List[str] = []
+        self.output_shapes: List[List] = []
+
+    def _load(self) -> None:
+        """Create the pooled sessions once."""
+        with self._load_lock:
+            if self._loaded:
+                return
+
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = max(1, self.num_threads // self.pool_size)
+            options.inter_op_num_threads = 1
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.shared_weights is not None:
+                # Prepacking would give each session a private copy of the weights
+                options.add_session_config_entry("session.disable_prepacking", "1")
+                for name, value in self.shared_weights.ort_values().items():
+                    options.add_initializer(name, value)
+
+            providers = ["CPUExecutionProvider"]
+            if self.use_gpu and "CUDAExecutionProvider" in ort.get_available_providers():
+                providers.insert(0, "CUDAExecutionProvider")
+
+            for _ in range(self.pool_size):
+                session = PooledSession(ort.InferenceSession(
+                    str(self.model_file), options, providers=providers))
+                self._sessions.put(session)
+
+            self.input_names = session.input_names
+            self.output_names = session.output_names
+            self.output_shapes = [o.shape for o in session.session.get_outputs()]
+            self._loaded = True
+            self.logger.info(f"Loaded {self.model_file} into {self.pool_size} sessions "
+                             f"with {options.intra_op_num_threads} threads each")
+
+    def load(self) -> None:
+        """Load the model now instead of on first use."""
+        if not self._loaded:
+            self._load()
+
+    def share_weights(self) -> bool:
+        """Move the weights into shared memory before forking workers.
+
+        Must be called before any session is created, so that no ONNX
+        Runtime threads exist when the process forks.
+
+        Returns:
+            True if the weights are shared
+        """
+        with self._load_lock:
+            if self.shared_weights is None and not self._loaded:
+                if onnx is None:
+                    self.logger.warning("onnx not installed, each worker loads its own weights")
+                    return False
+                self.shared_weights = SharedWeights(self.model_file)
+                self.logger.info(f"Shared {self.shared_weights.nbytes / 2 ** 20:.1f} MB "
+                                 f"of weights from {self.model_file}")
+        return self.shared_weights is not None
+
+    @contextmanager
+    def acquire(self) -> Iterator[PooledSession]:
+        """Check out a session for exclusive use.
+
+        Yields:
+            Pooled session; outputs it returns stay valid inside the block
+        """
+        if not self._loaded:
+            self._load()
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """Run the model on a pooled session.
+
+        Args:
+            inputs: Mapping of input name to array
+
+        Returns:
+            Copies of the output arrays
+        """
+        with self.acquire() as session:
+            return [output.copy() for output in session.run(inputs)]
@@ -2,51 +2,296 @@
 Voice Activity Detection (VAD) for the accent correction tool.
 """
 
+import threading
+from pathlib import Path
 import numpy as np
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Any, Optional
 from ..utils.config import Config
 from ..utils.logger import get_logger
 
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional inference backend
+    ort = None
+
+
+# Silero VAD scores fixed windows of ~30 ms (512 samples at 16 kHz)
+FRAME_DURATION = 0.032
+# Window and context samples Silero expects at each sample rate it supports;
+# v5 prepends the context, the tail of the previous window, to every window
+SILERO_WINDOWS = {8000: (256, 32), 16000: (512, 64)}
+
+
+class VADSession:
+    """Streaming VAD state for a single audio stream.
+
+    Carries the model's recurrent state, the partial frame left over from the
+    previous chunk and the speech/silence hysteresis across ``process`` calls.
+    """
+
+    def __init__(self, model: "VADModel"):
+        """Initialize VAD session.
+
+        Args:
+            model: VAD model used to score frames
+        """
+        self.model = model
+        self.frame_size = model.frame_size
+        self.state = model.initial_state()
+        self.triggered = False
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames_seen = 0
+        self._silence_run = 0
+
+    @property
+    def time(self) -> float:
+        """Stream time of the next unscored frame, in seconds."""
+        return self._frames_seen * self.frame_size / self.model.sample_rate
+
+    def process(self, chunk: np.ndarray) -> List[Dict[str, Any]]:
+        """Score a chunk and update the speech state.
+
+        Args:
+            chunk: Next audio chunk
+
+        Returns:
+            List of ``speech_start``/``speech_end`` events with times in seconds
+        """
+        buffer = np.concatenate((self._pending, np.asarray(chunk, dtype=np.float32)))
+        num_frames = len(buffer) // self.frame_size
+        self._pending = buffer[num_frames * self.frame_size:]
+        if num_frames == 0:
+            return []
+
+        frames = buffer[:num_frames * self.frame_size].reshape(1, num_frames, self.frame_size)
+        probs, self.state = self.model.score_frames(frames, self.state)
+        return self._update(probs[0])
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Close an open speech segment at the end of the stream.
+
+        Returns:
+            A final ``speech_end`` event if speech was active
+        """
+        events = []
+        if self.triggered:
+            events.append(self._event("speech_end", self._frames_seen))
+            self.triggered = False
+        self._silence_run = 0
+        return events
+
+    def _update(self, probs: np.ndarray) -> List[Dict[str, Any]]:
+        """Apply hysteresis to frame probabilities."""
+        events = []
+        model = self.model
+        for prob in probs.tolist():
+            if not self.triggered:
+                if prob >= model.threshold:
+                    self.triggered = True
+                    events.append(self._event("speech_start", self._frames_seen))
+            elif prob < model.neg_threshold:
+                self._silence_run += 1
+                if self._silence_run >= model.min_silence_frames:
+                    self.triggered = False
+                    events.append(self._event("speech_end",
+                                              self._frames_seen - self._silence_run + 1))
+                    self._silence_run = 0
+            else:
+                self._silence_run = 0
+            self._frames_seen += 1
+        return events
+
+    def _event(self, event_type: str, frame: int) -> Dict[str, Any]:
+        return {
+            "type": event_type,
+            "time": frame * self.frame_size / self.model.sample_rate
+        }
+
 
 class VADModel:
     """Voice Activity Detection model using Silero VAD."""
-    
+
     def __init__(self, config: Config):
         """Initialize VAD model.
-        
+
         Args:
             config: Configuration object
+
+        Raises:
+            ValueError: If the Silero model would run at a sample rate it
+                does not support
         """
         self.config = config
         self.logger = get_logger("VADModel")
+        self.stream_logger = get_logger("VADModel", rate_limit=1.0)
         self.threshold = config.get("audio.vad_threshold", 0.5)
-        
+        self.neg_threshold = max(self.threshold - 0.15, 0.01)
+        self.sample_rate = config.get("audio.sample_rate", 16000)
+        self.silence_threshold = config.get("audio.silence_threshold", 0.1)
+        self.model_path = Path(config.get("models.vad.model_path", "data/models/silero_vad.onnx"))
+
+        if self.sample_rate in SILERO_WINDOWS:
+            self.frame_size, self.context_size = SILERO_WINDOWS[self.sample_rate]
+        elif ort is not None and self.model_path.exists():
+            raise ValueError(f"Silero VAD supports sample rates {sorted(SILERO_WINDOWS)} Hz, "
+                             f"not {self.sample_rate} Hz")
+        else:
+            # Only the energy-based scorer runs at other rates
+            self.frame_size = int(round(FRAME_DURATION * self.sample_rate))
+            self.context_size = 0
+        min_silence = config.get("audio.vad_min_silence_duration", 0.1)
+        self.min_silence_frames = max(1, int(round(min_silence / FRAME_DURATION)))
+
+        self._session = None
+        self._state_names: List[str] = []
+        self._uses_context = False
+        self._load_lock = threading.Lock()
+        self._loaded = False
+
         self.logger.info(f"Initialized VADModel with threshold={self.threshold}")
-    
+
+    def _load(self) -> None:
+        """Load the Silero ONNX model on first use."""
+        with self._load_lock:
+            if self._loaded:
+                return
+            if ort is None:
+                self.logger.warning("onnxruntime not installed, using energy-based VAD")
+            elif not self.model_path.exists():
+                self.logger.warning(f"VAD model not found at {self.model_path}, "
+                                    "using energy-based VAD")
+            else:
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = 1
+                options.inter_op_num_threads = 1
+                self._session = ort.InferenceSession(
+                    str(self.model_path), options, providers=["CPUExecutionProvider"]
+                )
+                input_names = [i.name for i in self._session.get_inputs()]
+                # v5 exports a single "state" tensor, v4 exports "h" and "c"
+                self._state_names = [n for n in ("state", "h", "c") if n in input_names]
+                self._uses_context = "state" in input_names
+                self.logger.info(f"Loaded Silero VAD from {self.model_path}")
+            self._loaded = True
+
+    def create_session(self) -> VADSession:
+        """Create a streaming session carrying state across chunks.
+
+        Returns:
+            New VAD session
+        """
+        return VADSession(self)
+
+    def initial_state(self, batch_size: int = 1) -> Dict[str, np.ndarray]:
+        """Get zeroed recurrent state for a batch of streams.
+
+        Args:
+            batch_size: Number of streams
+
+        Returns:
+            Mapping of state input name to array
+        """
+        self._load()
+        state = {}
+        for name in self._state_names:
+            width = 128 if name == "state" else 64
+            state[name] = np.zeros((2, batch_size, width), dtype=np.float32)
+        if self._uses_context:
+            state["context"] = np.zeros((batch_size, self.context_size), dtype=np.float32)
+        return state
+
+    def score_frames(self, frames: np.ndarray,
+                     state: Optional[Dict[str, np.ndarray]] = None
+                     ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Compute speech probabilities for a batch of frame sequences.
+
+        All streams in the batch are scored in a single model call per frame
+        step. The recurrent state makes steps within a stream sequential; the
+        energy fallback scores every frame in one vectorized pass.
+
+        Args:
+            frames: Array of shape (batch, num_frames, frame_size)
+            state: Recurrent state from ``initial_state`` or a previous call
+
+        Returns:
+            Tuple of (probabilities of shape (batch, num_frames), new state)
+        """
+        self._load()
+        frames = np.asarray(frames, dtype=np.float32)
+        batch_size, num_frames, _ = frames.shape
+        if state is None:
+            state = self.initial_state(batch_size)
+
+        if self._session is None:
+            rms = np.sqrt(np.mean(frames ** 2, axis=-1))
+            return rms / (rms + self.silence_threshold), state
+
+        state = dict(state)
+        feeds = {"sr": np.array(self.sample_rate, dtype=np.int64)}
+        context = self.context_size
+        if self._uses_context:
+            window = np.empty((batch_size, context + self.frame_size), dtype=np.float32)
+            window[:, :context] = state.pop("context")
+
+        probs = np.empty((batch_size, num_frames), dtype=np.float32)
+        for i in range(num_frames):
+            if self._uses_context:
+                window[:, context:] = frames[:, i]
+                feeds["input"] = window
+            else:
+                feeds["input"] = frames[:, i]
+            for name in self._state_names:
+                feeds[name] = state[name]
+
+            outputs = self._session.run(None, feeds)
+            probs[:, i] = outputs[0].reshape(batch_size)
+            for name, value in zip(self._state_names, outputs[1:]):
+                state[name] = value
+            if self._uses_context:
+                window[:, :context] = window[:, -context:]
+
+        if self._uses_context:
+            state["context"] = window[:, :context].copy()
+        return probs, state
+
     def detect_speech(self, audio_data: np.ndarray) -> List[Tuple[float, float]]:
         """Detect speech segments in audio.
-        
+
         Args:
             audio_data: Audio data as numpy array
-            
+
         Returns:
             List of (start_time, end_time) tuples for speech segments
         """
-        # TODO: Implement actual VAD using Silero
-        self.logger.info("Detecting speech segments")
-        
-        # For now, return dummy segments
-        duration = len(audio_data) / 16000  # Assuming 16kHz
-        return [(0.0, duration)]
-    
+        self.stream_logger.debug("Detecting speech segments in {} samples", len(audio_data))
+
+        session = self.create_session()
+        events = session.process(audio_data) + session.flush()
+
+        segments = []
+        start = None
+        for event in events:
+            if event["type"] == "speech_start":
+                start = event["time"]
+            elif start is not None:
+                segments.append((start, event["time"]))
+                start = None
+        return segments
+
     def is_speech(self, audio_chunk: np.ndarray) -> bool:
         """Check if audio chunk contains speech.
-        
+
         Args:
             audio_chunk: Audio chunk as numpy array
-            
+
         Returns:
             True if speech detected, False otherwise
         """
-        # TODO: Implement actual VAD
-        return True  # For now, assume all audio contains speech 
\ No newline at end of file
+        num_frames = len(audio_chunk) // self.frame_size
+        if num_frames == 0:
+            return False
+
+        frames = np.asarray(audio_chunk[:num_frames * self.frame_size]).reshape(
+            1, num_frames, self.frame_size)
+        probs, _ = self.score_frames(frames)
+        return bool(np.max(probs) >= self.threshold)
@@ -2,6 +2,13 @@
 Personalization modules for the accent correction tool.
 """
 
-from .engine import PersonalizationEngine
+from ..utils.lazy import lazy_exports
 
-__all__ = ["PersonalizationEngine"] 
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "PersonalizationEngine": ".engine",
+    "ConfusionMatrix": ".confusion",
+    "ProgressStore": ".storage",
+    "PracticeScheduler": ".scheduler",
+})
+
+__all__ = ["PersonalizationEngine", "ConfusionMatrix", "ProgressStore", "PracticeScheduler"]
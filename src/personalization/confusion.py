@@ -0,0 +1,180 @@
+"""
+Array-backed phoneme confusion statistics.
+"""
+
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import numpy as np
+from ..utils.phoneme_utils import PHONEME_SYMBOLS, PHONEME_IDS, UNKNOWN_ID, encode_phonemes
+
+
+class ConfusionMatrix:
+    """Expected x recognized phoneme counts and per-phoneme score averages.
+
+    Rows and columns are global phoneme IDs (``PHONEME_SYMBOLS``); the last
+    column counts recognitions outside the phoneme table, such as blanks.
+    Alongside the matrix, per-phoneme attempt and success counts and an
+    exponentially weighted moving average of the score are kept in flat
+    arrays, so an utterance updates everything with a few scatter-adds and
+    queries are vectorized over the whole inventory.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        n = len(PHONEME_SYMBOLS)
+        self.num_phonemes = n
+        self.other_id = n
+        self.counts = np.zeros((n, n + 1), dtype=np.int64)
+        self.attempts = np.zeros(n, dtype=np.int64)
+        self.successes = np.zeros(n, dtype=np.int64)
+        self.average_score = np.zeros(n, dtype=np.float64)
+
+    def update(self, phoneme_scores: List[Dict[str, Any]], threshold: float,
+               adaptation_rate: float) -> int:
+        """Add one utterance's phoneme scores.
+
+        A phoneme scored ``k`` times with mean score ``m`` moves its average
+        by weight ``1 - (1 - adaptation_rate) ** k`` towards ``m``, which is
+        what ``k`` sequential EWMA steps do for equal scores. A phoneme's
+        first scores set its average directly.
+
+        Args:
+            phoneme_scores: Scores with ``phoneme``, ``score`` and optionally
+                ``recognized``; without it the phoneme counts as recognized
+            threshold: Scores above this count as successful attempts
+            adaptation_rate: EWMA smoothing factor in (0, 1]
+
+        Returns:
+            Number of scores recorded; phonemes outside the table are skipped
+        """
+        if not phoneme_scores:
+            return 0
+        expected = encode_phonemes([s["phoneme"] for s in phoneme_scores])
+        recognized = encode_phonemes([s.get("recognized", s["phoneme"]) for s in phoneme_scores])
+        scores = np.fromiter((s["score"] for s in phoneme_scores), dtype=np.float64,
+                             count=len(phoneme_scores))
+
+        known = expected != UNKNOWN_ID
+        if not known.all():
+            expected, recognized, scores = expected[known], recognized[known], scores[known]
+            if len(expected) == 0:
+                return 0
+        recognized[recognized == UNKNOWN_ID] = self.other_id
+
+        np.add.at(self.counts, (expected, recognized), 1)
+
+        # Per-phoneme aggregates over the utterance, sized by the utterance
+        # rather than the inventory
+        ids, inverse = np.unique(expected, return_inverse=True)
+        k = np.bincount(inverse, minlength=len(ids))
+        mean = np.bincount(inverse, weights=scores, minlength=len(ids)) / k
+        successes = np.bincount(inverse, weights=scores > threshold, minlength=len(ids))
+
+        weight = 1.0 - (1.0 - adaptation_rate) ** k
+        weight[self.attempts[ids] == 0] = 1.0
+        self.average_score[ids] += weight * (mean - self.average_score[ids])
+        self.attempts[ids] += k
+        self.successes[ids] += successes.astype(np.int64)
+        return len(expected)
+
+    def success_rate(self) -> np.ndarray:
+        """Successful fraction of attempts per phoneme; NaN if never attempted."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.successes / self.attempts
+
+    def weak_phonemes(self, max_success_rate: float = 0.7, min_attempts: int = 1) -> List[str]:
+        """Phonemes whose success rate is below a threshold.
+
+        Args:
+            max_success_rate: Phonemes succeeding less often than this are weak
+            min_attempts: Ignore phonemes attempted fewer times
+
+        Returns:
+            Phoneme symbols, lowest average score first
+        """
+        attempted = self.attempts >= max(min_attempts, 1)
+        weak = np.flatnonzero(attempted & (self.successes < max_success_rate * self.attempts))
+        weak = weak[np.argsort(self.average_score[weak], kind="stable")]
+        return [PHONEME_SYMBOLS[i] for i in weak.tolist()]
+
+    def top_confusions(self, count: int = 10,
+                       phoneme: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """Most frequent substitutions.
+
+        Args:
+            count: Maximum number of confusions
+            phoneme: Only confusions of this expected phoneme
+
+        Returns:
+            List of (expected, recognized, count), most frequent first;
+            recognitions outside the phoneme table are reported as ''
+        """
+        if phoneme is not None:
+            row = PHONEME_IDS.get(phoneme)
+            if row is None:
+                return []
+            counts = self.counts[row:row + 1].copy()
+            counts[0, row] = 0
+            offset = row
+        else:
+            counts = self.counts.copy()
+            diagonal = np.arange(self.num_phonemes)
+            counts[diagonal, diagonal] = 0
+            offset = 0
+
+        flat = counts.ravel()
+        count = min(count, int(np.count_nonzero(flat)))
+        if count <= 0:
+            return []
+        top = np.argpartition(flat, -count)[-count:]
+        top = top[np.argsort(-flat[top], kind="stable")]
+        width = self.num_phonemes + 1
+        return [
+            (PHONEME_SYMBOLS[offset + index // width],
+             PHONEME_SYMBOLS[index % width] if index % width < self.num_phonemes else "",
+             int(flat[index]))
+            for index in top.tolist()
+        ]
+
+    def stats(self, phoneme: str) -> Dict[str, Any]:
+        """Attempt statistics of one phoneme.
+
+        Args:
+            phoneme: Phoneme symbol
+
+        Returns:
+            Dictionary with total_attempts, successful_attempts and average_score
+        """
+        index = PHONEME_IDS.get(phoneme)
+        if index is None:
+            return {"total_attempts": 0, "successful_attempts": 0, "average_score": 0.0}
+        return {
+            "total_attempts": int(self.attempts[index]),
+            "successful_attempts": int(self.successes[index]),
+            "average_score": float(self.average_score[index]),
+        }
+
+    def restore(self, confusions: Iterable[Tuple[str, str, int]],
+                stats: Dict[str, Dict[str, Any]]) -> None:
+        """Replace all statistics with stored ones.
+
+        Args:
+            confusions: (expected, recognized, count) triples; '' or unknown
+                recognized phonemes go to the out-of-table column
+            stats: ``stats`` output by phoneme
+        """
+        self.reset()
+        for expected, recognized, count in confusions:
+            row = PHONEME_IDS.get(expected)
+            if row is not None:
+                self.counts[row, PHONEME_IDS.get(recognized, self.other_id)] += count
+        for phoneme, values in stats.items():
+            index = PHONEME_IDS.get(phoneme)
+            if index is not None:
+                self.attempts[index] = values["total_attempts"]
+                self.successes[index] = values["successful_attempts"]
+                self.average_score[index] = values["average_score"]
+
+    def reset(self) -> None:
+        """Discard all statistics."""
+        for array in (self.counts, self.attempts, self.successes, self.average_score):
+            array.fill(0)
@@ -2,94 +2,201 @@
 Personalization engine for user adaptation.
 """
 
-from typing import List, Dict, Any
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional
 from ..utils.config import Config
 from ..utils.logger import get_logger
+from ..utils.phoneme_utils import PHONEME_IDS
+from .confusion import ConfusionMatrix
+from .scheduler import DAY, PracticeScheduler, quality_from_score
+from .storage import ProgressStore
 
 
 class PersonalizationEngine:
     """Personalization engine for user adaptation and spaced repetition."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, store: Optional[ProgressStore] = None,
+                 user_id: str = "default"):
         """Initialize personalization engine.
         
         Args:
             config: Configuration object
+            store: Progress store. Opened from ``storage.database`` on first
+                use when score, confusion or schedule storage is enabled.
+            user_id: User whose progress is tracked
         """
         self.config = config
         self.logger = get_logger("PersonalizationEngine")
-        self.confusion_matrix = {}
+        self.stream_logger = get_logger("PersonalizationEngine", rate_limit=1.0)
+        self.confusion_matrix = ConfusionMatrix()
+        self.scheduler = PracticeScheduler(config.settings.personalization.relearn_interval)
         self.user_progress = {}
+        self.user_id = user_id
+        self.session_id = uuid.uuid4().hex
+        self._store = store
         
         self.logger.info("Initialized PersonalizationEngine")
     
+    @property
+    def store(self) -> Optional[ProgressStore]:
+        """Progress store, or None if storage is disabled."""
+        if self._store is None:
+            storage = self.config.get_storage_config()
+            if (storage.get("scores_storage") or storage.get("confusion_matrix_storage")
+                    or storage.get("schedule_storage")):
+                self._store = ProgressStore(
+                    storage.get("database", "sqlite:///data/user_progress.db"),
+                    flush_interval=storage.get("flush_interval", 1.0),
+                    checkpoint_interval=storage.get("checkpoint_interval", 30.0)
+                )
+        return self._store
+    
     def update_confusion_matrix(self, phoneme_scores: List[Dict[str, Any]]) -> None:
         """Update confusion matrix with new phoneme scores.
         
         Args:
             phoneme_scores: List of phoneme scores
         """
-        # TODO: Implement confusion matrix update
-        self.logger.info("Updating confusion matrix")
+        self.stream_logger.debug("Updating confusion matrix with {} scores", len(phoneme_scores))
         
-        for score in phoneme_scores:
-            phoneme = score["phoneme"]
-            if phoneme not in self.confusion_matrix:
-                self.confusion_matrix[phoneme] = {
-                    "total_attempts": 0,
-                    "successful_attempts": 0,
-                    "average_score": 0.0
-                }
-            
-            self.confusion_matrix[phoneme]["total_attempts"] += 1
-            if score["score"] > self.config.get("scoring.threshold", 0.6):
-                self.confusion_matrix[phoneme]["successful_attempts"] += 1
+        settings = self.config.settings
+        storage = self.config.get_storage_config()
+        store = self.store
+        if store is not None and storage.get("scores_storage"):
+            store.record_scores(self.user_id, self.session_id, phoneme_scores)
+        if settings.personalization.spaced_repetition:
+            self._schedule_reviews(phoneme_scores)
+        if not settings.personalization.confusion_matrix:
+            return
+        self.confusion_matrix.update(phoneme_scores, settings.scoring.threshold,
+                                     settings.personalization.adaptation_rate)
+        
+        if store is not None and storage.get("confusion_matrix_storage"):
+            # Queued for the background writer; never waits on the disk.
+            # Like the in-memory matrix, only phonemes of the table are kept
+            pairs = Counter((s["phoneme"], s.get("recognized", s["phoneme"]))
+                            for s in phoneme_scores if s["phoneme"] in PHONEME_IDS)
+            store.record_confusions(self.user_id, ((e, r, c) for (e, r), c in pairs.items()))
+            store.record_phoneme_stats(self.user_id, {
+                phoneme: self.confusion_matrix.stats(phoneme)
+                for phoneme in {expected for expected, _ in pairs}
+            })
     
     def get_weak_phonemes(self) -> List[str]:
         """Get list of user's weak phonemes.
         
         Returns:
-            List of phoneme symbols that need practice
+            Phonemes succeeding in fewer than 70% of attempts, lowest
+            average score first
+        """
+        return self.confusion_matrix.weak_phonemes(max_success_rate=0.7)
+    
+    def _schedule_reviews(self, phoneme_scores: List[Dict[str, Any]]) -> None:
+        """Review each phoneme and substitution of an utterance once.
+        
+        A phoneme recognized correctly also counts as a successful review of
+        the minimal pairs already scheduled for it, so that a contrast the
+        learner has mastered graduates instead of only ever recording lapses.
+        
+        Args:
+            phoneme_scores: List of phoneme scores
         """
-        # TODO: Implement weak phoneme detection
-        weak_phonemes = []
+        now = time.time()
+        scores = defaultdict(list)
+        correct = defaultdict(list)
+        for score in phoneme_scores:
+            phoneme = score["phoneme"]
+            if phoneme not in PHONEME_IDS:
+                continue
+            scores[("phoneme", phoneme)].append(score["score"])
+            recognized = score.get("recognized", phoneme)
+            if recognized == phoneme:
+                correct[phoneme].append(score["score"])
+            elif recognized in PHONEME_IDS:
+                scores[("minimal_pair", phoneme, recognized)].append(score["score"])
+        for phoneme, values in correct.items():
+            for key in self.scheduler.minimal_pairs(phoneme):
+                # A contrast confused in this utterance is reviewed as a failure
+                if key not in scores:
+                    scores[key] = values
         
-        for phoneme, stats in self.confusion_matrix.items():
-            if stats["total_attempts"] > 0:
-                success_rate = stats["successful_attempts"] / stats["total_attempts"]
-                if success_rate < 0.7:  # 70% success threshold
-                    weak_phonemes.append(phoneme)
+        reviewed = [
+            self.scheduler.review(key, quality_from_score(sum(values) / len(values)), now)
+            for key, values in scores.items()
+        ]
         
-        return weak_phonemes
+        store = self.store
+        if store is not None and self.config.get("storage.schedule_storage"):
+            store.record_schedule(self.user_id, reviewed)
     
-    def generate_practice_schedule(self) -> List[Dict[str, Any]]:
+    def generate_practice_schedule(self, count: int = 10) -> List[Dict[str, Any]]:
         """Generate practice schedule based on spaced repetition.
         
+        Args:
+            count: Maximum number of practice items
+            
         Returns:
-            List of practice items
+            List of practice items, most urgent first
         """
-        # TODO: Implement spaced repetition scheduling
         self.logger.info("Generating practice schedule")
         
-        weak_phonemes = self.get_weak_phonemes()
-        schedule = []
+        if not self.config.settings.personalization.spaced_repetition:
+            return [
+                {"phoneme": phoneme, "type": "minimal_pair", "difficulty": "medium",
+                 "priority": "high"}
+                for phoneme in self.get_weak_phonemes()[:count]
+            ]
         
-        for phoneme in weak_phonemes:
-            schedule.append({
-                "phoneme": phoneme,
-                "type": "minimal_pair",
-                "difficulty": "medium",
-                "priority": "high"
-            })
+        now = time.time()
+        schedule = []
+        for item in self.scheduler.next_items(count):
+            if item.easiness < 1.8:
+                difficulty = "hard"
+            elif item.easiness < 2.3:
+                difficulty = "medium"
+            else:
+                difficulty = "easy"
+            if item.due <= now:
+                priority = "high"
+            elif item.due <= now + DAY:
+                priority = "medium"
+            else:
+                priority = "low"
+            entry = {
+                "phoneme": item.phonemes[0],
+                "type": item.kind,
+                "difficulty": difficulty,
+                "priority": priority,
+                "due": item.due
+            }
+            if item.kind == "minimal_pair":
+                entry["contrast"] = item.phonemes[1]
+            schedule.append(entry)
         
         return schedule
     
     def save_user_progress(self) -> None:
-        """Save user progress to storage."""
-        # TODO: Implement progress saving
+        """Commit queued progress updates to storage."""
         self.logger.info("Saving user progress")
+        if self.store is not None:
+            self.store.flush()
     
     def load_user_progress(self) -> None:
-        """Load user progress from storage."""
-        # TODO: Implement progress loading
-        self.logger.info("Loading user progress") 
\ No newline at end of file
+        """Load the user's confusion statistics and practice schedule from storage."""
+        self.logger.info("Loading user progress")
+        store = self.store
+        if store is None:
+            return
+        store.flush()
+        self.confusion_matrix.restore(store.load_confusions(self.user_id),
+                                      store.load_phoneme_stats(self.user_id))
+        if self.config.get("storage.schedule_storage"):
+            self.scheduler.restore(store.load_schedule(self.user_id))
+    
+    def close(self) -> None:
+        """Commit pending progress and close the store."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -0,0 +1,185 @@
+"""
+Spaced-repetition scheduling of practice items.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# ("phoneme", symbol) or ("minimal_pair", expected, confused-with)
+ItemKey = Tuple[str, ...]
+
+DAY = 86400.0
+
+
+class PracticeItem:
+    """SM-2 review state of one practice item."""
+
+    __slots__ = ("key", "easiness", "interval", "repetitions", "lapses", "due")
+
+    def __init__(self, key: ItemKey, due: float):
+        self.key = key
+        self.easiness = 2.5
+        self.interval = 0.0
+        self.repetitions = 0
+        self.lapses = 0
+        self.due = due
+
+    @property
+    def kind(self) -> str:
+        return self.key[0]
+
+    @property
+    def phonemes(self) -> Tuple[str, ...]:
+        return self.key[1:]
+
+
+def quality_from_score(score: float) -> int:
+    """Map a pronunciation score in [0, 1] to an SM-2 grade in 0..5."""
+    return min(5, max(0, int(round(score * 5))))
+
+
+class PracticeScheduler:
+    """SM-2 scheduler with a due-time priority heap.
+
+    Items live in a dict by key; the heap holds ``[due, sequence, key]``
+    entries. Rescheduling pushes a new entry and invalidates the old one in
+    place instead of searching the heap, so a review is O(log n), and stale
+    entries are dropped when they reach the top. Taking the next ``k`` items
+    pops and re-pushes them, which is O(k log n).
+    """
+
+    def __init__(self, relearn_interval: float = 600.0):
+        """Initialize scheduler.
+
+        Args:
+            relearn_interval: Seconds until a failed item is due again
+        """
+        self.relearn_interval = relearn_interval
+        self._items: Dict[ItemKey, PracticeItem] = {}
+        self._entries: Dict[ItemKey, list] = {}
+        self._heap: List[list] = []
+        self._sequence = itertools.count()
+        # Expected phoneme -> keys of its scheduled minimal pairs
+        self._pairs: Dict[str, Set[ItemKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: ItemKey) -> bool:
+        return key in self._items
+
+    def get(self, key: ItemKey) -> Optional[PracticeItem]:
+        """Review state of an item, or None if it is not scheduled."""
+        return self._items.get(key)
+
+    def minimal_pairs(self, phoneme: str) -> List[ItemKey]:
+        """Keys of the scheduled minimal pairs whose expected phoneme is ``phoneme``."""
+        return list(self._pairs.get(phoneme, ()))
+
+    def add(self, key: ItemKey, due: Optional[float] = None) -> PracticeItem:
+        """Schedule a new item; existing items are left unchanged.
+
+        Args:
+            key: Item key
+            due: Due time. Defaults to now.
+
+        Returns:
+            Review state of the item
+        """
+        item = self._items.get(key)
+        if item is None:
+            item = self._items[key] = PracticeItem(key, time.time() if due is None else due)
+            self._index(key)
+            self._push(item)
+        return item
+
+    def review(self, key: ItemKey, quality: int, now: Optional[float] = None) -> PracticeItem:
+        """Record an attempt and reschedule the item.
+
+        Args:
+            key: Item key; unknown items are added first
+            quality: SM-2 grade from 0 (failed) to 5 (perfect)
+            now: Time of the attempt. Defaults to now.
+
+        Returns:
+            Updated review state
+        """
+        if now is None:
+            now = time.time()
+        item = self.add(key, now)
+
+        if quality >= 3:
+            if item.repetitions == 0:
+                item.interval = DAY
+            elif item.repetitions == 1:
+                item.interval = 6 * DAY
+            else:
+                item.interval *= item.easiness
+            item.repetitions += 1
+        else:
+            item.repetitions = 0
+            item.lapses += 1
+            item.interval = self.relearn_interval
+        item.easiness = max(1.3, item.easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        item.due = now + item.interval
+
+        self._push(item)
+        return item
+
+    def restore(self, items: Iterable[PracticeItem]) -> None:
+        """Replace all items with previously saved review states.
+
+        Args:
+            items: Review states, e.g. from ``ProgressStore.load_schedule``
+        """
+        self._items = {item.key: item for item in items}
+        self._pairs = {}
+        for key in self._items:
+            self._index(key)
+        self._heap = [[item.due, next(self._sequence), item.key] for item in self._items.values()]
+        self._entries = {entry[2]: entry for entry in self._heap}
+        heapq.heapify(self._heap)
+
+    def remove(self, key: ItemKey) -> None:
+        """Unschedule an item."""
+        if self._items.pop(key, None) is not None:
+            self._entries.pop(key)[2] = None
+            if key[0] == "minimal_pair":
+                self._pairs[key[1]].discard(key)
+
+    def next_items(self, count: int) -> List[PracticeItem]:
+        """Items with the earliest due times, whether due yet or not.
+
+        Args:
+            count: Maximum number of items
+
+        Returns:
+            Review states, earliest due first
+        """
+        taken = []
+        while self._heap and len(taken) < count:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is not None:
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return [self._items[entry[2]] for entry in taken]
+
+    def _index(self, key: ItemKey) -> None:
+        if key[0] == "minimal_pair":
+            self._pairs.setdefault(key[1], set()).add(key)
+
+    def _push(self, item: PracticeItem) -> None:
+        """Add a heap entry for the item's due time, invalidating the old one."""
+        old = self._entries.get(item.key)
+        if old is not None:
+            old[2] = None
+        entry = [item.due, next(self._sequence), item.key]
+        self._entries[item.key] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._items) + 64:
+            # Mostly stale entries: rebuild so memory stays proportional to the items
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
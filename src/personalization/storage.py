@@ -0,0 +1,341 @@
+"""
+SQLite persistence of user progress with write-behind batching.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from ..utils.logger import get_logger
+from .scheduler import PracticeItem
+
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS scores ("
+    " user_id TEXT NOT NULL, session_id TEXT NOT NULL, timestamp REAL NOT NULL,"
+    " phoneme TEXT NOT NULL, recognized TEXT, score REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS scores_user ON scores (user_id, timestamp)",
+    "CREATE TABLE IF NOT EXISTS confusions ("
+    " user_id TEXT NOT NULL, expected TEXT NOT NULL, recognized TEXT NOT NULL,"
+    " count INTEGER NOT NULL, PRIMARY KEY (user_id, expected, recognized))",
+    "CREATE TABLE IF NOT EXISTS phoneme_stats ("
+    " user_id TEXT NOT NULL, phoneme TEXT NOT NULL, attempts INTEGER NOT NULL,"
+    " successes INTEGER NOT NULL, average_score REAL NOT NULL,"
+    " PRIMARY KEY (user_id, phoneme))",
+    "CREATE TABLE IF NOT EXISTS schedule ("
+    " user_id TEXT NOT NULL, kind TEXT NOT NULL, phoneme TEXT NOT NULL,"
+    " contrast TEXT NOT NULL, easiness REAL NOT NULL, interval REAL NOT NULL,"
+    " repetitions INTEGER NOT NULL, lapses INTEGER NOT NULL, due REAL NOT NULL,"
+    " PRIMARY KEY (user_id, kind, phoneme, contrast))",
+)
+
+# Statements are constants so sqlite3's statement cache prepares each once
+INSERT_SCORE = "INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?)"
+ADD_CONFUSION = ("INSERT INTO confusions VALUES (?, ?, ?, ?) "
+                 "ON CONFLICT (user_id, expected, recognized) "
+                 "DO UPDATE SET count = count + excluded.count")
+PUT_PHONEME_STATS = "INSERT OR REPLACE INTO phoneme_stats VALUES (?, ?, ?, ?, ?)"
+PUT_SCHEDULE = "INSERT OR REPLACE INTO schedule VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+def database_path(url: str) -> str:
+    """Resolve a ``sqlite:///path`` URL or a plain path to a database file.
+
+    Args:
+        url: Value of ``storage.database``
+
+    Returns:
+        File path, or ``:memory:``
+    """
+    if url.startswith("sqlite:///"):
+        return url[len("sqlite:///"):]
+    if url.startswith("sqlite://"):
+        return url[len("sqlite://"):] or ":memory:"
+    return url
+
+
+class ProgressStore:
+    """Write-behind store of scores, confusions, per-phoneme statistics and
+    the practice schedule.
+
+    Writes are queued and committed by a background thread in one
+    transaction per flush interval, so callers never wait on the disk. The
+    database runs in WAL mode with ``synchronous=NORMAL``: commits append to
+    the log without an fsync. A crash of the application loses at most the
+    writes of the current flush interval, but an OS crash or power loss can
+    also roll back commits not yet checkpointed into the database file. The
+    writer checkpoints, which syncs the log, at most every checkpoint
+    interval, bounding that loss to the flush plus checkpoint intervals.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_interval: float = 1.0,
+                 checkpoint_interval: float = 30.0):
+        """Open the database and start the writer thread.
+
+        Args:
+            path: Database file or ``sqlite:///`` URL
+            flush_interval: Maximum seconds a queued write waits for its commit
+            checkpoint_interval: Seconds after a commit before the writer
+                checkpoints it to durable storage
+        """
+        self.logger = get_logger("ProgressStore")
+        self.path = database_path(str(path))
+        self.flush_interval = flush_interval
+        self.checkpoint_interval = checkpoint_interval
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer",
+                                        daemon=True)
+        self._writer.start()
+        self.logger.info(f"Opened progress store at {self.path}")
+
+    def record_scores(self, user_id: str, session_id: str,
+                      phoneme_scores: List[Dict[str, Any]]) -> None:
+        """Queue one utterance's phoneme scores.
+
+        Args:
+            user_id: User identifier
+            session_id: Practice session identifier
+            phoneme_scores: Scores with ``phoneme``, ``score`` and optionally ``recognized``
+        """
+        now = time.time()
+        self._put(INSERT_SCORE, [
+            (user_id, session_id, now, s["phoneme"], s.get("recognized"), float(s["score"]))
+            for s in phoneme_scores
+        ])
+
+    def record_confusions(self, user_id: str,
+                          counts: Iterable[Tuple[str, str, int]]) -> None:
+        """Queue increments of expected x recognized counts.
+
+        Args:
+            user_id: User identifier
+            counts: (expected, recognized, count to add) triples
+        """
+        self._put(ADD_CONFUSION, [(user_id, e, r, int(c)) for e, r, c in counts])
+
+    def record_phoneme_stats(self, user_id: str, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Queue the current statistics of some phonemes, replacing stored ones.
+
+        Args:
+            user_id: User identifier
+            stats: ``ConfusionMatrix.stats`` output by phoneme
+        """
+        self._put(PUT_PHONEME_STATS, [
+            (user_id, phoneme, s["total_attempts"], s["successful_attempts"], s["average_score"])
+            for phoneme, s in stats.items()
+        ])
+
+    def record_schedule(self, user_id: str, items: Iterable[PracticeItem]) -> None:
+        """Queue the current review state of some practice items, replacing stored ones.
+
+        Args:
+            user_id: User identifier
+            items: Practice items from the scheduler
+        """
+        self._put(PUT_SCHEDULE, [
+            (user_id, item.kind, item.phonemes[0],
+             item.phonemes[1] if len(item.phonemes) > 1 else "",
+             item.easiness, item.interval, item.repetitions, item.lapses, item.due)
+            for item in items
+        ])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Commit everything queued so far.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the writes were committed within the timeout; False also
+            when the store is closed or its writer has stopped
+        """
+        if self._closed or not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Wait in slices so a writer that dies meanwhile cannot block us forever
+        while not done.is_set():
+            if not self._writer.is_alive():
+                return False
+            remaining = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            done.wait(remaining)
+        return True
+
+    def load_confusions(self, user_id: str) -> List[Tuple[str, str, int]]:
+        """Committed confusion counts of a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            (expected, recognized, count) triples
+        """
+        return self._read("SELECT expected, recognized, count FROM confusions "
+                          "WHERE user_id = ?", (user_id,))
+
+    def load_phoneme_stats(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """Committed per-phoneme statistics of a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Statistics by phoneme, in ``ConfusionMatrix.stats`` format
+        """
+        rows = self._read("SELECT phoneme, attempts, successes, average_score "
+                          "FROM phoneme_stats WHERE user_id = ?", (user_id,))
+        return {phoneme: {"total_attempts": attempts, "successful_attempts": successes,
+                          "average_score": average}
+                for phoneme, attempts, successes, average in rows}
+
+    def load_schedule(self, user_id: str) -> List[PracticeItem]:
+        """Committed practice schedule of a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Review states of the user's practice items
+        """
+        rows = self._read("SELECT kind, phoneme, contrast, easiness, interval, repetitions,"
+                          " lapses, due FROM schedule WHERE user_id = ?", (user_id,))
+        items = []
+        for kind, phoneme, contrast, easiness, interval, repetitions, lapses, due in rows:
+            key = (kind, phoneme, contrast) if contrast else (kind, phoneme)
+            item = PracticeItem(key, due)
+            item.easiness = easiness
+            item.interval = interval
+            item.repetitions = repetitions
+            item.lapses = lapses
+            items.append(item)
+        return items
+
+    def load_scores(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Most recent committed scores of a user.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of scores
+
+        Returns:
+            Scores, newest first
+        """
+        rows = self._read("SELECT session_id, timestamp, phoneme, recognized, score "
+                          "FROM scores WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?",
+                          (user_id, limit))
+        return [{"session_id": session, "timestamp": timestamp, "phoneme": phoneme,
+                 "recognized": recognized, "score": score}
+                for session, timestamp, phoneme, recognized, score in rows]
+
+    def _put(self, sql: str, rows: List[Tuple]) -> None:
+        """Queue rows for the writer thread.
+
+        Raises:
+            RuntimeError: If the store is closed or its writer has stopped
+        """
+        if self._closed or not self._writer.is_alive():
+            raise RuntimeError(f"Progress store {self.path} is closed")
+        self._queue.put((sql, rows))
+
+    def _read(self, sql: str, params: Tuple) -> List[Tuple]:
+        """Run a query on committed data."""
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _write_loop(self) -> None:
+        """Writer thread: batch queued writes into one transaction per interval."""
+        closing = False
+        # Time by which the oldest commit not checkpointed yet is checkpointed
+        checkpoint_due: Optional[float] = None
+        while not closing:
+            batch: Dict[str, List[Tuple]] = {}
+            waiters = []
+            try:
+                # Wake up for a due checkpoint even when no writes arrive
+                timeout = None
+                if checkpoint_due is not None:
+                    timeout = max(0.0, checkpoint_due - time.monotonic())
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._checkpoint()
+                checkpoint_due = None
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                sql, params = item
+                if sql is _CLOSE:
+                    closing = True
+                    waiters.append(params)
+                elif sql is _FLUSH:
+                    waiters.append(params)
+                else:
+                    batch.setdefault(sql, []).extend(params)
+                if waiters:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+                if checkpoint_due is None:
+                    checkpoint_due = time.monotonic() + self.checkpoint_interval
+            if checkpoint_due is not None and time.monotonic() >= checkpoint_due:
+                self._checkpoint()
+                checkpoint_due = None
+            for waiter in waiters:
+                waiter.set()
+
+    def _commit(self, batch: Dict[str, List[Tuple]]) -> None:
+        """Write one batch in a single transaction."""
+        try:
+            with self._lock, self._db:
+                for sql, rows in batch.items():
+                    self._db.executemany(sql, rows)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to write {sum(map(len, batch.values()))} "
+                              f"progress rows: {e}")
+
+    def _checkpoint(self) -> None:
+        """Copy committed transactions from the log into the database file."""
+        try:
+            with self._lock:
+                self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to checkpoint {self.path}: {e}")
+
+    def close(self) -> None:
+        """Commit pending writes, stop the writer and close the database."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put((_CLOSE, done))
+            self._writer.join()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,244 @@
+"""
+Pre-fork worker supervisor sharing loaded model weights.
+"""
+
+import gc
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from .utils.config import Config
+from .utils.logger import get_logger
+
+
+# Fields of /proc/<pid>/smaps_rollup reported per worker, in kB
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """Memory use of a process on Linux.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        ``rss_mb``, and when ``smaps_rollup`` is available ``pss_mb`` (RSS
+        with shared pages divided among their users), ``shared_mb`` and
+        ``private_mb``; empty if the process is gone
+    """
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[0][:-1] in _SMAPS_FIELDS:
+                    values[parts[0][:-1]] = int(parts[1]) / 1024.0
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return {"rss_mb": int(line.split()[1]) / 1024.0}
+        except OSError:
+            pass
+        return {}
+    return {
+        "rss_mb": values.get("Rss", 0.0),
+        "pss_mb": values.get("Pss", 0.0),
+        "shared_mb": values.get("Shared_Clean", 0.0) + values.get("Shared_Dirty", 0.0),
+        "private_mb": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
+
+
+def _exit_on_signal(signum: int, frame: Any) -> None:
+    raise SystemExit(0)
+
+
+class PreforkSupervisor:
+    """Loads models once and runs the application in forked workers.
+
+    The supervisor moves the acoustic model weights into shared memory and
+    freezes the Python heap (``gc.freeze``) before forking, so workers share
+    the weights and the preloaded interpreter state instead of each holding
+    a private copy. Workers that exit unexpectedly are restarted, and the
+    memory of each worker can be reported from ``/proc``.
+    """
+
+    def __init__(self, config: Config, components: Any,
+                 worker_main: Callable[[int, Any], None],
+                 num_workers: Optional[int] = None,
+                 restart_delay: float = 1.0,
+                 report_interval: float = 60.0):
+        """Initialize supervisor.
+
+        Args:
+            config: Configuration object
+            components: Component registry; preloaded here, used by every worker
+            worker_main: Runs in each worker as ``worker_main(index, components)``
+            num_workers: Number of workers. Defaults to the CPU count.
+            restart_delay: Seconds to wait before restarting a failed worker
+            report_interval: Seconds between memory reports in ``run``; 0 disables them
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-fork workers require os.fork")
+        self.config = config
+        self.components = components
+        self.worker_main = worker_main
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.restart_delay = restart_delay
+        self.report_interval = report_interval
+        self.logger = get_logger("PreforkSupervisor")
+
+        self.workers: Dict[int, int] = {}
+        self.restarts = 0
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+        self._preloaded = False
+
+    def preload(self) -> None:
+        """Load shared state in the supervisor before any worker is forked."""
+        if self._preloaded:
+            return
+        acoustic_model = self.components.acoustic_model
+        if acoustic_model.share_weights():
+            self.logger.info("Acoustic model weights shared with workers")
+        # Build the label tables now so workers inherit them
+        acoustic_model.label_phoneme_ids
+        self.components.vad_model
+
+        # Move everything allocated so far out of the collector's reach:
+        # collections in workers would otherwise write to every object
+        # header and copy the pages holding them
+        gc.collect()
+        gc.freeze()
+        self._preloaded = True
+
+    def start(self) -> None:
+        """Preload and fork all workers."""
+        self.preload()
+        for index in range(self.num_workers):
+            self._spawn(index)
+        self.logger.info(f"Started {self.num_workers} workers")
+
+    def _spawn(self, index: int) -> None:
+        """Fork one worker."""
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                # Exit through SystemExit so the worker's cleanup runs
+                signal.signal(signal.SIGTERM, _exit_on_signal)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                self.worker_main(index, self.components)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                self.logger.exception(f"Worker {index} failed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = index
+
+    def poll(self) -> None:
+        """Reap exited workers and restart those that are due."""
+        while self.workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            index = self.workers.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") \
+                else status
+            self.logger.warning(f"Worker {index} (pid {pid}) exited with status {code}, "
+                                f"restarting in {self.restart_delay:g}s")
+            self._restart_at[index] = time.monotonic() + self.restart_delay
+
+        now = time.monotonic()
+        for index, due in list(self._restart_at.items()):
+            if due <= now and not self._stopping:
+                del self._restart_at[index]
+                self._spawn(index)
+                self.restarts += 1
+
+    def worker_memory(self) -> Dict[int, Dict[str, float]]:
+        """Memory use of each live worker.
+
+        Returns:
+            ``process_memory`` output with ``pid`` added, by worker index
+        """
+        report = {}
+        for pid, index in self.workers.items():
+            memory = process_memory(pid)
+            if memory:
+                memory["pid"] = pid
+                report[index] = memory
+        return report
+
+    def log_memory(self) -> None:
+        """Write per-worker memory use to the log."""
+        report = self.worker_memory()
+        lines = [f"{'worker':<7} {'pid':>7} {'rss MB':>9} {'pss MB':>9} {'shared MB':>10} "
+                 f"{'private MB':>11}"]
+        for index in sorted(report):
+            m = report[index]
+            lines.append(f"{index:<7} {m['pid']:>7} {m['rss_mb']:>9.1f} {m.get('pss_mb', 0):>9.1f} "
+                         f"{m.get('shared_mb', 0):>10.1f} {m.get('private_mb', 0):>11.1f}")
+        total_pss = sum(m.get("pss_mb", m["rss_mb"]) for m in report.values())
+        lines.append(f"Total proportional memory of workers: {total_pss:.1f} MB")
+        self.logger.info("\n" + "\n".join(lines))
+
+    def run(self, on_start: Optional[Callable[[], None]] = None) -> None:
+        """Start the workers and supervise them until SIGTERM or SIGINT.
+
+        Args:
+            on_start: Called in the supervisor once the workers are forked,
+                for work that starts threads and so must not precede a fork
+        """
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self._request_stop())
+        self.start()
+        if on_start is not None:
+            on_start()
+        next_report = time.monotonic() + self.report_interval
+        try:
+            while not self._stopping:
+                self.poll()
+                if self.report_interval > 0 and time.monotonic() >= next_report:
+                    self.log_memory()
+                    next_report = time.monotonic() + self.report_interval
+                time.sleep(0.2)
+        finally:
+            self.stop()
+
+    def _request_stop(self) -> None:
+        self._stopping = True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminate all workers, killing those still running after the timeout.
+
+        Args:
+            timeout: Seconds to wait for workers to exit
+        """
+        self._stopping = True
+        self._restart_at.clear()
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        while self.workers and time.monotonic() < deadline:
+            self.poll()
+            time.sleep(0.05)
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.workers.pop(pid, None)
+        self.logger.info("All workers stopped")
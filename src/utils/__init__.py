@@ -2,34 +2,61 @@
 Utility modules for the accent correction tool.
 """
 
-from .config import Config
-from .logger import Logger
-from .audio_utils import (
-    normalize_audio,
-    resample_audio,
-    segment_audio,
-    compute_spectrogram,
-    detect_silence
-)
-from .phoneme_utils import (
-    get_phoneme_set,
-    get_common_confusions,
-    is_phoneme_valid,
-    get_phoneme_category,
-    get_articulatory_features
-)
+from .lazy import lazy_exports
+
+# audio_utils pulls in scipy, so nothing is imported until first use
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "Config": ".config",
+    "ConfigError": ".config",
+    "Settings": ".config",
+    "Logger": ".logger",
+    "normalize_audio": ".audio_utils",
+    "resample_audio": ".audio_utils",
+    "segment_audio": ".audio_utils",
+    "compute_spectrogram": ".audio_utils",
+    "detect_silence": ".audio_utils",
+    "StreamingSpectrogram": ".audio_utils",
+    "StreamingResampler": ".audio_utils",
+    "get_phoneme_set": ".phoneme_utils",
+    "get_common_confusions": ".phoneme_utils",
+    "is_phoneme_valid": ".phoneme_utils",
+    "get_phoneme_category": ".phoneme_utils",
+    "get_articulatory_features": ".phoneme_utils",
+    "get_inventory": ".phoneme_utils",
+    "get_confusion_matrix": ".phoneme_utils",
+    "encode_phonemes": ".phoneme_utils",
+    "decode_phonemes": ".phoneme_utils",
+    "PhonemeInventory": ".phoneme_utils",
+    "PhonemeTokenizer": ".phoneme_utils",
+    "get_tokenizer": ".phoneme_utils",
+    "LatencyTracer": ".profiling",
+    "LatencyHistogram": ".profiling",
+})
 
 __all__ = [
     "Config",
+    "ConfigError",
+    "Settings",
     "Logger",
     "normalize_audio",
     "resample_audio", 
     "segment_audio",
     "compute_spectrogram",
     "detect_silence",
+    "StreamingSpectrogram",
+    "StreamingResampler",
     "get_phoneme_set",
     "get_common_confusions",
     "is_phoneme_valid",
     "get_phoneme_category",
-    "get_articulatory_features"
+    "get_articulatory_features",
+    "get_inventory",
+    "get_confusion_matrix",
+    "encode_phonemes",
+    "decode_phonemes",
+    "PhonemeInventory",
+    "PhonemeTokenizer",
+    "get_tokenizer",
+    "LatencyTracer",
+    "LatencyHistogram"
 ] 
\ No newline at end of file
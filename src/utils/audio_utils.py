@@ -3,7 +3,11 @@ Audio utility functions for the accent correction tool.
 """
 
 import numpy as np
+from functools import lru_cache
+from math import gcd
 from typing import Tuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin, upfirdn
 
 
 def normalize_audio(audio_data: np.ndarray) -> np.ndarray:
@@ -24,11 +28,55 @@ def normalize_audio(audio_data: np.ndarray) -> np.ndarray:
     return audio_data
 
 
+@lru_cache(maxsize=16)
+def _get_resample_filter(original_rate: int, target_rate: int) -> Tuple[int, int, np.ndarray, int]:
+    """Design a cached anti-aliasing filter for rational resampling.
+    
+    Uses the same Kaiser-windowed design as ``scipy.signal.resample_poly``.
+    
+    Returns:
+        Tuple of (up, down, filter taps, output delay in samples)
+    """
+    divisor = gcd(original_rate, target_rate)
+    up = target_rate // divisor
+    down = original_rate // divisor
+    
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    
+    # Zero-pad the front so the filter delay is a whole number of output samples
+    pre_pad = down - half_len % down
+    taps = np.concatenate((np.zeros(pre_pad), taps)).astype(np.float32)
+    taps.flags.writeable = False
+    return up, down, taps, (half_len + pre_pad) // down
+
+
+@lru_cache(maxsize=16)
+def _get_polyphase_filters(original_rate: int, target_rate: int) -> np.ndarray:
+    """Split the cached resampling filter into time-reversed polyphase branches.
+    
+    Returns:
+        Array of shape (up, taps_per_phase); row ``p`` holds the branch for
+        output phase ``p`` ordered oldest-input-first
+    """
+    up, _, taps, _ = _get_resample_filter(original_rate, target_rate)
+    taps_per_phase = -(-len(taps) // up)
+    padded = np.zeros(taps_per_phase * up, dtype=np.float32)
+    padded[:len(taps)] = taps
+    branches = np.ascontiguousarray(padded.reshape(taps_per_phase, up).T[:, ::-1])
+    branches.flags.writeable = False
+    return branches
+
+
 def resample_audio(audio_data: np.ndarray, 
                   original_rate: int, 
                   target_rate: int) -> np.ndarray:
     """Resample audio to target sample rate.
     
+    Uses polyphase FIR filtering with an anti-aliasing filter cached per
+    rate pair. Output is float32.
+    
     Args:
         audio_data: Input audio data
         original_rate: Original sample rate
@@ -37,16 +85,100 @@ def resample_audio(audio_data: np.ndarray,
     Returns:
         Resampled audio data
     """
+    audio_data = np.asarray(audio_data, dtype=np.float32)
     if original_rate == target_rate:
         return audio_data
     
-    # Simple linear interpolation for now
-    # TODO: Use proper resampling library
-    ratio = target_rate / original_rate
-    new_length = int(len(audio_data) * ratio)
+    up, down, taps, delay = _get_resample_filter(original_rate, target_rate)
+    num_out = -(-len(audio_data) * up // down)
     
-    indices = np.linspace(0, len(audio_data) - 1, new_length)
-    return np.interp(indices, np.arange(len(audio_data)), audio_data)
+    resampled = upfirdn(taps, audio_data, up, down)[delay:delay + num_out]
+    if len(resampled) < num_out:
+        resampled = np.pad(resampled, (0, num_out - len(resampled)))
+    return resampled
+
+
+class StreamingResampler:
+    """Stateful polyphase resampler for chunked audio.
+    
+    Filter history is carried across chunks, so the concatenated output
+    matches ``resample_audio`` over the whole signal without edge artifacts
+    at chunk boundaries. Output lags input by the filter delay; call
+    ``flush`` at the end of a stream to emit the remaining samples.
+    """
+    
+    def __init__(self, original_rate: int, target_rate: int):
+        """Initialize streaming resampler.
+        
+        Args:
+            original_rate: Input sample rate
+            target_rate: Output sample rate
+        """
+        self.original_rate = original_rate
+        self.target_rate = target_rate
+        self.up, self.down, _, self.delay = _get_resample_filter(original_rate, target_rate)
+        self._branches = _get_polyphase_filters(original_rate, target_rate)
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear filter state to start a new stream."""
+        taps_per_phase = self._branches.shape[1]
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._num_in = 0
+        self._next_out = 0
+    
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Resample the next chunk.
+        
+        Args:
+            chunk: Next input chunk
+            
+        Returns:
+            Output samples that became available, as float32
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self.original_rate == self.target_rate or len(chunk) == 0:
+            return chunk
+        
+        buffer = np.concatenate((self._history, chunk))
+        start_in = self._num_in
+        self._num_in += len(chunk)
+        self._history = buffer[len(buffer) - len(self._history):]
+        
+        # Causal output m needs inputs up to index (m * down) // up
+        last_out = (self._num_in * self.up - 1) // self.down
+        out_index = np.arange(self._next_out, last_out + 1, dtype=np.int64)
+        self._next_out = last_out + 1
+        
+        position = out_index * self.down
+        windows = sliding_window_view(buffer, self._branches.shape[1])
+        resampled = np.einsum("ij,ij->i", windows[position // self.up - start_in],
+                              self._branches[position % self.up])
+        
+        # Drop the leading filter delay so output lines up with the input
+        skip = max(0, self.delay - int(out_index[0])) if len(out_index) else 0
+        return resampled[skip:]
+    
+    def flush(self) -> np.ndarray:
+        """Emit the samples still held back by the filter delay and reset.
+        
+        Returns:
+            Remaining output samples
+        """
+        if self.original_rate == self.target_rate:
+            return np.zeros(0, dtype=np.float32)
+        
+        total_out = -(-self._num_in * self.up // self.down)
+        remaining = total_out - max(0, self._next_out - self.delay)
+        if remaining <= 0:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+        
+        last_needed = (self.delay + total_out - 1) * self.down // self.up
+        padding = np.zeros(max(0, last_needed + 1 - self._num_in), dtype=np.float32)
+        tail = self.process(padding)[:remaining]
+        self.reset()
+        return tail
 
 
 def segment_audio(audio_data: np.ndarray, 
@@ -73,25 +205,126 @@ def segment_audio(audio_data: np.ndarray,
     return segments
 
 
+@lru_cache(maxsize=None)
+def _get_window(n_fft: int) -> np.ndarray:
+    """Get a cached periodic Hann window."""
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+def _hz_to_mel(hz: np.ndarray) -> np.ndarray:
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=32)
+def _get_mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Get a cached triangular mel filterbank of shape (n_fft // 2 + 1, n_mels)."""
+    bin_freqs = np.linspace(0.0, sample_rate / 2.0, n_fft // 2 + 1)
+    mel_points = np.linspace(_hz_to_mel(0.0), _hz_to_mel(sample_rate / 2.0), n_mels + 2)
+    hz_points = _mel_to_hz(mel_points)
+
+    lower = hz_points[:-2, None]
+    center = hz_points[1:-1, None]
+    upper = hz_points[2:, None]
+    rising = (bin_freqs - lower) / (center - lower)
+    falling = (upper - bin_freqs) / (upper - center)
+    filterbank = np.maximum(0.0, np.minimum(rising, falling))
+
+    filterbank = np.ascontiguousarray(filterbank.T, dtype=np.float32)
+    filterbank.flags.writeable = False
+    return filterbank
+
+
 def compute_spectrogram(audio_data: np.ndarray, 
                        sample_rate: int,
                        n_fft: int = 512,
-                       hop_length: int = 256) -> np.ndarray:
+                       hop_length: int = 256,
+                       n_mels: Optional[int] = None) -> np.ndarray:
     """Compute spectrogram from audio data.
     
+    Frames are taken as strided views of the input (no padding), so frame
+    ``i`` covers samples ``[i * hop_length, i * hop_length + n_fft)``.
+    
     Args:
-        audio_data: Input audio data
+        audio_data: Input audio data, 1-D or a 2-D batch of equal-length signals
         sample_rate: Audio sample rate
         n_fft: FFT window size
         hop_length: Hop length between frames
+        n_mels: Number of mel bands. If None, returns the linear power spectrogram.
         
     Returns:
-        Spectrogram as numpy array
+        Power spectrogram of shape (..., frames, n_fft // 2 + 1), or log-mel
+        spectrogram of shape (..., frames, n_mels), as float32
     """
-    # TODO: Implement proper spectrogram computation
-    # For now, return dummy spectrogram
-    num_frames = (len(audio_data) - n_fft) // hop_length + 1
-    return np.random.randn(num_frames, n_fft // 2 + 1)
+    audio_data = np.asarray(audio_data, dtype=np.float32)
+    num_bins = n_fft // 2 + 1
+    num_frames = max(0, (audio_data.shape[-1] - n_fft) // hop_length + 1)
+    if num_frames == 0:
+        num_out = num_bins if n_mels is None else n_mels
+        return np.zeros(audio_data.shape[:-1] + (0, num_out), dtype=np.float32)
+    
+    frames = sliding_window_view(audio_data, n_fft, axis=-1)[..., ::hop_length, :]
+    spectrum = np.fft.rfft(frames * _get_window(n_fft), axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    
+    if n_mels is None:
+        return power.astype(np.float32, copy=False)
+    
+    mel = power @ _get_mel_filterbank(sample_rate, n_fft, n_mels)
+    return np.log(np.maximum(mel, 1e-10)).astype(np.float32, copy=False)
+
+
+class StreamingSpectrogram:
+    """Incremental spectrogram over a stream of audio chunks.
+    
+    Samples that do not yet complete a frame are carried over to the next
+    chunk, so concatenating the outputs gives exactly the frames of
+    ``compute_spectrogram`` over the whole signal and no frame is computed
+    twice.
+    """
+    
+    def __init__(self, sample_rate: int,
+                 n_fft: int = 512,
+                 hop_length: int = 256,
+                 n_mels: Optional[int] = None):
+        """Initialize streaming spectrogram.
+        
+        Args:
+            sample_rate: Audio sample rate
+            n_fft: FFT window size
+            hop_length: Hop length between frames
+            n_mels: Number of mel bands. If None, outputs power spectra.
+        """
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self._tail = np.zeros(0, dtype=np.float32)
+    
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Compute the frames completed by a new chunk.
+        
+        Args:
+            chunk: Next audio chunk
+            
+        Returns:
+            Newly completed frames, shape (frames, bins)
+        """
+        buffer = np.concatenate((self._tail, np.asarray(chunk, dtype=np.float32)))
+        frames = compute_spectrogram(buffer, self.sample_rate, self.n_fft,
+                                     self.hop_length, self.n_mels)
+        # Keep everything from the first sample of the next frame onwards
+        self._tail = buffer[len(frames) * self.hop_length:]
+        return frames
+    
+    def reset(self) -> None:
+        """Drop carried-over samples to start a new stream."""
+        self._tail = np.zeros(0, dtype=np.float32)
 
 
 def detect_silence(audio_data: np.ndarray, 
@@ -2,26 +2,217 @@
 Configuration management for the accent correction tool.
 """
 
+import copy
 import os
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Callable
+
+
+class ConfigError(ValueError):
+    """Raised when configuration values fail validation."""
+
+
+def _positive(value) -> bool:
+    return value > 0
+
+
+def _non_negative(value) -> bool:
+    return value >= 0
+
+
+def _unit_interval(value) -> bool:
+    return 0.0 <= value <= 1.0
+
+
+class _Section:
+    """Immutable, validated group of settings.
+
+    Subclasses list their fields in ``_fields`` as
+    ``name: (type, default, check)`` and declare matching ``__slots__``.
+    """
+
+    __slots__ = ()
+    _fields: Dict[str, Tuple[Any, Any, Optional[Callable[[Any], bool]]]] = {}
+
+    def __init__(self, section: str, values: Optional[Dict[str, Any]]):
+        if values is None:
+            values = {}
+        if not isinstance(values, dict):
+            raise ConfigError(f"'{section}' must be a mapping")
+
+        for name, (kind, default, check) in self._fields.items():
+            value = values.get(name, default)
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                raise ConfigError(f"{section}.{name} has invalid value {value!r}")
+            if check is not None and value is not None and not check(value):
+                raise ConfigError(f"{section}.{name} is out of range: {value!r}")
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class AudioSettings(_Section):
+    """Audio capture and VAD settings."""
+
+    __slots__ = ("sample_rate", "chunk_duration", "vad_threshold", "vad_min_silence_duration",
+                 "silence_threshold", "max_audio_length", "ring_buffer_chunks")
+    _fields = {
+        "sample_rate": (int, 16000, _positive),
+        "chunk_duration": (float, 0.5, _positive),
+        "vad_threshold": (float, 0.5, _unit_interval),
+        "vad_min_silence_duration": (float, 0.1, _non_negative),
+        "silence_threshold": (float, 0.1, _non_negative),
+        "max_audio_length": (float, 30.0, _positive),
+        "ring_buffer_chunks": (int, 16, lambda value: value >= 2),
+    }
+
+
+class ScoringSettings(_Section):
+    """Scoring and alignment settings."""
+
+    __slots__ = ("method", "threshold", "min_phoneme_duration", "confidence_threshold",
+                 "alignment_beam")
+    _fields = {
+        "method": (str, "gop", lambda value: value in ("gop", "ctc_alignment")),
+        "threshold": (float, 0.6, _unit_interval),
+        "min_phoneme_duration": (float, 0.05, _non_negative),
+        "confidence_threshold": (float, 0.7, _unit_interval),
+        "alignment_beam": (float, 10.0, _non_negative),
+    }
+
+
+class FeedbackSettings(_Section):
+    """Feedback generation settings."""
+
+    __slots__ = ("real_time", "latency_target", "audio_hints", "articulatory_explanations",
+                 "native_exemplars", "visual_feedback")
+    _fields = {
+        "real_time": (bool, True, None),
+        "latency_target": (float, 300.0, _positive),
+        "audio_hints": (bool, True, None),
+        "articulatory_explanations": (bool, True, None),
+        "native_exemplars": (bool, True, None),
+        "visual_feedback": (bool, False, None),
+    }
+
+
+class PersonalizationSettings(_Section):
+    """User adaptation settings."""
+
+    __slots__ = ("enabled", "confusion_matrix", "spaced_repetition", "adaptation_rate",
+                 "relearn_interval", "session_history")
+    _fields = {
+        "enabled": (bool, True, None),
+        "confusion_matrix": (bool, True, None),
+        "spaced_repetition": (bool, True, None),
+        "adaptation_rate": (float, 0.1, lambda value: 0.0 < value <= 1.0),
+        "relearn_interval": (float, 600.0, _positive),
+        "session_history": (int, 100, _positive),
+    }
+
+
+class PerformanceSettings(_Section):
+    """Inference and parallelism settings."""
+
+    __slots__ = ("use_gpu", "num_threads", "session_pool_size", "batch_size", "num_workers",
+                 "model_quantization")
+    _fields = {
+        "use_gpu": (bool, False, None),
+        "num_threads": (int, 4, _positive),
+        "session_pool_size": (int, 2, _positive),
+        "batch_size": (int, 1, _positive),
+        "num_workers": ((int, type(None)), None, _positive),
+        "model_quantization": (bool, True, None),
+    }
+
+
+class DebugSettings(_Section):
+    """Development and diagnostics settings."""
+
+    __slots__ = ("verbose", "save_audio_chunks", "log_level", "profile_performance")
+    _fields = {
+        "verbose": (bool, False, None),
+        "save_audio_chunks": (bool, False, None),
+        "log_level": (str, "INFO", None),
+        "profile_performance": (bool, False, None),
+    }
+
+
+class Settings:
+    """Immutable snapshot of the validated runtime settings.
+
+    Values are plain attributes, e.g. ``settings.scoring.threshold``, so hot
+    paths avoid parsing dotted keys. A new snapshot replaces the old one
+    whenever the configuration changes; holders of the old one are unaffected.
+    """
+
+    __slots__ = ("audio", "scoring", "feedback", "personalization", "performance", "debug",
+                 "version")
+
+    _sections = {
+        "audio": AudioSettings,
+        "scoring": ScoringSettings,
+        "feedback": FeedbackSettings,
+        "personalization": PersonalizationSettings,
+        "performance": PerformanceSettings,
+        "debug": DebugSettings,
+    }
+
+    def __init__(self, config: Dict[str, Any], version: int = 0):
+        """Compile and validate a settings snapshot.
+
+        Args:
+            config: Raw configuration dictionary
+            version: Snapshot number, incremented on every change
+
+        Raises:
+            ConfigError: If a value is missing its expected type or range
+        """
+        for name, section in self._sections.items():
+            object.__setattr__(self, name, section(name, config.get(name)))
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Settings is read-only")
 
 
 class Config:
-    """Configuration manager for the accent correction tool."""
+    """Configuration manager for the accent correction tool.
     
-    def __init__(self, config_path: Optional[str] = None):
+    The YAML file is watched for changes: ``settings`` checks its mtime at
+    most every ``reload_interval`` seconds and swaps in a freshly validated
+    snapshot when it changed. Values changed with ``set`` survive reloads.
+    """
+    
+    def __init__(self, config_path: Optional[str] = None, reload_interval: float = 1.0):
         """Initialize configuration.
         
         Args:
             config_path: Path to configuration file. Defaults to 'config.yaml'.
+            reload_interval: Minimum seconds between checks of the file for
+                changes. None disables hot reload.
         """
         if config_path is None:
             config_path = "config.yaml"
         
         self.config_path = Path(config_path)
+        self.reload_interval = reload_interval
+        self._overrides: Dict[str, Any] = {}
+        self._reload_lock = threading.Lock()
+        self._file_stamp = self._stat()
         self.config = self._load_config()
+        self._settings = Settings(self.config)
+        self._next_check = time.monotonic() + (reload_interval or 0.0)
         
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -31,7 +222,55 @@ class Config:
         with open(self.config_path, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
         
-        return config
+        return config or {}
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the configuration file."""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    @property
+    def settings(self) -> Settings:
+        """Current validated settings snapshot, reloaded if the file changed."""
+        if self.reload_interval is not None and time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._settings
+    
+    def reload_if_changed(self) -> bool:
+        """Reload the configuration file if it changed on disk.
+        
+        An invalid file is logged and ignored; the previous snapshot stays
+        in effect.
+        
+        Returns:
+            True if a new snapshot was installed
+        """
+        with self._reload_lock:
+            self._next_check = time.monotonic() + (self.reload_interval or 0.0)
+            stamp = self._stat()
+            if stamp is None or stamp == self._file_stamp:
+                return False
+            self._file_stamp = stamp
+            
+            try:
+                config = self._load_config()
+                for key, value in self._overrides.items():
+                    self._assign(config, key, value)
+                settings = Settings(config, self._settings.version + 1)
+            except (yaml.YAMLError, ConfigError) as e:
+                from .logger import get_logger
+                get_logger("Config").warning(f"Ignoring invalid configuration change: {e}")
+                return False
+            
+            # Readers see either the old or the new pair of objects
+            self.config, self._settings = config, settings
+        
+        from .logger import get_logger
+        get_logger("Config").info(f"Reloaded configuration from {self.config_path}")
+        return True
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation.
@@ -60,9 +299,26 @@ class Config:
         Args:
             key: Configuration key (e.g., 'audio.sample_rate')
             value: Value to set
+
+        Raises:
+            ConfigError: If the value fails validation; nothing is changed
         """
+        with self._reload_lock:
+            config = copy.deepcopy(self.config)
+            self._assign(config, key, value)
+            settings = Settings(config, self._settings.version + 1)
+            self._overrides[key] = value
+            self.config, self._settings = config, settings
+    
+    @property
+    def overrides(self) -> Dict[str, Any]:
+        """Values changed with ``set`` since loading, by dotted key."""
+        return dict(self._overrides)
+    
+    @staticmethod
+    def _assign(config: Dict[str, Any], key: str, value: Any) -> None:
+        """Set a dotted key in a configuration dictionary."""
         keys = key.split('.')
-        config = self.config
         
         # Navigate to the parent of the target key
         for k in keys[:-1]:
@@ -75,8 +331,10 @@ class Config:
     
     def save(self) -> None:
         """Save current configuration to file."""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.config, f, default_flow_style=False, indent=2)
+        with self._reload_lock:
+            with open(self.config_path, 'w', encoding='utf-8') as f:
+                yaml.dump(self.config, f, default_flow_style=False, indent=2)
+            self._file_stamp = self._stat()
     
     def get_audio_config(self) -> Dict[str, Any]:
         """Get audio processing configuration."""
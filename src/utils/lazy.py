@@ -0,0 +1,38 @@
+"""
+Lazy attribute loading for package namespaces.
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple, Any
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any],
+                                                                 Callable[[], List[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` for lazy exports.
+
+    Each exported name is imported from its submodule on first access
+    (PEP 562) and then cached in the package namespace, so importing the
+    package itself costs nothing.
+
+    Args:
+        package: ``__name__`` of the package
+        exports: Mapping of exported name to relative submodule, e.g.
+            ``{"Config": ".config"}``
+
+    Returns:
+        Tuple of (``__getattr__``, ``__dir__``) for the package
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -4,23 +4,79 @@ Logging utilities for the accent correction tool.
 
 import logging
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Tuple, Any
 from loguru import logger
 
 
+class CallSiteLimiter:
+    """Sink filter applying per-call-site rate limits and sampling.
+    
+    Loggers bound with ``rate_limit`` (seconds) or ``sample`` (keep one of
+    every N) through ``get_logger`` are limited separately at each line
+    that logs. The next message let through reports how many were dropped.
+    """
+    
+    def __init__(self):
+        """Initialize call-site limiter."""
+        # (file, line) -> [last emit time, calls, suppressed]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        """Decide whether a record is emitted."""
+        extra = record["extra"]
+        # Every sink sees the same record; decide once
+        decision = extra.get("_emit")
+        if decision is not None:
+            return decision
+        
+        rate_limit = extra.get("rate_limit")
+        sample = extra.get("sample")
+        if rate_limit is None and sample is None:
+            decision = True
+        else:
+            now = time.monotonic()
+            key = (record["file"].path, record["line"])
+            with self._lock:
+                site = self._sites.setdefault(key, [float("-inf"), 0, 0])
+                site[1] += 1
+                decision = ((sample is None or (site[1] - 1) % sample == 0)
+                            and (rate_limit is None or now - site[0] >= rate_limit))
+                if decision:
+                    site[0] = now
+                    if site[2]:
+                        record["message"] += f" ({site[2]} similar messages suppressed)"
+                    site[2] = 0
+                else:
+                    site[2] += 1
+        
+        extra["_emit"] = decision
+        return decision
+
+
 class Logger:
-    """Logging manager for the accent correction tool."""
+    """Logging manager for the accent correction tool.
+    
+    Sinks are queue-backed: filtering and formatting still run in the
+    calling thread, but the formatted message is only enqueued and a
+    background thread writes it, so logging never blocks on stderr or disk.
+    """
     
-    def __init__(self, log_level: str = "INFO", log_file: Optional[str] = None):
+    def __init__(self, log_level: str = "INFO", log_file: Optional[str] = None,
+                 enqueue: bool = True):
         """Initialize logger.
         
         Args:
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             log_file: Optional log file path
+            enqueue: Whether to write through a background queue
         """
         self.log_level = log_level
         self.log_file = log_file
+        self.limiter = CallSiteLimiter()
         
         # Remove default handler
         logger.remove()
@@ -33,7 +89,9 @@ class Logger:
                    "<level>{level: <8}</level> | "
                    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
                    "<level>{message}</level>",
-            colorize=True
+            colorize=True,
+            filter=self.limiter,
+            enqueue=enqueue
         )
         
         # Add file handler if specified
@@ -46,7 +104,9 @@ class Logger:
                 format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | "
                        "{name}:{function}:{line} - {message}",
                 rotation="10 MB",
-                retention="1 week"
+                retention="1 week",
+                filter=self.limiter,
+                enqueue=enqueue
             )
     
     def debug(self, message: str) -> None:
@@ -90,34 +150,74 @@ class Logger:
         return logger.bind(**kwargs)
 
 
-# Global logger instance
-_logger = Logger()
+# Global logger instance, created on first use so that importing the
+# package starts no queue thread
+_logger: Optional[Logger] = None
+_logger_lock = threading.Lock()
 
+# Bound loggers are reused across calls; binding never depends on the sinks
+_bound_loggers: Dict[Tuple, Any] = {}
 
-def get_logger(name: str = None) -> Logger:
+
+def get_logger(name: str = None, rate_limit: Optional[float] = None,
+               sample: Optional[int] = None) -> Logger:
     """Get logger instance.
     
+    Loggers meant for per-chunk or per-utterance messages should set
+    ``rate_limit`` or ``sample`` and log with deferred formatting, e.g.
+    ``logger.debug("Scored {} frames", n)``, so filtered messages are never
+    formatted.
+    
+    The default sinks are added on the first call unless ``setup_logging``
+    ran before.
+    
     Args:
         name: Logger name (optional)
+        rate_limit: Minimum seconds between messages from one call site
+        sample: Emit only every Nth message from one call site
         
     Returns:
         Logger instance
     """
-    if name:
-        return _logger.bind(name=name)
-    return _logger
+    default = _default_logger()
+    if not (name or rate_limit or sample):
+        return default
+    
+    key = (name, rate_limit, sample)
+    bound = _bound_loggers.get(key)
+    if bound is None:
+        extra = {"name": name} if name else {}
+        if rate_limit:
+            extra["rate_limit"] = rate_limit
+        if sample:
+            extra["sample"] = sample
+        bound = _bound_loggers.setdefault(key, logger.bind(**extra))
+    return bound
 
 
-def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> Logger:
+def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None,
+                  enqueue: bool = True) -> Logger:
     """Setup logging configuration.
     
     Args:
         log_level: Logging level
         log_file: Optional log file path
+        enqueue: Whether to write through a background queue
         
     Returns:
         Configured logger instance
     """
     global _logger
-    _logger = Logger(log_level, log_file)
+    with _logger_lock:
+        _logger = Logger(log_level, log_file, enqueue)
+    return _logger
+
+
+def _default_logger() -> Logger:
+    """Global logger, adding the default sinks on first use."""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = Logger()
     return _logger 
\ No newline at end of file
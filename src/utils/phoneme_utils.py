@@ -2,7 +2,11 @@
 Phoneme utility functions for the accent correction tool.
 """
 
-from typing import List, Dict, Set
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import List, Dict, FrozenSet, Tuple, Iterable, Sequence, Optional
+import numpy as np
 
 
 # IPA phoneme sets for different languages
@@ -38,26 +42,186 @@ HEBREW_PHONEMES = {
 }
 
 
-def get_phoneme_set(language: str) -> Set[str]:
+PHONEME_SETS = {
+    'english': ENGLISH_PHONEMES,
+    'arabic': ARABIC_PHONEMES,
+    'hebrew': HEBREW_PHONEMES
+}
+
+# Common L1 -> L2 substitutions as (target phoneme, typical realization)
+COMMON_CONFUSIONS = {
+    ('english', 'arabic'): (
+        ('θ', 't'), ('ð', 'd'), ('v', 'w'), ('ɪ', 'iː'),
+        ('æ', 'a'), ('ʌ', 'a'), ('ɜː', 'ə')
+    ),
+    ('arabic', 'english'): (
+        ('q', 'k'), ('ħ', 'h'), ('ʕ', 'ʔ'), ('x', 'h'),
+        ('ɣ', 'g'), ('ṣ', 's'), ('ṭ', 't'), ('ḍ', 'd')
+    ),
+    ('hebrew', 'english'): (
+        ('ʁ', 'ɹ'), ('x', 'h'), ('ɣ', 'g'), ('ħ', 'h'),
+        ('ʕ', 'ʔ'), ('ṣ', 's'), ('ṭ', 't'), ('ḍ', 'd')
+    )
+}
+
+# Words read by the TTS voice of a language to demonstrate each phoneme;
+# TTS frontends read a bare IPA symbol as its name ("theta")
+EXEMPLAR_WORDS = {
+    'english': {
+        'p': 'pin', 'b': 'bin', 't': 'tin', 'd': 'din', 'k': 'kit', 'g': 'gap',
+        'f': 'fan', 'v': 'van', 'θ': 'thin', 'ð': 'this', 's': 'sip', 'z': 'zip',
+        'ʃ': 'ship', 'ʒ': 'measure', 'h': 'hat', 'm': 'man', 'n': 'net', 'ŋ': 'sing',
+        'l': 'lip', 'r': 'red', 'w': 'wet', 'j': 'yes', 'tʃ': 'chin', 'dʒ': 'jam',
+        'iː': 'see', 'ɪ': 'sit', 'e': 'bed', 'æ': 'cat', 'ɜː': 'bird', 'ə': 'about',
+        'ʌ': 'cup', 'ɑː': 'father', 'ɒ': 'lot', 'ɔː': 'thought', 'ʊ': 'put', 'uː': 'blue',
+        'eɪ': 'day', 'aɪ': 'my', 'ɔɪ': 'boy', 'əʊ': 'go', 'aʊ': 'now', 'ɪə': 'near',
+        'eə': 'hair', 'ʊə': 'tour'
+    }
+}
+
+CATEGORY_NAMES = ('consonant', 'vowel', 'diphthong')
+CONSONANT, VOWEL, DIPHTHONG = range(len(CATEGORY_NAMES))
+
+# ID returned by encode_phonemes for symbols outside the table
+UNKNOWN_ID = -1
+
+_VOWEL_QUALITIES = frozenset('aeiouɑɒɔʊuɪəɜæʌɛ')
+
+
+def _build_phoneme_table() -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Intern every known symbol and assign dense IDs and categories."""
+    vowels, consonants = set(), set()
+    for inventory in PHONEME_SETS.values():
+        vowels |= inventory['vowels']
+        consonants |= inventory['consonants']
+    for pairs in COMMON_CONFUSIONS.values():
+        for pair in pairs:
+            consonants.update(p for p in pair if p not in vowels)
+
+    symbols = tuple(sys.intern(p) for p in sorted(vowels | consonants))
+    categories = np.full(len(symbols), CONSONANT, dtype=np.int8)
+    for index, symbol in enumerate(symbols):
+        if symbol in vowels:
+            # Diphthongs have two vowel or glide targets; 'ː' only marks length
+            targets = [c for c in symbol if c != 'ː']
+            categories[index] = DIPHTHONG if len(targets) > 1 else VOWEL
+    categories.setflags(write=False)
+    return symbols, categories
+
+
+# Global phoneme table shared by all languages: dense IDs index these arrays
+PHONEME_SYMBOLS, PHONEME_CATEGORIES = _build_phoneme_table()
+PHONEME_IDS: Dict[str, int] = {symbol: i for i, symbol in enumerate(PHONEME_SYMBOLS)}
+
+
+class PhonemeInventory:
+    """Compiled phoneme inventory of one language.
+
+    Phonemes are represented by their IDs in the global table
+    (``PHONEME_SYMBOLS``), so membership and category checks over whole
+    utterances are array lookups instead of per-phoneme string hashing.
+    """
+
+    __slots__ = ('language', 'symbols', 'ids', 'mask', 'symbol_set')
+
+    def __init__(self, language: str):
+        """Compile the inventory.
+
+        Args:
+            language: Language code ('english', 'arabic', 'hebrew')
+        """
+        if language not in PHONEME_SETS:
+            raise ValueError(f"Unsupported language: {language}")
+        inventory = PHONEME_SETS[language]
+        self.language = language
+        self.symbol_set = frozenset(inventory['consonants'] | inventory['vowels'])
+        self.symbols = tuple(sorted(self.symbol_set))
+        self.ids = np.array([PHONEME_IDS[p] for p in self.symbols], dtype=np.int32)
+        self.mask = np.zeros(len(PHONEME_SYMBOLS), dtype=bool)
+        self.mask[self.ids] = True
+        for array in (self.ids, self.mask):
+            array.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, phoneme: str) -> bool:
+        return phoneme in self.symbol_set
+
+    def contains(self, ids: np.ndarray) -> np.ndarray:
+        """Vectorized membership test.
+
+        Args:
+            ids: Global phoneme IDs; ``UNKNOWN_ID`` entries are never members
+
+        Returns:
+            Boolean array of the same shape
+        """
+        ids = np.asarray(ids)
+        return (ids >= 0) & self.mask[np.maximum(ids, 0)]
+
+
+def encode_phonemes(phonemes: Iterable[str]) -> np.ndarray:
+    """Map phoneme symbols to global IDs.
+
+    Args:
+        phonemes: Phoneme symbols
+
+    Returns:
+        Int32 array of IDs, ``UNKNOWN_ID`` for symbols outside the table
+    """
+    get = PHONEME_IDS.get
+    return np.array([get(p, UNKNOWN_ID) for p in phonemes], dtype=np.int32)
+
+
+def decode_phonemes(ids: Sequence[int]) -> List[str]:
+    """Map global IDs back to phoneme symbols.
+
+    Args:
+        ids: Phoneme IDs from ``encode_phonemes``
+
+    Returns:
+        Phoneme symbols; unknown IDs become empty strings
+    """
+    return [PHONEME_SYMBOLS[i] if i >= 0 else '' for i in np.asarray(ids).tolist()]
+
+
+@lru_cache(maxsize=None)
+def get_inventory(language: str) -> PhonemeInventory:
+    """Get the compiled inventory of a language.
+
+    Args:
+        language: Language code ('english', 'arabic', 'hebrew')
+
+    Returns:
+        Shared, read-only inventory
+    """
+    return PhonemeInventory(language)
+
+
+def get_phoneme_set(language: str) -> FrozenSet[str]:
     """Get phoneme set for a language.
     
     Args:
         language: Language code ('english', 'arabic', 'hebrew')
         
     Returns:
-        Set of phonemes for the language
+        Set of phonemes for the language; shared, so it is immutable
     """
-    phoneme_sets = {
-        'english': ENGLISH_PHONEMES,
-        'arabic': ARABIC_PHONEMES,
-        'hebrew': HEBREW_PHONEMES
-    }
-    
-    if language not in phoneme_sets:
-        raise ValueError(f"Unsupported language: {language}")
+    return get_inventory(language).symbol_set
+
+
+def get_exemplar_word(phoneme: str, language: str) -> Optional[str]:
+    """Get a word demonstrating a phoneme.
     
-    phoneme_set = phoneme_sets[language]
-    return phoneme_set['consonants'].union(phoneme_set['vowels'])
+    Args:
+        phoneme: Phoneme symbol
+        language: Language of the word
+        
+    Returns:
+        Exemplar word, or None if the language has none for the phoneme
+    """
+    return EXEMPLAR_WORDS.get(language, {}).get(phoneme)
 
 
 def get_common_confusions(l1: str, l2: str) -> List[tuple]:
@@ -70,31 +234,151 @@ def get_common_confusions(l1: str, l2: str) -> List[tuple]:
     Returns:
         List of (l1_phoneme, l2_phoneme) tuples
     """
-    confusions = {
-        ('english', 'arabic'): [
-            ('θ', 't'), ('ð', 'd'), ('v', 'w'), ('ɪ', 'iː'),
-            ('æ', 'a'), ('ʌ', 'a'), ('ɜː', 'ə')
-        ],
-        ('arabic', 'english'): [
-            ('q', 'k'), ('ħ', 'h'), ('ʕ', 'ʔ'), ('x', 'h'),
-            ('ɣ', 'g'), ('ṣ', 's'), ('ṭ', 't'), ('ḍ', 'd')
-        ],
-        ('hebrew', 'english'): [
-            ('ʁ', 'ɹ'), ('x', 'h'), ('ɣ', 'g'), ('ħ', 'h'),
-            ('ʕ', 'ʔ'), ('ṣ', 's'), ('ṭ', 't'), ('ḍ', 'd')
-        ]
-    }
-    
-    key = (l1, l2)
-    if key in confusions:
-        return confusions[key]
-    
-    # Try reverse direction
-    key = (l2, l1)
-    if key in confusions:
-        return [(l2, l1) for l1, l2 in confusions[key]]
+    return list(_get_confusions(l1, l2))
+
+
+@lru_cache(maxsize=None)
+def _get_confusions(l1: str, l2: str) -> Tuple[tuple, ...]:
+    """Confusion pairs for a language pair, trying the reverse direction too."""
+    if (l1, l2) in COMMON_CONFUSIONS:
+        return COMMON_CONFUSIONS[(l1, l2)]
+    if (l2, l1) in COMMON_CONFUSIONS:
+        return tuple((b, a) for a, b in COMMON_CONFUSIONS[(l2, l1)])
+    return ()
+
+
+@lru_cache(maxsize=None)
+def get_confusion_matrix(l1: str, l2: str) -> np.ndarray:
+    """Get common confusions as a lookup matrix over global phoneme IDs.
     
-    return []
+    Args:
+        l1: First language
+        l2: Second language
+        
+    Returns:
+        Read-only boolean matrix where ``[a, b]`` is True if phoneme ``a`` is
+        commonly realized as ``b``
+    """
+    matrix = np.zeros((len(PHONEME_SYMBOLS), len(PHONEME_SYMBOLS)), dtype=bool)
+    for target, realized in _get_confusions(l1, l2):
+        matrix[PHONEME_IDS[target], PHONEME_IDS[realized]] = True
+    matrix.setflags(write=False)
+    return matrix
+
+
+# Characters rewritten before matching: script g, ASCII length mark, and
+# marks that carry no segmental information (tie bars, stress, syllable breaks)
+_IPA_NORMALIZATION = str.maketrans({
+    'ɡ': 'g', ':': 'ː', '͡': None, '͜': None, 'ˈ': None, 'ˌ': None, '.': None,
+    '‿': None, '-': None
+})
+
+_TERMINAL = ''
+
+
+class PhonemeTokenizer:
+    """Longest-match tokenizer from IPA strings to phonemes.
+
+    A trie built from the inventory is walked once per position, so
+    multi-character units such as ``tʃ``, ``iː`` or ``aʊ`` are kept whole in
+    a single linear pass. Text is split on whitespace and each word's
+    tokens are memoized, since prompts repeat the same words.
+    """
+
+    def __init__(self, symbols: Iterable[str], cache_size: int = 4096):
+        """Build the tokenizer.
+
+        Args:
+            symbols: Phoneme symbols to match
+            cache_size: Number of distinct words to memoize
+        """
+        self.symbols = frozenset(symbols)
+        self._trie: Dict[str, dict] = {}
+        for symbol in self.symbols:
+            node = self._trie
+            for char in symbol:
+                node = node.setdefault(char, {})
+            node[_TERMINAL] = symbol
+        self._tokenize_word = lru_cache(maxsize=cache_size)(self._match_word)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Canonicalize an IPA string before matching.
+
+        Args:
+            text: IPA text, e.g. G2P output
+
+        Returns:
+            NFC text with script g, tie bars, stress and syllable marks
+            normalized away
+        """
+        return unicodedata.normalize('NFC', text).translate(_IPA_NORMALIZATION)
+
+    def _match_word(self, word: str) -> Tuple[str, ...]:
+        """Split one normalized word by longest match.
+
+        Characters that start no known symbol become single-character tokens.
+        """
+        tokens = []
+        position, length = 0, len(word)
+        trie = self._trie
+        while position < length:
+            node, match, end = trie, None, position
+            while end < length:
+                node = node.get(word[end])
+                if node is None:
+                    break
+                end += 1
+                if _TERMINAL in node:
+                    match = (node[_TERMINAL], end)
+            if match is None:
+                tokens.append(word[position])
+                position += 1
+            else:
+                tokens.append(match[0])
+                position = match[1]
+        return tuple(tokens)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split IPA text into phoneme tokens.
+
+        Args:
+            text: IPA text; words may be separated by whitespace
+
+        Returns:
+            Phoneme tokens in order
+        """
+        tokens = []
+        for word in self.normalize(text).split():
+            tokens.extend(self._tokenize_word(word))
+        return tokens
+
+    def tokenize_ids(self, text: str) -> np.ndarray:
+        """Split IPA text into global phoneme IDs.
+
+        Args:
+            text: IPA text
+
+        Returns:
+            Int32 IDs, ``UNKNOWN_ID`` for unmatched characters
+        """
+        return encode_phonemes(self.tokenize(text))
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(language: Optional[str] = None) -> PhonemeTokenizer:
+    """Get the shared tokenizer for a language.
+
+    Args:
+        language: Language code, or None to match every symbol in the
+            global phoneme table
+
+    Returns:
+        Phoneme tokenizer
+    """
+    if language is None:
+        return PhonemeTokenizer(PHONEME_SYMBOLS)
+    return PhonemeTokenizer(get_inventory(language).symbols)
 
 
 def is_phoneme_valid(phoneme: str, language: str) -> bool:
@@ -107,28 +391,32 @@ def is_phoneme_valid(phoneme: str, language: str) -> bool:
     Returns:
         True if phoneme is valid for the language
     """
-    phoneme_set = get_phoneme_set(language)
-    return phoneme in phoneme_set
+    return phoneme in get_inventory(language).symbol_set
 
 
 def get_phoneme_category(phoneme: str) -> str:
     """Get the category of a phoneme.
     
     Args:
-        phoneme: Phoneme symbol
+        phoneme: Phoneme symbol; IPA variants such as ``t͡ʃ`` or ``ˈa`` are
+            normalized first
         
     Returns:
         Phoneme category ('consonant', 'vowel', 'diphthong')
     """
-    # Check if it's a diphthong (contains two vowel symbols)
-    if len(phoneme) > 1 and all(c in 'aeiouɑɒɔʊuɪəɜ' for c in phoneme):
-        return 'diphthong'
-    
-    # Check if it's a vowel
-    if phoneme in 'aeiouɑɒɔʊuɪəɜ':
-        return 'vowel'
+    phoneme_id = PHONEME_IDS.get(phoneme)
+    if phoneme_id is None:
+        tokens = get_tokenizer().tokenize(phoneme)
+        if len(tokens) == 1:
+            phoneme_id = PHONEME_IDS.get(tokens[0])
+    if phoneme_id is not None:
+        return CATEGORY_NAMES[PHONEME_CATEGORIES[phoneme_id]]
     
-    # Otherwise it's a consonant
+    # Unknown symbol: classify by its vowel qualities, ignoring length marks
+    qualities = [c for c in PhonemeTokenizer.normalize(phoneme) if c != 'ː']
+    vowels = [c for c in qualities if c in _VOWEL_QUALITIES]
+    if vowels and len(vowels) == len(qualities):
+        return 'diphthong' if len(vowels) > 1 else 'vowel'
     return 'consonant'
 
 
@@ -0,0 +1,329 @@
+"""
+Per-stage latency tracing for the scoring pipeline.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional, Iterator
+from .config import Config
+from .logger import get_logger
+
+
+# Pipeline stages in the order an utterance passes through them. Batch runs
+# ``load`` recordings from disk; the live path spends ``capture`` between
+# receiving a chunk of audio and starting to process it.
+STAGES = ("load", "capture", "vad", "features", "scoring", "feedback")
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with log-spaced buckets.
+
+    Bucket ``i`` covers ``[min_ms * growth**i, min_ms * growth**(i + 1))``,
+    so percentiles are accurate to within the growth factor (5% by default)
+    no matter how many samples are recorded.
+    """
+
+    def __init__(self, min_ms: float = 0.01, max_ms: float = 60000.0, growth: float = 1.05):
+        """Initialize histogram.
+
+        Args:
+            min_ms: Upper edge of the first bucket
+            max_ms: Values above this land in the last bucket
+            growth: Ratio between consecutive bucket edges
+        """
+        self.min_ms = min_ms
+        self._log_growth = math.log(growth)
+        self.growth = growth
+        self.counts = [0] * (int(math.log(max_ms / min_ms) / self._log_growth) + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float) -> None:
+        """Record one latency in milliseconds."""
+        if value_ms <= self.min_ms:
+            index = 0
+        else:
+            index = min(int(math.log(value_ms / self.min_ms) / self._log_growth) + 1,
+                        len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Upper edge of the bucket holding the percentile, in milliseconds
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                if index == len(self.counts) - 1:
+                    # The overflow bucket has no upper edge
+                    return self.max
+                return min(self.min_ms * self.growth ** index, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p95/p99 and max latency."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class UtteranceTrace:
+    """Stage timings of one utterance."""
+
+    __slots__ = ("utterance_id", "stages", "start_time")
+
+    def __init__(self, utterance_id: Optional[str] = None):
+        """Initialize trace and start its clock.
+
+        Args:
+            utterance_id: Identifier reported with budget violations
+        """
+        self.utterance_id = utterance_id
+        self.stages: Dict[str, float] = {}
+        self.start_time = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time a block as part of a stage; repeated spans accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+
+    def add(self, stage: str, elapsed_ms: float) -> None:
+        """Add time measured elsewhere to a stage."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed_ms
+
+    @property
+    def elapsed(self) -> float:
+        """Milliseconds since the trace started."""
+        return (time.perf_counter() - self.start_time) * 1000.0
+
+
+class _NullTrace:
+    """Trace used when profiling is disabled; records nothing."""
+
+    __slots__ = ()
+    utterance_id = None
+    stages: Dict[str, float] = {}
+    elapsed = 0.0
+
+    def span(self, stage: str):
+        return nullcontext()
+
+    def add(self, stage: str, elapsed_ms: float) -> None:
+        pass
+
+
+_NULL_TRACE = _NullTrace()
+
+
+class LatencyTracer:
+    """Aggregates per-stage latencies and checks them against the budget.
+
+    Enabled by ``debug.profile_performance``; when disabled, traces and
+    spans are no-ops. Each finished utterance adds its stage timings and
+    end-to-end total to fixed-memory histograms, and utterances slower than
+    ``feedback.latency_target`` are counted and the latest kept for the report.
+    Live results sent while the learner is still speaking, such as per-phoneme
+    feedback, are checked against the same budget with ``record_emission``.
+    Offline scoring, which has no learner waiting, traces without a budget.
+    """
+
+    def __init__(self, config: Config, max_violations: int = 32, check_budget: bool = True):
+        """Initialize latency tracer.
+
+        Args:
+            config: Configuration object
+            max_violations: Number of recent over-budget utterances to keep
+            check_budget: Whether to check latencies against the live budget
+        """
+        self.config = config
+        self.logger = get_logger("LatencyTracer")
+        self.budget_logger = get_logger("LatencyTracer", rate_limit=5.0)
+        self.enabled = config.settings.debug.profile_performance
+        self.budget_ms = config.settings.feedback.latency_target if check_budget else None
+
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._violations: "deque[Dict[str, Any]]" = deque(maxlen=max_violations)
+        self._over_budget = 0
+        self._emission = LatencyHistogram()
+        self._late_emissions = 0
+
+    def start(self, utterance_id: Optional[str] = None):
+        """Start tracing an utterance.
+
+        Args:
+            utterance_id: Identifier reported with budget violations
+
+        Returns:
+            Trace whose ``span(stage)`` times each pipeline stage
+        """
+        if not self.enabled:
+            return _NULL_TRACE
+        return UtteranceTrace(utterance_id)
+
+    def finish(self, trace, since: Optional[float] = None) -> bool:
+        """Record a finished trace.
+
+        Args:
+            trace: Trace from ``start``
+            since: ``time.perf_counter()`` time the end-to-end latency is
+                measured from, e.g. when the audio ending a live utterance
+                arrived. Defaults to the start of the trace.
+
+        Returns:
+            True if the utterance exceeded the latency budget
+        """
+        if trace is _NULL_TRACE:
+            return False
+        if since is None:
+            return self.record(trace.stages, trace.elapsed, trace.utterance_id)
+        return self.record(trace.stages, (time.perf_counter() - since) * 1000.0,
+                           trace.utterance_id)
+
+    def record(self, stages: Dict[str, float], total_ms: Optional[float] = None,
+               utterance_id: Optional[str] = None) -> bool:
+        """Record stage timings measured elsewhere, e.g. in a worker process.
+
+        Args:
+            stages: Milliseconds per stage
+            total_ms: End-to-end latency. Defaults to the sum of the stages.
+            utterance_id: Identifier reported with budget violations
+
+        Returns:
+            True if the utterance exceeded the latency budget
+        """
+        if total_ms is None:
+            total_ms = sum(stages.values())
+        over_budget = self.budget_ms is not None and total_ms > self.budget_ms
+
+        with self._lock:
+            for stage, value in stages.items():
+                self._histogram(stage).add(value)
+            self._histogram("total").add(total_ms)
+            if over_budget:
+                self._over_budget += 1
+                self._violations.append({"id": utterance_id, "total": total_ms,
+                                         "stages": dict(stages)})
+
+        if over_budget:
+            slowest = max(stages, key=stages.get) if stages else "unknown"
+            self.budget_logger.warning("Utterance {} took {:.1f}ms (budget {:.0f}ms), "
+                                       "slowest stage {}", utterance_id, total_ms,
+                                       self.budget_ms, slowest)
+        return over_budget
+
+    def record_emission(self, latency_ms: float, utterance_id: Optional[str] = None) -> bool:
+        """Record how long after the audio it covers a live result was sent.
+
+        Args:
+            latency_ms: Milliseconds from the end of the covered audio to sending
+            utterance_id: Identifier reported when over budget
+
+        Returns:
+            True if the result exceeded the latency budget
+        """
+        if not self.enabled:
+            return False
+        over_budget = self.budget_ms is not None and latency_ms > self.budget_ms
+        with self._lock:
+            self._emission.add(latency_ms)
+            if over_budget:
+                self._late_emissions += 1
+        if over_budget:
+            self.budget_logger.warning("Live result of {} sent {:.1f}ms after its audio "
+                                       "(budget {:.0f}ms)", utterance_id, latency_ms,
+                                       self.budget_ms)
+        return over_budget
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = LatencyHistogram()
+        return histogram
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize latencies recorded so far.
+
+        Returns:
+            Dictionary with per-stage summaries (pipeline order, then
+            ``total``), the budget (None if unchecked), the over-budget count, recent violations
+            and the ``emission`` latency summary with its ``late_emissions``
+        """
+        with self._lock:
+            order = [s for s in STAGES if s in self._histograms]
+            order += sorted(s for s in self._histograms if s not in STAGES and s != "total")
+            if "total" in self._histograms:
+                order.append("total")
+            return {
+                "budget_ms": self.budget_ms,
+                "utterances": self._histograms["total"].count if "total" in self._histograms else 0,
+                "over_budget": self._over_budget,
+                "stages": {stage: self._histograms[stage].summary() for stage in order},
+                "violations": list(self._violations),
+                "emission": self._emission.summary(),
+                "late_emissions": self._late_emissions,
+            }
+
+    def format_report(self) -> str:
+        """Render the report as a text table."""
+        report = self.report()
+        title = f"Latency over {report['utterances']} utterances"
+        if report["budget_ms"] is not None:
+            title += f" ({report['over_budget']} over {report['budget_ms']:.0f}ms budget)"
+        lines = [title,
+                 f"{'stage':<10} {'count':>7} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+        for stage, s in report["stages"].items():
+            lines.append(f"{stage:<10} {s['count']:>7} {s['mean']:>9.1f} {s['p50']:>9.1f} "
+                         f"{s['p95']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f}")
+        s = report["emission"]
+        if s["count"]:
+            lines.append(f"{'emission':<10} {s['count']:>7} {s['mean']:>9.1f} {s['p50']:>9.1f} "
+                         f"{s['p95']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f} "
+                         f"({report['late_emissions']} over budget)")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        """Write the report to the log."""
+        self.logger.info("\n" + self.format_report())
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._histograms.clear()
+            self._violations.clear()
+            self._over_budget = 0
+            self._emission = LatencyHistogram()
+            self._late_emissions = 0
+
+    def slowest_stages(self, count: int = 1) -> List[str]:
+        """Stages with the highest p95 latency, slowest first."""
+        stages = self.report()["stages"]
+        stages.pop("total", None)
+        return sorted(stages, key=lambda s: stages[s]["p95"], reverse=True)[:count]
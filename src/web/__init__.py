@@ -0,0 +1,12 @@
+"""
+Web interface for the accent correction tool.
+"""
+
+from ..utils.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "WebServer": ".server",
+    "StreamSession": ".server",
+})
+
+__all__ = ["WebServer", "StreamSession"]
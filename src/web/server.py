@@ -0,0 +1,574 @@
+"""
+WebSocket server streaming learner audio through the scoring pipeline.
+
+Protocol, per connection:
+
+* ``{"type": "start", "reference": [...] | "IPA string", "text": "...",
+  "format": "pcm16" | "float32", "sample_rate": 16000}`` opens a stream.
+  ``reference`` (or ``text``, converted with the G2P service) is optional;
+  without it phonemes are recognized instead of aligned.
+* Binary messages carry mono PCM at the configured sample rate; a sample
+  may be split across messages.
+* ``{"type": "end"}`` closes the stream; a new ``start`` may follow.
+
+The server replies with JSON messages: ``speech_start``/``speech_end`` VAD
+events, ``partial`` recognized phonemes while the learner speaks, a
+``phoneme`` score and feedback item for each reference phoneme as soon as
+its alignment is final, a ``result`` with scores and feedback per
+utterance, ``end`` and ``error``.
+"""
+
+import asyncio
+import itertools
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import numpy as np
+from ..utils.config import Config
+from ..utils.logger import get_logger
+from ..utils.phoneme_utils import get_tokenizer
+from ..models.acoustic import FRAME_SHIFT
+from ..models.alignment import IncrementalAligner
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional web server dependency
+    websockets = None
+
+
+# Queue marker for the end of a stream
+_END = object()
+
+# WebSocket close codes for "internal error" and "try again later"
+CLOSE_INTERNAL_ERROR = 1011
+CLOSE_TRY_AGAIN_LATER = 1013
+
+PCM_FORMATS = {"pcm16": np.dtype("<i2"), "float32": np.dtype("<f4")}
+
+
+def decode_pcm(data: bytes, audio_format: str) -> np.ndarray:
+    """Decode a binary audio message.
+
+    Args:
+        data: Little-endian mono samples
+        audio_format: ``pcm16`` or ``float32``
+
+    Returns:
+        Float32 samples in [-1, 1]
+    """
+    dtype = PCM_FORMATS[audio_format]
+    usable = len(data) - len(data) % dtype.itemsize
+    samples = np.frombuffer(data[:usable], dtype=dtype)
+    if dtype.kind == "i":
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32)
+
+
+class PcmDecoder:
+    """Decodes a stream of binary audio messages.
+
+    Message boundaries need not fall on sample boundaries: the bytes of a
+    trailing partial sample are kept and prepended to the next message.
+    """
+
+    def __init__(self, audio_format: str):
+        """Initialize PCM decoder.
+
+        Args:
+            audio_format: ``pcm16`` or ``float32``
+        """
+        self.audio_format = audio_format
+        self.itemsize = PCM_FORMATS[audio_format].itemsize
+        self._remainder = b""
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """Decode the next message.
+
+        Args:
+            data: Little-endian mono samples, continuing the previous message
+
+        Returns:
+            Float32 samples in [-1, 1] completed by this message
+        """
+        if self._remainder:
+            data = self._remainder + data
+        usable = len(data) - len(data) % self.itemsize
+        self._remainder = data[usable:]
+        return decode_pcm(data[:usable], self.audio_format)
+
+
+class StreamSession:
+    """Scoring state of one learner's audio stream.
+
+    Audio is fed through a VAD session and a streaming feature extractor as
+    it arrives, so encoder work is spread over the utterance. With a
+    reference, new frames also advance an incremental aligner, and each
+    phoneme is scored and given feedback as soon as its alignment is final,
+    while the learner is still speaking. When the VAD closes a speech
+    segment, the whole segment is scored; the feature stream then restarts
+    so its memory stays bounded by one utterance. Methods are blocking and
+    meant to run on an executor, one call at a time per session.
+    """
+
+    def __init__(self, components: Any, language: str,
+                 reference: Optional[List[str]] = None,
+                 session_id: Optional[str] = None):
+        """Initialize stream session.
+
+        Args:
+            components: Component registry providing the models and engines
+            language: Target language
+            reference: Reference phonemes to align each utterance to; None
+                recognizes phonemes instead
+            session_id: Identifier used in traces
+        """
+        self.components = components
+        self.language = language
+        self.reference = reference
+        self.session_id = session_id
+        self.acoustic_model = components.acoustic_model
+        self.feedback_engine = components.feedback_engine
+        self.tracer = components.tracer
+        self.sample_rate = self.acoustic_model.sample_rate
+        max_length = components.config.settings.audio.max_audio_length
+        self.max_stream_samples = int(max_length * self.sample_rate)
+
+        self.vad = components.vad_model.create_session()
+        self.stream = self.acoustic_model.create_stream()
+        self._samples = 0
+        self._origin = 0
+        self._speech_start: Optional[float] = None
+        self._partial: List[str] = []
+        self._partial_frame = 0
+        self._partial_label = -1
+        self._aligner: Optional[IncrementalAligner] = None
+        self._aligned = 0
+        self._aligner_start = 0
+        self._scores: List[Dict[str, Any]] = []
+        self._trace = None
+        self._received = 0.0
+        self.utterances = 0
+
+    def process(self, chunk: np.ndarray, received: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Feed a chunk of audio.
+
+        Args:
+            chunk: Float32 samples at the model sample rate
+            received: ``time.perf_counter()`` time the chunk arrived; the
+                wait until now is traced as capture. Defaults to now.
+
+        Returns:
+            Messages for the client
+        """
+        now = time.perf_counter()
+        self._received = now if received is None else received
+        trace = self._trace or self.tracer.start(self.session_id)
+        trace.add("capture", (now - self._received) * 1000.0)
+        with trace.span("features"):
+            self.stream.process(chunk)
+        self._samples += len(chunk)
+        with trace.span("vad"):
+            events = self.vad.process(chunk)
+
+        messages = []
+        for event in events:
+            messages.extend(self._handle_event(event, trace))
+
+        if self._speech_start is not None:
+            if self._aligner is not None:
+                messages.extend(self._align_frames(None, trace))
+            partial = self._recognize_partial()
+            if partial is not None:
+                messages.append(partial)
+        elif self._samples - self._origin > self.max_stream_samples:
+            # Long silence: restart the feature stream to bound its memory
+            self._restart_stream()
+        return messages
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """End the stream, scoring speech still in progress.
+
+        Returns:
+            Messages for the client
+        """
+        messages = []
+        self._received = time.perf_counter()
+        trace = self._trace or self.tracer.start(self.session_id)
+        for event in self.vad.flush():
+            messages.extend(self._handle_event(event, trace))
+        messages.append({"type": "end", "utterances": self.utterances})
+        return messages
+
+    def _handle_event(self, event: Dict[str, Any], trace) -> List[Dict[str, Any]]:
+        """Turn a VAD event into client messages, scoring finished speech."""
+        messages = [{"type": event["type"], "time": event["time"]}]
+        if event["type"] == "speech_start":
+            self._speech_start = event["time"]
+            self._partial = []
+            self._partial_frame = self._frame(self._speech_start)
+            self._partial_label = self.acoustic_model.blank_id
+            self._trace = trace
+            self._start_alignment()
+        elif self._speech_start is not None:
+            messages.extend(self._score_utterance(self._speech_start, event["time"], trace))
+            self._speech_start = None
+            self._trace = None
+        return messages
+
+    def _frame(self, time: float) -> int:
+        """Index in the current feature stream of the frame at a stream time."""
+        return max(0, int(round((time * self.sample_rate - self._origin) / FRAME_SHIFT)))
+
+    def _recognize_partial(self) -> Optional[Dict[str, Any]]:
+        """Greedy-decode the speech so far; a message only when it changed.
+
+        Streamed frames never change once computed, so only the frames new
+        since the last call are decoded and their phonemes appended.
+        """
+        frames = self.stream.features[self._partial_frame:]
+        if len(frames) == 0:
+            return None
+        self._partial_frame += len(frames)
+        best = self.acoustic_model.frames_to_log_probs(frames).argmax(axis=1)
+        # A label continuing from the previous frame is the same phoneme
+        previous = np.concatenate(([self._partial_label], best[:-1]))
+        self._partial_label = int(best[-1])
+        new = best[(best != previous) & (best != self.acoustic_model.blank_id)]
+        if len(new) == 0:
+            return None
+        labels = self.acoustic_model.phoneme_labels
+        self._partial.extend(labels[token] for token in new.tolist())
+        return {"type": "partial", "phonemes": list(self._partial)}
+
+    def _start_alignment(self) -> None:
+        """Start aligning the reference to the speech that just began."""
+        self._aligner = None
+        self._scores = []
+        if not self.reference:
+            return
+        try:
+            self._aligner = self.acoustic_model.create_aligner(self.reference)
+        except ValueError:
+            # Reported when the utterance is scored
+            return
+        self._aligned = self._aligner_start = self._frame(self._speech_start)
+
+    def _align_frames(self, end: Optional[int], trace) -> List[Dict[str, Any]]:
+        """Feed frames up to ``end`` to the aligner; messages for final phonemes."""
+        frames = self.stream.features[self._aligned:end]
+        if len(frames) == 0:
+            return []
+        with trace.span("scoring"):
+            log_probs = self.acoustic_model.frames_to_log_probs(frames)
+            segments = self._aligner.extend(log_probs)
+        self._aligned += len(frames)
+        return self._phoneme_messages(segments, trace)
+
+    def _phoneme_messages(self, segments: Dict[str, np.ndarray], trace) -> List[Dict[str, Any]]:
+        """Score and feedback messages for phonemes whose alignment is final."""
+        messages = []
+        with trace.span("feedback"):
+            scores = self.acoustic_model.segment_scores(self.reference, segments)
+            for index, score in zip(segments["index"].tolist(), scores):
+                self._scores.append(score)
+                messages.append({"type": "phoneme", "index": index, **score,
+                                 "feedback": self.feedback_engine.phoneme_feedback(score)})
+        if self.tracer.enabled and len(segments["end"]):
+            # Audio received after each phoneme ended, plus the time the
+            # chunk bringing it has spent in the pipeline
+            waited = time.perf_counter() - self._received
+            ends = self._origin + (self._aligner_start + segments["end"]) * FRAME_SHIFT
+            for end in ends.tolist():
+                lag = (self._samples - end) / self.sample_rate + waited
+                self.tracer.record_emission(lag * 1000.0, self.session_id)
+        return messages
+
+    def _score_utterance(self, start: float, end: float, trace) -> List[Dict[str, Any]]:
+        """Score one speech segment and restart the feature stream."""
+        with trace.span("features"):
+            self.stream.flush()
+        end_frame = self._frame(end)
+        messages = []
+        scores = None
+        if self._aligner is not None:
+            try:
+                messages.extend(self._align_frames(end_frame, trace))
+                with trace.span("scoring"):
+                    segments = self._aligner.finish()
+                messages.extend(self._phoneme_messages(segments, trace))
+                scores = self._scores
+            except ValueError:
+                # The best path was pruned; align the whole segment instead
+                pass
+            self._aligner = None
+        frames = self.stream.features[self._frame(start):end_frame]
+        self._restart_stream()
+        self.utterances += 1
+
+        message = {"type": "result", "start": start, "end": end}
+        try:
+            with trace.span("scoring"):
+                if scores is None:
+                    log_probs = self.acoustic_model.frames_to_log_probs(frames)
+                    if self.reference:
+                        scores = self.acoustic_model.align_log_probs(log_probs, self.reference)
+                    else:
+                        scores = self.acoustic_model.decode_log_probs(log_probs)
+            with trace.span("feedback"):
+                message["scores"] = scores
+                message["feedback"] = self.feedback_engine.generate_feedback(scores,
+                                                                             self.language)
+        except ValueError as e:
+            message = {"type": "error", "message": str(e), "start": start, "end": end}
+        # The budget covers the wait for the result once the learner stops,
+        # not the utterance itself
+        self.tracer.finish(trace, since=self._received)
+        messages.append(message)
+        return messages
+
+    def _restart_stream(self) -> None:
+        """Start a new feature stream at the current stream position."""
+        self.stream.reset()
+        self._origin = self._samples
+
+
+class WebServer:
+    """Asyncio WebSocket server scoring many learners' streams at once.
+
+    Each connection has a bounded chunk queue between the socket reader and
+    the scoring task. When a client sends faster than it can be scored, the
+    reader stops taking messages off the socket, so TCP flow control slows
+    the client down instead of buffering without limit. Inference runs on a
+    shared thread pool, keeping the event loop free to serve other sessions.
+    """
+
+    def __init__(self, config: Config, components: Any, language: str,
+                 sock: Optional[socket.socket] = None):
+        """Initialize web server.
+
+        Args:
+            config: Configuration object
+            components: Component registry shared by all sessions
+            language: Default target language
+            sock: Listening socket to accept on instead of binding
+                ``web.host``/``web.port``, e.g. one shared by pre-forked workers
+        """
+        self.config = config
+        self.components = components
+        self.language = language
+        self.sock = sock
+        self.logger = get_logger("WebServer")
+        self.host = config.get("web.host", "127.0.0.1")
+        self.port = config.get("web.port", 8765)
+        self.max_sessions = config.get("web.max_sessions", 64)
+        self.queue_chunks = max(1, config.get("web.queue_chunks", 8))
+        self.sample_rate = config.settings.audio.sample_rate
+        workers = (config.get("web.executor_workers")
+                   or config.settings.performance.session_pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix="web-inference")
+        self.active_sessions = 0
+        self._session_ids = itertools.count(1)
+
+    async def handle(self, websocket: Any, path: Optional[str] = None) -> None:
+        """Serve one connection.
+
+        Args:
+            websocket: Connection with ``send``, ``close`` and async iteration
+            path: Request path (ignored; passed by older ``websockets`` versions)
+        """
+        if self.active_sessions >= self.max_sessions:
+            await websocket.close(CLOSE_TRY_AGAIN_LATER, "Server busy")
+            return
+        self.active_sessions += 1
+        connection_id = next(self._session_ids)
+        self.logger.info(f"Connection {connection_id} opened "
+                         f"({self.active_sessions} active)")
+        try:
+            await self._serve(websocket, connection_id)
+        finally:
+            self.active_sessions -= 1
+            self.logger.info(f"Connection {connection_id} closed")
+
+    async def _serve(self, websocket: Any, connection_id: int) -> None:
+        """Read messages, feeding audio to the session's scoring task."""
+        queue: Optional[asyncio.Queue] = None
+        scorer: Optional[asyncio.Task] = None
+        decoder: Optional[PcmDecoder] = None
+        try:
+            async for message in websocket:
+                if isinstance(message, (bytes, bytearray, memoryview)):
+                    if queue is None:
+                        await self._send(websocket, {"type": "error",
+                                                     "message": "Send a start message first"})
+                        continue
+                    received = time.perf_counter()
+                    chunk = decoder.decode(bytes(message))
+                    # Waits while the queue is full, pausing reads from the socket
+                    if not await self._feed(queue, (chunk, received), scorer):
+                        return
+                    continue
+
+                try:
+                    request = json.loads(message)
+                    request_type = request["type"]
+                except (ValueError, KeyError, TypeError):
+                    await self._send(websocket, {"type": "error", "message": "Invalid message"})
+                    continue
+
+                if request_type == "start":
+                    if scorer is not None:
+                        if not await self._end_stream(queue, scorer):
+                            return
+                        queue = scorer = None
+                    session = await self._start_session(websocket, request, connection_id)
+                    if session is not None:
+                        decoder = PcmDecoder(request.get("format", "pcm16"))
+                        queue = asyncio.Queue(maxsize=self.queue_chunks)
+                        scorer = asyncio.ensure_future(self._score(websocket, session, queue))
+                elif request_type == "end":
+                    if scorer is not None:
+                        if not await self._end_stream(queue, scorer):
+                            return
+                        queue = scorer = None
+                else:
+                    await self._send(websocket, {"type": "error",
+                                                 "message": f"Unknown message type {request_type}"})
+        finally:
+            if scorer is not None and not scorer.done():
+                scorer.cancel()
+
+    async def _start_session(self, websocket: Any, request: Dict[str, Any],
+                             connection_id: int) -> Optional[StreamSession]:
+        """Validate a start message and create its session."""
+        language = request.get("language", self.language)
+        audio_format = request.get("format", "pcm16")
+        error = None
+        if audio_format not in PCM_FORMATS:
+            error = f"Unsupported audio format {audio_format}"
+        elif request.get("sample_rate", self.sample_rate) != self.sample_rate:
+            error = f"Audio must be sent at {self.sample_rate} Hz"
+        if error is not None:
+            await self._send(websocket, {"type": "error", "message": error})
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            reference = await loop.run_in_executor(self.executor, self._reference,
+                                                   request, language)
+            session = await loop.run_in_executor(
+                self.executor, StreamSession, self.components, language, reference,
+                f"{connection_id}")
+        except Exception as e:
+            await self._send(websocket, {"type": "error", "message": str(e)})
+            return None
+        await self._send(websocket, {"type": "ready", "reference": reference})
+        return session
+
+    def _reference(self, request: Dict[str, Any], language: str) -> Optional[List[str]]:
+        """Reference phonemes of a start message."""
+        reference = request.get("reference")
+        if isinstance(reference, str):
+            return get_tokenizer(language).tokenize(reference)
+        if reference is not None:
+            return list(reference)
+        if request.get("text"):
+            return self.components.g2p.transcribe(request["text"], language)
+        return None
+
+    async def _feed(self, queue: asyncio.Queue, item: Any, scorer: asyncio.Task) -> bool:
+        """Queue an item for the scoring task, waiting while the queue is full.
+
+        Returns:
+            False if the scoring task ended first, so nothing drains the queue
+        """
+        if scorer.done():
+            return False
+        if not queue.full():
+            queue.put_nowait(item)
+            return True
+        put = asyncio.ensure_future(queue.put(item))
+        await asyncio.wait((put, scorer), return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            return False
+        return True
+
+    async def _end_stream(self, queue: asyncio.Queue, scorer: asyncio.Task) -> bool:
+        """Finish the stream and wait for its last messages.
+
+        Returns:
+            False if the session failed and the connection was closed
+        """
+        await self._feed(queue, _END, scorer)
+        return await scorer
+
+    async def _score(self, websocket: Any, session: StreamSession,
+                     queue: asyncio.Queue) -> bool:
+        """Scoring task of one stream: run queued chunks on the executor.
+
+        Returns:
+            True when the stream ended, False if scoring failed and the
+            connection was closed
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    messages = await loop.run_in_executor(self.executor, session.finish)
+                else:
+                    messages = await loop.run_in_executor(self.executor, session.process, *item)
+                for message in messages:
+                    await self._send(websocket, message)
+                if item is _END:
+                    return True
+        except Exception as e:
+            self.logger.exception(f"Session {session.session_id} failed: {e}")
+            try:
+                await self._send(websocket, {"type": "error", "message": "Scoring failed"})
+                await websocket.close(CLOSE_INTERNAL_ERROR, "Scoring failed")
+            except Exception:
+                # The connection is already gone
+                pass
+            return False
+
+    async def _send(self, websocket: Any, message: Dict[str, Any]) -> None:
+        await websocket.send(json.dumps(message, ensure_ascii=False))
+
+    async def serve(self) -> None:
+        """Accept connections until cancelled."""
+        if websockets is None:
+            raise RuntimeError("websockets is required for web mode")
+        loop = asyncio.get_running_loop()
+        # Load weights before the first learner connects
+        await loop.run_in_executor(self.executor, self.components.acoustic_model.load)
+        if self.sock is not None:
+            server = websockets.serve(self.handle, sock=self.sock, max_queue=self.queue_chunks)
+        else:
+            server = websockets.serve(self.handle, self.host, self.port,
+                                      max_queue=self.queue_chunks)
+        async with server:
+            self.logger.info(f"Listening on ws://{self.host}:{self.port}")
+            await asyncio.Future()
+
+    def listen(self) -> socket.socket:
+        """Bind the listening socket, so that forked workers can share it.
+
+        Returns:
+            Socket bound to ``web.host``/``web.port``, also used by ``serve``
+        """
+        self.sock = socket.create_server((self.host, self.port), backlog=self.max_sessions)
+        self.sock.setblocking(False)
+        return self.sock
+
+    def run(self) -> None:
+        """Run the server until interrupted."""
+        try:
+            asyncio.run(self.serve())
+        finally:
+            self.executor.shutdown(wait=False)
+            if self.components.is_loaded("tracer") and self.components.tracer.enabled:
+                self.components.tracer.log_report()
@@ -0,0 +1,46 @@
+"""
+Tests for the acoustic model.
+"""
+
+import numpy as np
+import pytest
+from src.utils.config import Config
+from src.models.acoustic import AcousticModel, FRAME_SHIFT
+
+
+@pytest.fixture
+def acoustic_model():
+    config = Config("config.yaml")
+    # Use the log-mel fallback so tests don't depend on model files
+    config.set("models.acoustic.model_path", "data/models/missing_acoustic")
+    return AcousticModel(config)
+
+
+class TestStreamingFeatureExtractor:
+    """Test cases for chunked feature extraction."""
+    
+    def test_matches_offline(self, acoustic_model):
+        """Test that chunked frames equal whole-utterance frames."""
+        audio = np.random.default_rng(0).standard_normal(3 * 16000 + 1234).astype(np.float32)
+        offline = acoustic_model.extract_features(audio)
+        
+        stream = acoustic_model.create_stream()
+        parts = [stream.process(chunk) for chunk in np.array_split(audio, 9)]
+        parts.append(stream.flush())
+        
+        np.testing.assert_allclose(np.concatenate(parts), offline)
+        assert stream.features.shape == offline.shape
+    
+    def test_constant_window(self, acoustic_model):
+        """Test that every encoder call sees the same window size."""
+        stream = acoustic_model.create_stream()
+        sizes = []
+        forward = acoustic_model._forward
+        acoustic_model._forward = lambda audio: sizes.append(len(audio)) or forward(audio)
+        
+        for _ in range(10):
+            new_frames = stream.process(np.zeros(stream.chunk_size, dtype=np.float32))
+            assert len(new_frames) in (0, stream.chunk_frames)
+        
+        assert set(sizes) == {stream.window_size}
+        assert stream.chunk_size == 5 * FRAME_SHIFT
@@ -0,0 +1,127 @@
+"""
+Tests for CTC alignment.
+"""
+
+import numpy as np
+import pytest
+from src.models.alignment import (ctc_viterbi, segment_path, ctc_greedy_segments,
+                                  IncrementalAligner)
+
+
+def _reference_viterbi_score(log_probs, tokens, blank=0):
+    """Straightforward per-state Viterbi used as an oracle."""
+    states = [blank]
+    for token in tokens:
+        states += [token, blank]
+    num_frames, num_states = len(log_probs), len(states)
+    alpha = np.full((num_frames, num_states), -np.inf)
+    alpha[0, :2] = log_probs[0, states[:2]]
+    for t in range(1, num_frames):
+        for s in range(num_states):
+            best = alpha[t - 1, s]
+            if s >= 1:
+                best = max(best, alpha[t - 1, s - 1])
+            if s >= 2 and states[s] != blank and states[s] != states[s - 2]:
+                best = max(best, alpha[t - 1, s - 2])
+            alpha[t, s] = best + log_probs[t, states[s]]
+    return max(alpha[-1, -1], alpha[-1, -2])
+
+
+def _peaked_log_probs(num_frames, vocab_size, segments):
+    logits = np.full((num_frames, vocab_size), -5.0, dtype=np.float32)
+    logits[:, 0] = 0.0
+    for token, start, end in segments:
+        logits[start:end, token] = 5.0
+    return logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+
+
+class TestCTCViterbi:
+    """Test cases for forced alignment."""
+    
+    def test_matches_reference(self):
+        """Test path scores against the per-state oracle."""
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            num_frames = int(rng.integers(4, 30))
+            tokens = rng.integers(1, 4, int(rng.integers(1, num_frames // 2 + 1)))
+            log_probs = np.log(rng.dirichlet(np.ones(4), num_frames)).astype(np.float32)
+            
+            path = ctc_viterbi(log_probs, tokens)
+            states = np.zeros(2 * len(tokens) + 1, dtype=np.int64)
+            states[1::2] = tokens
+            score = log_probs[np.arange(num_frames), states[path]].sum()
+            
+            assert np.all(np.diff(path) >= 0)
+            assert score == pytest.approx(_reference_viterbi_score(log_probs, tokens), abs=1e-3)
+    
+    def test_segments(self):
+        """Test token boundaries and scores on peaked posteriors."""
+        log_probs = _peaked_log_probs(50, 6, [(3, 5, 10), (1, 10, 20), (1, 25, 30)])
+        tokens = [3, 1, 1]
+        
+        segments = segment_path(ctc_viterbi(log_probs, tokens), log_probs, tokens)
+        
+        assert segments["start"].tolist() == [5, 10, 25]
+        assert segments["end"].tolist() == [10, 20, 30]
+        assert segments["recognized"].tolist() == tokens
+        assert np.all(segments["score"] > 0.9)
+    
+    def test_too_short(self):
+        """Test that impossible alignments raise."""
+        log_probs = np.log(np.full((2, 4), 0.25, dtype=np.float32))
+        with pytest.raises(ValueError):
+            ctc_viterbi(log_probs, [1, 2, 3])
+    
+    def test_greedy_segments(self):
+        """Test best-path decoding collapses repeats and drops blanks."""
+        log_probs = _peaked_log_probs(30, 6, [(2, 3, 8), (5, 8, 12), (2, 20, 22)])
+        segments = ctc_greedy_segments(log_probs)
+        
+        assert segments["token"].tolist() == [2, 5, 2]
+        assert segments["start"].tolist() == [3, 8, 20]
+        assert segments["end"].tolist() == [8, 12, 22]
+
+
+class TestIncrementalAligner:
+    """Test cases for incremental alignment."""
+    
+    def test_matches_full_alignment(self):
+        """Test that chunked alignment without pruning equals ctc_viterbi."""
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            # Long enough to grow the frame buffers past their first capacity
+            num_frames = int(rng.integers(4, 160))
+            tokens = rng.integers(1, 5, int(rng.integers(1, num_frames // 2 + 1)))
+            log_probs = np.log(rng.dirichlet(np.full(5, 0.3), num_frames)).astype(np.float32)
+            expected = segment_path(ctc_viterbi(log_probs, tokens), log_probs, tokens)
+            
+            aligner = IncrementalAligner(tokens, beam=None)
+            parts, t = [], 0
+            while t < num_frames:
+                size = int(rng.integers(1, 6))
+                parts.append(aligner.extend(log_probs[t:t + size]))
+                t += size
+            parts.append(aligner.finish())
+            
+            segments = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+            assert segments["index"].tolist() == list(range(len(tokens)))
+            for key, value in expected.items():
+                np.testing.assert_allclose(segments[key], value, rtol=1e-5)
+    
+    def test_early_emission(self):
+        """Test that a phoneme is final shortly after it ends, before the utterance does."""
+        log_probs = _peaked_log_probs(50, 6, [(3, 5, 10), (1, 10, 20), (4, 25, 30)])
+        aligner = IncrementalAligner([3, 1, 4])
+        
+        assert aligner.extend(log_probs[:10])["index"].tolist() == []
+        first = aligner.extend(log_probs[10:15])
+        assert first["index"].tolist() == [0]
+        assert (first["start"].tolist(), first["end"].tolist()) == ([5], [10])
+        assert aligner.extend(log_probs[15:40])["index"].tolist() == [1, 2]
+        assert aligner.finish()["index"].tolist() == []
+        assert len(aligner.path) == 40
+    
+    def test_empty(self):
+        """Test that finishing without frames raises."""
+        with pytest.raises(ValueError):
+            IncrementalAligner([1, 2]).finish()
@@ -0,0 +1,95 @@
+"""
+Tests for audio utility functions.
+"""
+
+import numpy as np
+from src.utils.audio_utils import (
+    compute_spectrogram,
+    StreamingSpectrogram,
+    resample_audio,
+    StreamingResampler
+)
+
+
+def _tone(duration: float, sample_rate: int = 16000, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+class TestSpectrogram:
+    """Test cases for spectrogram computation."""
+    
+    def test_shape_and_peak(self):
+        """Test frame count, dtype and spectral peak location."""
+        audio = _tone(1.0, freq=1000.0)
+        spec = compute_spectrogram(audio, 16000, n_fft=512, hop_length=256)
+        
+        assert spec.shape == ((16000 - 512) // 256 + 1, 257)
+        assert spec.dtype == np.float32
+        assert np.all(np.argmax(spec, axis=1) == 32)  # 1000 Hz / 31.25 Hz per bin
+    
+    def test_batch_matches_single(self):
+        """Test that a 2-D batch gives the same frames as separate calls."""
+        batch = np.stack([_tone(0.5, freq=f) for f in (300.0, 800.0)])
+        spec = compute_spectrogram(batch, 16000, n_mels=40)
+        
+        assert spec.shape[0] == 2
+        for i in range(2):
+            np.testing.assert_allclose(spec[i], compute_spectrogram(batch[i], 16000, n_mels=40),
+                                       rtol=1e-5, atol=1e-5)
+    
+    def test_short_input(self):
+        """Test input shorter than one window."""
+        spec = compute_spectrogram(np.zeros(100, dtype=np.float32), 16000)
+        assert spec.shape == (0, 257)
+    
+    def test_streaming_matches_offline(self):
+        """Test that chunked processing reproduces the offline frames."""
+        audio = _tone(2.0) + 0.1 * np.random.default_rng(0).standard_normal(32000).astype(np.float32)
+        offline = compute_spectrogram(audio, 16000, n_mels=80)
+        
+        stream = StreamingSpectrogram(16000, n_mels=80)
+        online = np.concatenate([stream.process(chunk) for chunk in np.split(audio, 4)])
+        
+        assert online.shape == offline.shape
+        np.testing.assert_allclose(online, offline, rtol=1e-4, atol=1e-4)
+
+
+class TestResample:
+    """Test cases for polyphase resampling."""
+    
+    def test_length_and_dtype(self):
+        """Test output length and that float32 is preserved."""
+        audio = _tone(1.0, sample_rate=44100)
+        resampled = resample_audio(audio, 44100, 16000)
+        
+        assert len(resampled) == 16000
+        assert resampled.dtype == np.float32
+    
+    def test_same_rate_is_float32(self):
+        """Test that equal rates still return float32 without copying float32 input."""
+        audio = _tone(0.1)
+        
+        assert resample_audio(audio, 16000, 16000) is audio
+        converted = resample_audio(audio.astype(np.float64), 16000, 16000)
+        assert converted.dtype == np.float32
+        np.testing.assert_allclose(converted, audio)
+    
+    def test_anti_aliasing(self):
+        """Test that content above the target Nyquist is suppressed."""
+        audio = _tone(1.0, sample_rate=48000, freq=11000.0)
+        resampled = resample_audio(audio, 48000, 16000)
+        
+        assert np.sqrt(np.mean(resampled[100:-100] ** 2)) < 0.01
+    
+    def test_streaming_matches_offline(self):
+        """Test that chunked resampling reproduces the offline result."""
+        audio = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+        offline = resample_audio(audio, 44100, 16000)
+        
+        resampler = StreamingResampler(44100, 16000)
+        chunks = np.array_split(audio, [1000, 1001, 15000, 30000])
+        online = np.concatenate([resampler.process(c) for c in chunks] + [resampler.flush()])
+        
+        assert online.shape == offline.shape
+        np.testing.assert_allclose(online, offline, atol=1e-5)
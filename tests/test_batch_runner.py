@@ -0,0 +1,96 @@
+"""
+Tests for offline batch scoring.
+"""
+
+import json
+import numpy as np
+from src.utils.config import Config
+from src.audio.wav_io import write_wav
+from src.batch.runner import BatchRunner, load_manifest, read_checkpoint
+
+
+def _make_corpus(root, count: int = 3):
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        audio = 0.3 * rng.standard_normal(8000).astype(np.float32)
+        write_wav(root / f"utt{i}.wav", audio, 16000)
+    (root / "utt0.phonemes").write_text("θ ɪ ŋ", encoding="utf-8")
+
+
+class TestBatchRunner:
+    """Test cases for BatchRunner."""
+    
+    def test_directory_manifest(self, tmp_path):
+        """Test that a directory lists WAV files with sidecar phonemes."""
+        _make_corpus(tmp_path)
+        items = load_manifest(str(tmp_path))
+        
+        assert [item["id"] for item in items] == ["utt0.wav", "utt1.wav", "utt2.wav"]
+        assert items[0]["phonemes"] == ["θ", "ɪ", "ŋ"]
+        assert items[1]["phonemes"] is None
+    
+    def test_jsonl_manifest(self, tmp_path):
+        """Test that manifest paths resolve relative to the manifest."""
+        _make_corpus(tmp_path)
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text('{"audio": "utt1.wav", "phonemes": "v w", "id": "a"}\n\n',
+                            encoding="utf-8")
+        
+        items = load_manifest(str(manifest))
+        
+        assert items == [{"id": "a", "audio": str(tmp_path / "utt1.wav"), "phonemes": ["v", "w"]}]
+    
+    def test_checkpoint_truncates_partial_line(self, tmp_path):
+        """Test that an interrupted write is dropped from the checkpoint."""
+        output = tmp_path / "results.jsonl"
+        output.write_text('{"id": "a"}\n{"id": "b"}\n{"id": "c", "sco', encoding="utf-8")
+        
+        assert read_checkpoint(output) == {"a", "b"}
+        assert output.read_text(encoding="utf-8") == '{"id": "a"}\n{"id": "b"}\n'
+    
+    def test_checkpoint_retries_failures(self, tmp_path):
+        """Test that failed recordings are not counted as done."""
+        output = tmp_path / "results.jsonl"
+        output.write_text('{"id": "a", "error": "ValueError: bad"}\n{"id": "b"}\n'
+                          '{"id": "c", "error": "OSError: missing"}\n{"id": "c"}\n',
+                          encoding="utf-8")
+        
+        assert read_checkpoint(output) == {"b", "c"}
+    
+    def test_run_and_resume(self, tmp_path):
+        """Test scoring a corpus and resuming an interrupted run."""
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        _make_corpus(corpus)
+        output = tmp_path / "results.jsonl"
+        output.write_text('{"id": "utt2.wav", "phoneme_scores": []}\n{"id": "ut',
+                          encoding="utf-8")
+        
+        runner = BatchRunner(Config("config.yaml"), num_workers=2)
+        stats = runner.run(str(corpus), str(output))
+        
+        assert stats == {"scored": 2, "failed": 0, "skipped": 1}
+        results = {r["id"]: r for r in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+        assert set(results) == {"utt0.wav", "utt1.wav", "utt2.wav"}
+        assert [s["phoneme"] for s in results["utt0.wav"]["phoneme_scores"]] == ["θ", "ɪ", "ŋ"]
+        assert results["utt0.wav"]["duration"] == 0.5
+        
+        stats = runner.run(str(corpus), str(output))
+        assert stats == {"scored": 0, "failed": 0, "skipped": 3}
+    
+    def test_latency_profiling(self, tmp_path):
+        """Test that worker stage timings reach the runner's tracer."""
+        _make_corpus(tmp_path, count=2)
+        config = Config("config.yaml")
+        config.set("debug.profile_performance", True)
+        config.set("feedback.latency_target", 0.001)
+        
+        runner = BatchRunner(config, num_workers=1)
+        runner.run(str(tmp_path), str(tmp_path / "results.jsonl"))
+        
+        report = runner.tracer.report()
+        stages = report["stages"]
+        assert list(stages) == ["load", "vad", "features", "scoring", "feedback", "total"]
+        assert stages["total"]["count"] == 2
+        # Offline scoring is not held to the live feedback budget
+        assert report["over_budget"] == 0
@@ -0,0 +1,60 @@
+"""
+Tests for the benchmark harness.
+"""
+
+import numpy as np
+from benchmarks.run_benchmarks import (synthetic_speech, measure, measure_startup,
+                                       compare_results, STARTUP_BUDGET_MS)
+
+
+class TestBenchmarks:
+    """Test cases for benchmark helpers."""
+    
+    def test_synthetic_audio_deterministic(self):
+        """Test that synthetic audio is reproducible and has pauses."""
+        audio = synthetic_speech(1.0)
+        
+        assert audio.dtype == np.float32
+        assert len(audio) == 16000
+        assert np.array_equal(audio, synthetic_speech(1.0))
+        # The 600-800 ms pause is near silent
+        assert np.abs(audio[int(0.65 * 16000):int(0.75 * 16000)]).max() < 0.05
+    
+    def test_measure_reports_metrics(self):
+        """Test that measurements include time, throughput and memory."""
+        result = measure(lambda: np.zeros(2 ** 20), audio_seconds=1.0, repeats=2, min_time=0.0)
+        
+        assert set(result) == {"wall_ms", "cpu_ms", "throughput", "peak_mb"}
+        assert result["peak_mb"] >= 7.9
+    
+    def test_startup_within_budget(self):
+        """Test that CLI startup imports stay within the time budget."""
+        result = measure_startup(repeats=3)
+        
+        assert result["budget_ms"] == STARTUP_BUDGET_MS
+        assert 0.0 <= result["wall_ms"] < STARTUP_BUDGET_MS
+    
+    def test_compare_flags_regressions(self):
+        """Test that only changes over threshold and noise floor regress."""
+        baseline = {"results": {
+            "slow": {"wall_ms": 10.0, "peak_mb": 5.0},
+            "noisy": {"wall_ms": 0.1, "peak_mb": 0.01},
+        }}
+        results = {"results": {
+            "slow": {"wall_ms": 14.0, "peak_mb": 5.2},
+            "noisy": {"wall_ms": 0.3, "peak_mb": 0.02},
+            "new": {"wall_ms": 1.0, "peak_mb": 1.0},
+        }}
+        
+        regressions = compare_results(results, baseline)
+        
+        assert len(regressions) == 1
+        assert regressions[0].startswith("slow wall_ms: 10 -> 14 (+40%")
+    
+    def test_compare_flags_budget(self):
+        """Test that a result over its budget regresses even without a baseline."""
+        results = {"results": {"cli_startup": {"wall_ms": 600.0, "budget_ms": 500.0}}}
+        
+        assert compare_results(results, {}) == ["cli_startup wall_ms: 600 over budget 500"]
+        results["results"]["cli_startup"]["wall_ms"] = 120.0
+        assert compare_results(results, {}) == []
@@ -0,0 +1,91 @@
+"""
+Tests for lazy component loading and CLI startup imports.
+"""
+
+import subprocess
+import sys
+import pytest
+from src.utils.config import Config
+from src.components import ComponentRegistry
+
+HEAVY_MODULES = ["numpy", "scipy", "onnxruntime", "src.models.acoustic", "src.audio.processor"]
+
+
+class TestLazyImports:
+    """Test cases for lazy package exports."""
+    
+    def test_package_import_is_light(self):
+        """Test that importing the package and CLI skips heavy modules."""
+        code = ("import sys, src, src.main; "
+                "print(','.join(m for m in %r if m in sys.modules))" % HEAVY_MODULES)
+        result = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == ""
+    
+    def test_lazy_attribute_access(self):
+        """Test that exports resolve on first access."""
+        import src
+        import src.models
+        
+        assert src.AcousticModel is src.models.AcousticModel
+        assert "VADSession" in dir(src.models)
+        with pytest.raises(AttributeError):
+            src.models.Missing
+    
+    def test_help_skips_heavy_modules(self):
+        """Test that ``main.py --help`` runs without importing heavy modules."""
+        code = ("import runpy, sys; sys.argv = ['src/main.py', '--help']\n"
+                "try:\n"
+                "    runpy.run_path('src/main.py', run_name='__main__')\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print('loaded:' + ','.join(m for m in %r if m in sys.modules))" % HEAVY_MODULES)
+        result = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True)
+        assert "usage:" in result.stdout
+        assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+class TestComponentRegistry:
+    """Test cases for ComponentRegistry."""
+    
+    def test_builds_on_first_use(self):
+        """Test that components are built once, when first requested."""
+        registry = ComponentRegistry(Config("config.yaml"))
+        assert registry.loaded == []
+        
+        engine = registry.feedback_engine
+        
+        assert registry.get("feedback_engine") is engine
+        assert registry.loaded == ["feedback_engine"]
+    
+    def test_register_custom_factory(self):
+        """Test overriding a component factory."""
+        registry = ComponentRegistry(Config("config.yaml"))
+        registry.register("acoustic_model", lambda config: "stub")
+        
+        assert registry.acoustic_model == "stub"
+        with pytest.raises(KeyError):
+            registry.get("missing")
+    
+    def test_close_built_components(self):
+        """Test that closing the registry closes built components, newest first."""
+        closed = []
+        
+        class Closable:
+            def __init__(self, name):
+                self.name = name
+            
+            def close(self):
+                closed.append(self.name)
+        
+        registry = ComponentRegistry(Config("config.yaml"))
+        registry.register("first", lambda config: Closable("first"))
+        registry.register("second", lambda config: Closable("second"))
+        registry.register("unused", lambda config: Closable("unused"))
+        registry.get("first")
+        registry.get("second")
+        
+        registry.close()
+        
+        assert closed == ["second", "first"]
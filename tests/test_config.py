@@ -2,9 +2,10 @@
 Tests for configuration management.
 """
 
+import os
 import pytest
 from pathlib import Path
-from src.utils.config import Config
+from src.utils.config import Config, ConfigError
 
 
 class TestConfig:
@@ -65,4 +66,76 @@ class TestConfig:
         
         # Test audio path
         audio_path = config.get_audio_path("samples")
-        assert "samples" in str(audio_path) 
\ No newline at end of file
+        assert "samples" in str(audio_path) 
+
+
+class TestSettings:
+    """Test cases for the compiled settings snapshot."""
+    
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(Path("config.yaml").read_text(encoding="utf-8"), encoding="utf-8")
+        return path
+    
+    def _rewrite(self, path, old, new):
+        path.write_text(path.read_text(encoding="utf-8").replace(old, new), encoding="utf-8")
+        # Make the change visible even on coarse mtime filesystems
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    
+    def test_attribute_access(self):
+        """Test that settings expose typed values as attributes."""
+        settings = Config("config.yaml").settings
+        
+        assert settings.scoring.threshold == 0.6
+        assert settings.audio.sample_rate == 16000
+        assert isinstance(settings.feedback.latency_target, float)
+    
+    def test_snapshot_is_immutable(self):
+        """Test that settings cannot be modified in place."""
+        settings = Config("config.yaml").settings
+        
+        with pytest.raises(AttributeError):
+            settings.scoring.threshold = 0.9
+        with pytest.raises(AttributeError):
+            settings.scoring.extra = 1
+    
+    def test_set_updates_snapshot(self):
+        """Test that set validates and swaps in a new snapshot."""
+        config = Config("config.yaml")
+        old = config.settings
+        
+        config.set("scoring.threshold", 0.8)
+        
+        assert config.settings.scoring.threshold == 0.8
+        assert old.scoring.threshold == 0.6
+        with pytest.raises(ConfigError):
+            config.set("scoring.threshold", 1.5)
+        assert config.get("scoring.threshold") == 0.8
+    
+    def test_invalid_file_rejected(self, config_file):
+        """Test that invalid values fail at load time."""
+        self._rewrite(config_file, "sample_rate: 16000", "sample_rate: fast")
+        
+        with pytest.raises(ConfigError):
+            Config(str(config_file))
+    
+    def test_hot_reload(self, config_file):
+        """Test that file changes are picked up, keeping overrides."""
+        config = Config(str(config_file), reload_interval=0)
+        config.set("audio.chunk_duration", 0.25)
+        
+        self._rewrite(config_file, "threshold: 0.6", "threshold: 0.75")
+        
+        assert config.settings.scoring.threshold == 0.75
+        assert config.settings.audio.chunk_duration == 0.25
+        assert config.get("scoring.threshold") == 0.75
+    
+    def test_invalid_reload_keeps_snapshot(self, config_file):
+        """Test that an invalid edit leaves the running settings in place."""
+        config = Config(str(config_file), reload_interval=0)
+        
+        self._rewrite(config_file, "threshold: 0.6", "threshold: 7")
+        
+        assert config.settings.scoring.threshold == 0.6
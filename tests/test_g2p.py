@@ -0,0 +1,154 @@
+"""
+Tests for the G2P service and transcription cache.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.config import Config
+from src.g2p.cache import TranscriptionCache
+from src.g2p.service import G2PService, normalize_text
+
+
+class FakeBackend:
+    """Phonemizer stand-in that spells words letter by letter."""
+    
+    def __init__(self, voice):
+        self.voice = voice
+        self.calls = []
+    
+    def phonemize(self, texts, separator=None, strip=True):
+        self.calls.append(list(texts))
+        return [" ".join(text.replace(" ", "")) for text in texts]
+
+
+class JoinedBackend:
+    """Phonemizer stand-in that leaves the phones of each word unseparated."""
+    
+    WORDS = {"think": "θɪŋk", "church": "tʃɜːtʃ"}
+    
+    def phonemize(self, texts, separator=None, strip=True):
+        return [self.WORDS[text] for text in texts]
+
+
+class ExclusiveBackend:
+    """Phonemizer stand-in that records overlapping calls."""
+    
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+    
+    def phonemize(self, texts, separator=None, strip=True):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+        return ["w" for _ in texts]
+
+
+def _make_service(tmp_path, **settings):
+    config = Config("config.yaml")
+    config.set("g2p.cache_path", str(tmp_path / "g2p.sqlite"))
+    for key, value in settings.items():
+        config.set(f"g2p.{key}", value)
+    backends = []
+    def factory(voice):
+        backends.append(FakeBackend(voice))
+        return backends[-1]
+    return G2PService(config, backend_factory=factory), backends
+
+
+class TestTranscriptionCache:
+    """Test cases for TranscriptionCache."""
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        key = ("english", "general_american", "think")
+        cache = TranscriptionCache(tmp_path / "cache.sqlite")
+        cache.put_many({key: ["θ", "ɪ", "ŋ", "k"]})
+        cache.close()
+        
+        reopened = TranscriptionCache(tmp_path / "cache.sqlite")
+        
+        assert reopened.get_many([key]) == {key: ("θ", "ɪ", "ŋ", "k")}
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used rows are evicted first."""
+        cache = TranscriptionCache(tmp_path / "cache.sqlite", max_entries=10, memory_size=0)
+        keys = [("english", "", f"word{i}") for i in range(10)]
+        for key in keys:
+            cache.put_many({key: ["w"]})
+            time.sleep(0.001)
+        cache.get_many(keys[:2])
+        
+        cache.put_many({("english", "", "new"): ["n"]})
+        
+        assert len(cache) == 9
+        assert set(cache.get_many(keys)) == set(keys[:2]) | set(keys[4:])
+
+
+class TestG2PService:
+    """Test cases for G2PService."""
+    
+    def test_normalize_text(self):
+        """Test that cache keys ignore case, punctuation and spacing."""
+        assert normalize_text("  Hello,   WORLD! ") == "hello world"
+        assert normalize_text("don't") == "don't"
+    
+    def test_batches_and_caches(self, tmp_path):
+        """Test that misses are phonemized in batches and hits skip the backend."""
+        service, backends = _make_service(tmp_path, batch_size=2)
+        
+        result = service.transcribe_batch(["ab", "cd", "Ab!", "ef"], "english")
+        
+        assert result == [["a", "b"], ["c", "d"], ["a", "b"], ["e", "f"]]
+        assert len(backends) == 1 and backends[0].voice == "en-us"
+        assert backends[0].calls == [["ab", "cd"], ["ef"]]
+        
+        assert service.transcribe("CD", "english") == ["c", "d"]
+        assert len(backends[0].calls) == 2
+    
+    def test_output_tokenized_against_inventory(self, tmp_path):
+        """Test that phones the backend leaves joined are split by the tokenizer."""
+        service, _ = _make_service(tmp_path)
+        service.backend_factory = lambda voice: JoinedBackend()
+        
+        assert service.transcribe("think", "english") == ["θ", "ɪ", "ŋ", "k"]
+        assert service.transcribe("church", "english") == ["tʃ", "ɜː", "tʃ"]
+    
+    def test_backend_used_by_one_thread_at_a_time(self, tmp_path):
+        """Test that concurrent transcriptions never overlap in a backend."""
+        service, _ = _make_service(tmp_path, batch_size=1)
+        backend = ExclusiveBackend()
+        service.backend_factory = lambda voice: backend
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda i: service.transcribe(f"word{i}", "english"), range(16)))
+        
+        assert backend.calls == 16
+        assert backend.max_active == 1
+    
+    def test_one_backend_per_voice(self, tmp_path):
+        """Test that backends are long-lived and per language."""
+        service, backends = _make_service(tmp_path)
+        service.transcribe("ab", "arabic")
+        service.transcribe("cd", "arabic")
+        service.transcribe("ab", "hebrew")
+        
+        assert [b.voice for b in backends] == ["ar", "he"]
+    
+    def test_disk_cache_survives_restart(self, tmp_path):
+        """Test that a new service reuses transcriptions from disk."""
+        service, _ = _make_service(tmp_path)
+        service.transcribe("hello", "english")
+        service.close()
+        
+        restarted, backends = _make_service(tmp_path)
+        
+        assert restarted.transcribe("hello", "english") == ["h", "e", "l", "l", "o"]
+        assert backends == []
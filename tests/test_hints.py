@@ -0,0 +1,229 @@
+"""
+Tests for the pre-rendered audio hint store.
+"""
+
+import os
+import sys
+import threading
+import types
+import numpy as np
+import pytest
+from src.utils.config import Config
+from src.utils.phoneme_utils import EXEMPLAR_WORDS, get_phoneme_set
+from src.feedback.engine import FeedbackEngine
+from src.feedback.hints import AudioHintStore, hint_key
+
+
+class FakeSynthesizer:
+    """TTS stand-in that renders a short tone per request."""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.calls = []
+
+    def __call__(self, text, voice):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append((text, voice))
+        return np.full(160, 0.25, dtype=np.float32), 16000
+
+
+def _make_store(tmp_path, synthesizer, **settings):
+    config = Config("config.yaml")
+    config.set("feedback.audio_hint_dir", str(tmp_path / "hints"))
+    for key, value in settings.items():
+        config.set(key, value)
+    return AudioHintStore(config, synthesizer=synthesizer), config
+
+
+class TestAudioHintStore:
+    """Test cases for AudioHintStore."""
+
+    def test_key_depends_on_voice_and_model(self):
+        """Test that hints are content-addressed by phoneme, voice and model."""
+        key = hint_key("θ", "en_female", "coqui-tts")
+
+        assert key == hint_key("θ", "en_female", "coqui-tts")
+        assert key != hint_key("θ", "en_male", "coqui-tts")
+        assert key != hint_key("θ", "en_female", "other-tts")
+        assert key != hint_key("ð", "en_female", "coqui-tts")
+        assert key != hint_key("θ", "en_female", "coqui-tts", "thin")
+
+    def test_miss_does_not_block(self, tmp_path):
+        """Test that a missing hint returns immediately and renders in the background."""
+        gate = threading.Event()
+        synthesizer = FakeSynthesizer(gate)
+        store, _ = _make_store(tmp_path, synthesizer)
+
+        assert store.get("θ") is None
+        assert store.path_for("θ") is None
+
+        gate.set()
+        assert store.wait(timeout=5.0)
+        assert synthesizer.calls == [("thin", "en_female")]
+        assert store.path_for("θ") == str(store.path("θ"))
+        np.testing.assert_allclose(store.get("θ"), 0.25, atol=1e-4)
+
+    def test_warm_up_renders_inventories(self, tmp_path):
+        """Test that warm-up renders the exemplar of every phoneme that has one once."""
+        synthesizer = FakeSynthesizer()
+        store, config = _make_store(tmp_path, synthesizer)
+
+        store.warm_up()
+        assert store.wait(timeout=10.0)
+
+        expected = set()
+        for language in config.get_enabled_languages():
+            expected |= get_phoneme_set(language)
+        expected = {EXEMPLAR_WORDS["english"][p] for p in expected if p in EXEMPLAR_WORDS["english"]}
+        assert expected
+        assert {text for text, _ in synthesizer.calls} == expected
+        assert len(synthesizer.calls) == len(expected)
+
+        store.warm_up()
+        assert store.wait(timeout=5.0)
+        assert len(synthesizer.calls) == len(expected)
+
+    def test_disk_cache_shared_across_stores(self, tmp_path):
+        """Test that rendered hints are reused by a new store."""
+        store, _ = _make_store(tmp_path, FakeSynthesizer())
+        store.warm_up(["english"])
+        assert store.wait(timeout=10.0)
+
+        synthesizer = FakeSynthesizer()
+        reopened, _ = _make_store(tmp_path, synthesizer)
+
+        assert reopened.get("θ") is not None
+        assert synthesizer.calls == []
+
+    def test_memory_lru(self, tmp_path):
+        """Test that decoded hints are kept in a bounded LRU."""
+        store, _ = _make_store(tmp_path, FakeSynthesizer(), **{"feedback.hint_cache_size": 2})
+        store.warm_up(["english"])
+        assert store.wait(timeout=10.0)
+
+        first = store.get("θ")
+        assert store.get("θ") is first
+        store.get("ð")
+        store.get("v")
+
+        assert len(store._memory) == 2
+        assert store.get("θ") is not first
+
+    def test_voice_change_rerenders(self, tmp_path):
+        """Test that a different voice does not reuse another voice's hints."""
+        store, _ = _make_store(tmp_path, FakeSynthesizer())
+        store.warm_up(["english"])
+        assert store.wait(timeout=10.0)
+
+        synthesizer = FakeSynthesizer()
+        other, _ = _make_store(tmp_path, synthesizer, **{"models.tts.voice": "en_male"})
+
+        assert other.path_for("θ") is None
+        assert other.wait(timeout=5.0)
+        assert synthesizer.calls == [("thin", "en_male")]
+
+    def test_tts_load_failure_disables_rendering(self, tmp_path, monkeypatch):
+        """Test that a TTS model that fails to load is tried only once."""
+        attempts = []
+
+        def failing_tts(model_path, config_path):
+            attempts.append((model_path, config_path))
+            raise RuntimeError("corrupt checkpoint")
+
+        tts_api = types.ModuleType("TTS.api")
+        tts_api.TTS = failing_tts
+        monkeypatch.setitem(sys.modules, "TTS", types.ModuleType("TTS"))
+        monkeypatch.setitem(sys.modules, "TTS.api", tts_api)
+        store, _ = _make_store(tmp_path, None)
+
+        store.warm_up(["english"])
+        assert store.wait(timeout=5.0)
+        assert store.path_for("θ") is None
+
+        assert attempts == [(store.model_path, store.config_path)]
+        assert not store._pending.unfinished_tasks
+
+    def test_unknown_phoneme_not_queued(self, tmp_path):
+        """Test that phonemes without an exemplar word are never rendered."""
+        synthesizer = FakeSynthesizer()
+        store, _ = _make_store(tmp_path, synthesizer)
+
+        assert store.path_for("ʕ") is None
+        assert store.wait(timeout=5.0)
+        assert synthesizer.calls == []
+
+    @pytest.mark.parametrize("speakers, expected", [
+        (["en_female", "en_male"], "en_female"),
+        (["p225", "p226"], None),
+        (None, None),
+    ])
+    def test_coqui_speaker_selection(self, tmp_path, monkeypatch, speakers, expected):
+        """Test that the voice is passed to Coqui only if the model has that speaker."""
+        calls = []
+
+        class FakeTTS:
+            def __init__(self, model_path, config_path):
+                self.speakers = speakers
+                self.synthesizer = types.SimpleNamespace(output_sample_rate=22050)
+
+            def tts(self, text, speaker=None):
+                calls.append((text, speaker))
+                return [0.0] * 10
+
+        tts_api = types.ModuleType("TTS.api")
+        tts_api.TTS = FakeTTS
+        monkeypatch.setitem(sys.modules, "TTS", types.ModuleType("TTS"))
+        monkeypatch.setitem(sys.modules, "TTS.api", tts_api)
+        store, _ = _make_store(tmp_path, None)
+
+        store.path_for("θ")
+        assert store.wait(timeout=5.0)
+
+        assert calls == [("thin", expected)]
+        assert store.path("θ").exists()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork_resets_renderer(self, tmp_path):
+        """Test that a forked child renders with its own thread and queue."""
+        gate = threading.Event()
+        synthesizer = FakeSynthesizer(gate)
+        store, _ = _make_store(tmp_path, synthesizer)
+        store.path_for("θ")
+
+        pid = os.fork()
+        if pid == 0:
+            clean = store._worker is None and not store._queued
+            gate.set()
+            store.path_for("θ")
+            rendered = store.wait(timeout=5.0) and store.path("θ").exists()
+            os._exit(0 if clean and rendered else 1)
+        _, status = os.waitpid(pid, 0)
+        gate.set()
+        assert store.wait(timeout=5.0)
+
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+class TestFeedbackAudioHints:
+    """Test cases for audio hints in FeedbackEngine."""
+
+    def test_feedback_uses_rendered_hints(self, tmp_path):
+        """Test that feedback only points at rendered hints."""
+        store, config = _make_store(tmp_path, FakeSynthesizer())
+        engine = FeedbackEngine(config, hint_store=store)
+        scores = [{"phoneme": "θ", "score": 0.1}]
+
+        assert engine.generate_feedback(scores, "english")[0]["audio_hint"] is None
+        assert store.wait(timeout=5.0)
+        assert engine.generate_feedback(scores, "english")[0]["audio_hint"] == str(store.path("θ"))
+
+    def test_hints_disabled(self):
+        """Test that no store is created when audio hints are disabled."""
+        config = Config("config.yaml")
+        config.set("feedback.audio_hints", False)
+        engine = FeedbackEngine(config)
+
+        assert engine.hint_store is None
+        assert engine.generate_feedback([{"phoneme": "θ", "score": 0.1}],
+                                        "english")[0]["audio_hint"] is None
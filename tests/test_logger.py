@@ -0,0 +1,85 @@
+"""
+Tests for logging utilities.
+"""
+
+import subprocess
+import sys
+import time
+from loguru import logger
+from src.utils.logger import get_logger, CallSiteLimiter
+
+
+def _capture(enqueue: bool = False, sink=None):
+    messages = []
+    handler_id = logger.add(sink or messages.append, format="{message}", level="DEBUG",
+                            filter=CallSiteLimiter(), enqueue=enqueue)
+    return messages, handler_id
+
+
+class TestLogger:
+    """Test cases for logging helpers."""
+    
+    def test_bound_loggers_cached(self):
+        """Test that get_logger reuses bound loggers."""
+        assert get_logger("Cached") is get_logger("Cached")
+        assert get_logger("Cached") is not get_logger("Cached", rate_limit=1.0)
+    
+    def test_rate_limit_per_call_site(self):
+        """Test that a rate-limited call site emits once per interval."""
+        messages, handler_id = _capture()
+        limited = get_logger("RateLimited", rate_limit=60.0)
+        try:
+            for i in range(100):
+                limited.debug("first site {}", i)
+            limited.debug("second site")
+        finally:
+            logger.remove(handler_id)
+        
+        assert [m.strip() for m in messages] == ["first site 0", "second site"]
+    
+    def test_sampling_reports_suppressed(self):
+        """Test that sampling keeps every Nth message and counts the rest."""
+        messages, handler_id = _capture()
+        sampled = get_logger("Sampled", sample=10)
+        try:
+            for i in range(25):
+                sampled.debug("chunk {}", i)
+        finally:
+            logger.remove(handler_id)
+        
+        assert [m.strip() for m in messages] == [
+            "chunk 0",
+            "chunk 10 (9 similar messages suppressed)",
+            "chunk 20 (9 similar messages suppressed)",
+        ]
+    
+    def test_enqueued_sink_does_not_block(self):
+        """Test that a slow sink does not delay the caller."""
+        written = []
+        def slow_sink(message):
+            time.sleep(0.05)
+            written.append(message)
+        _, handler_id = _capture(enqueue=True, sink=slow_sink)
+        try:
+            start = time.perf_counter()
+            for i in range(5):
+                get_logger("Queued").debug("message {}", i)
+            elapsed = time.perf_counter() - start
+            logger.complete()
+        finally:
+            logger.remove(handler_id)
+        
+        assert elapsed < 0.05
+        assert len(written) == 5
+    
+    def test_sinks_added_on_first_use(self):
+        """Test that importing starts no queue thread until a logger is requested."""
+        code = ("import threading, src.utils.logger as log; "
+                "before = threading.active_count(); log.get_logger('Lazy'); "
+                "print(before, threading.active_count())")
+        result = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True)
+        
+        before, after = map(int, result.stdout.split())
+        assert before == 1
+        assert after > before
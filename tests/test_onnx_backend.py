@@ -0,0 +1,79 @@
+"""
+Tests for the ONNX Runtime backend.
+"""
+
+import gc
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+from src.models.onnx_backend import OnnxSessionPool, resolve_model_file
+
+
+def _matmul_model(path, weight):
+    onnx = pytest.importorskip("onnx")
+    from onnx import helper, numpy_helper, TensorProto
+
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", ["x", "w"], ["y"])],
+        "matmul",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, [None, weight.shape[0]])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, [None, weight.shape[1]])],
+        [numpy_helper.from_array(weight, "w")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+class TestResolveModelFile:
+    """Test cases for resolve_model_file."""
+
+    def test_quantizes_once(self, tmp_path):
+        """Test that a missing quantized model is created next to the full one."""
+        weight = np.random.default_rng(0).standard_normal((64, 32)).astype(np.float32)
+        _matmul_model(tmp_path / "model.onnx", weight)
+
+        model_file = resolve_model_file(tmp_path, quantized=True)
+
+        assert model_file == tmp_path / "model_quantized.onnx"
+        assert model_file.exists()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["model.onnx",
+                                                              "model_quantized.onnx"]
+        assert resolve_model_file(tmp_path, quantized=False) == tmp_path / "model.onnx"
+
+    def test_failed_quantization_leaves_no_file(self, tmp_path, monkeypatch):
+        """Test that an interrupted quantization never publishes a partial model."""
+        from onnxruntime import quantization
+
+        def partial_write(model_input, model_output, **kwargs):
+            with open(model_output, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("killed")
+
+        monkeypatch.setattr(quantization, "quantize_dynamic", partial_write)
+        _matmul_model(tmp_path / "model.onnx", np.eye(4, dtype=np.float32))
+
+        with pytest.raises(RuntimeError):
+            resolve_model_file(tmp_path, quantized=True)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["model.onnx"]
+
+
+class TestPooledSession:
+    """Test cases for PooledSession."""
+
+    def test_non_contiguous_inputs(self, tmp_path):
+        """Test that inputs copied to contiguous memory stay valid during the run."""
+        weight = np.random.default_rng(0).standard_normal((16, 8)).astype(np.float32)
+        pool = OnnxSessionPool(_matmul_model(tmp_path / "model.onnx", weight),
+                               pool_size=1, num_threads=1)
+        x = np.random.default_rng(1).standard_normal((16, 6)).astype(np.float32)
+
+        with pool.acquire() as session:
+            for _ in range(2):
+                # A transposed view is copied before binding
+                output = session.run({"x": x.T})[0]
+                gc.collect()
+                np.testing.assert_allclose(output, x.T @ weight, rtol=1e-5)
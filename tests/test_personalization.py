@@ -0,0 +1,391 @@
+"""
+Tests for personalization statistics.
+"""
+
+import heapq
+import time
+import numpy as np
+import pytest
+from src.utils.config import Config
+from src.utils.phoneme_utils import PHONEME_IDS
+from src.personalization.confusion import ConfusionMatrix
+from src.personalization.engine import PersonalizationEngine
+from src.personalization.storage import ProgressStore, database_path
+from src.personalization.scheduler import DAY, PracticeScheduler, quality_from_score
+
+
+def _score(phoneme, score, recognized=None):
+    item = {"phoneme": phoneme, "score": score}
+    if recognized is not None:
+        item["recognized"] = recognized
+    return item
+
+
+def _make_config(tmp_path, **settings):
+    config = Config("config.yaml")
+    config.set("storage.database", f"sqlite:///{tmp_path / 'progress.db'}")
+    for key, value in settings.items():
+        config.set(key, value)
+    return config
+
+
+class TestConfusionMatrix:
+    """Test cases for ConfusionMatrix."""
+
+    def test_counts_substitutions(self):
+        """Test that expected x recognized pairs are counted."""
+        matrix = ConfusionMatrix()
+        matrix.update([_score("θ", 0.2, "s"), _score("θ", 0.3, "s"),
+                       _score("θ", 0.9, "θ"), _score("ð", 0.1, "z")], 0.6, 0.1)
+
+        assert matrix.counts[PHONEME_IDS["θ"], PHONEME_IDS["s"]] == 2
+        assert matrix.counts[PHONEME_IDS["θ"], PHONEME_IDS["θ"]] == 1
+        assert matrix.counts.sum() == 4
+        assert matrix.top_confusions(2) == [("θ", "s", 2), ("ð", "z", 1)]
+        assert matrix.top_confusions(phoneme="ð") == [("ð", "z", 1)]
+
+    def test_unknown_symbols(self):
+        """Test that unknown expected phonemes are skipped and unknown recognitions kept."""
+        matrix = ConfusionMatrix()
+
+        recorded = matrix.update([_score("θ", 0.2, "<blank>"), _score("@@", 0.5)], 0.6, 0.1)
+
+        assert recorded == 1
+        assert matrix.counts[PHONEME_IDS["θ"], matrix.other_id] == 1
+        assert matrix.top_confusions() == [("θ", "", 1)]
+
+    def test_ewma_matches_sequential_updates(self):
+        """Test that a batched update equals sequential EWMA steps for equal scores."""
+        rate = 0.2
+        batched = ConfusionMatrix()
+        sequential = ConfusionMatrix()
+        batched.update([_score("v", 1.0)], 0.6, rate)
+        sequential.update([_score("v", 1.0)], 0.6, rate)
+
+        batched.update([_score("v", 0.4)] * 3, 0.6, rate)
+        for _ in range(3):
+            sequential.update([_score("v", 0.4)], 0.6, rate)
+
+        index = PHONEME_IDS["v"]
+        assert np.isclose(batched.average_score[index], sequential.average_score[index])
+        assert np.isclose(batched.average_score[index], 0.4 + 0.6 * 0.8 ** 3)
+        assert batched.stats("v") == {"total_attempts": 4, "successful_attempts": 1,
+                                      "average_score": batched.average_score[index]}
+
+    def test_weak_phonemes(self):
+        """Test that weak phonemes are ordered by average score."""
+        matrix = ConfusionMatrix()
+        matrix.update([_score("θ", 0.5), _score("θ", 0.9), _score("w", 0.1),
+                       _score("v", 0.9), _score("ð", 0.3)], 0.6, 0.1)
+
+        assert matrix.weak_phonemes() == ["w", "ð", "θ"]
+        assert matrix.weak_phonemes(min_attempts=2) == ["θ"]
+        assert np.isnan(matrix.success_rate()[PHONEME_IDS["s"]])
+
+    def test_large_history(self):
+        """Test that long histories keep exact counts."""
+        rng = np.random.default_rng(0)
+        symbols = ["θ", "ð", "v", "w", "s", "z"]
+        matrix = ConfusionMatrix()
+        for _ in range(200):
+            picks = rng.integers(0, len(symbols), size=(50, 2))
+            matrix.update([_score(symbols[a], 0.5, symbols[b]) for a, b in picks], 0.6, 0.1)
+
+        assert matrix.counts.sum() == 200 * 50
+        assert matrix.attempts.sum() == 200 * 50
+        assert np.allclose(matrix.average_score[[PHONEME_IDS[p] for p in symbols]], 0.5)
+
+
+class TestPersonalizationEngine:
+    """Test cases for PersonalizationEngine."""
+
+    def test_update_and_weak_phonemes(self, tmp_path):
+        """Test that utterance scores feed the confusion matrix."""
+        engine = PersonalizationEngine(_make_config(tmp_path))
+
+        engine.update_confusion_matrix([_score("θ", 0.2, "s"), _score("v", 0.9, "v")])
+
+        assert engine.get_weak_phonemes() == ["θ"]
+        assert engine.confusion_matrix.top_confusions(1) == [("θ", "s", 1)]
+
+    def test_disabled(self, tmp_path):
+        """Test that nothing is recorded when the confusion matrix is disabled."""
+        engine = PersonalizationEngine(_make_config(
+            tmp_path, **{"personalization.confusion_matrix": False}))
+
+        engine.update_confusion_matrix([_score("θ", 0.2, "s")])
+
+        assert engine.get_weak_phonemes() == []
+
+    def test_progress_round_trip(self, tmp_path):
+        """Test that saved progress is restored by a new engine."""
+        engine = PersonalizationEngine(_make_config(tmp_path), user_id="alice")
+        engine.update_confusion_matrix([_score("θ", 0.2, "s"), _score("θ", 0.4, "s")])
+        engine.update_confusion_matrix([_score("θ", 0.9, "θ"), _score("v", 0.3, "<blank>")])
+        engine.save_user_progress()
+        engine.close()
+
+        restored = PersonalizationEngine(_make_config(tmp_path), user_id="alice")
+        restored.load_user_progress()
+
+        assert np.array_equal(restored.confusion_matrix.counts, engine.confusion_matrix.counts)
+        assert restored.confusion_matrix.stats("θ") == engine.confusion_matrix.stats("θ")
+        assert restored.get_weak_phonemes() == engine.get_weak_phonemes()
+        assert len(restored.store.load_scores("alice")) == 4
+        restored.close()
+
+    def test_unknown_phonemes_not_persisted(self, tmp_path):
+        """Test that stored confusions only cover phonemes of the table, like the matrix."""
+        engine = PersonalizationEngine(_make_config(tmp_path), user_id="alice")
+        engine.update_confusion_matrix([_score("θ", 0.2, "s"), _score("<unk>", 0.1, "s")])
+        engine.save_user_progress()
+
+        assert engine.store.load_confusions("alice") == [("θ", "s", 1)]
+        assert set(engine.store.load_phoneme_stats("alice")) == {"θ"}
+        engine.close()
+
+    def test_schedule_round_trip(self, tmp_path):
+        """Test that review states and due times survive a restart."""
+        engine = PersonalizationEngine(_make_config(tmp_path), user_id="alice")
+        engine.update_confusion_matrix([_score("θ", 0.1, "s"), _score("v", 1.0, "v")])
+        engine.update_confusion_matrix([_score("v", 0.9, "v")])
+        engine.close()
+
+        restored = PersonalizationEngine(_make_config(tmp_path), user_id="alice")
+        restored.load_user_progress()
+
+        assert len(restored.scheduler) == 3
+        for key in [("phoneme", "θ"), ("minimal_pair", "θ", "s"), ("phoneme", "v")]:
+            saved, loaded = engine.scheduler.get(key), restored.scheduler.get(key)
+            assert (loaded.easiness, loaded.interval, loaded.repetitions, loaded.lapses,
+                    loaded.due) == (saved.easiness, saved.interval, saved.repetitions,
+                                    saved.lapses, saved.due)
+        # Items due at the same time may come in either order
+        def by_due(schedule):
+            return sorted(schedule, key=lambda item: (item["due"], item["type"]))
+        assert by_due(restored.generate_practice_schedule()) == by_due(
+            engine.generate_practice_schedule())
+        restored.close()
+
+    def test_storage_disabled(self, tmp_path):
+        """Test that no database is opened when storage is disabled."""
+        engine = PersonalizationEngine(_make_config(tmp_path, **{
+            "storage.scores_storage": False, "storage.confusion_matrix_storage": False,
+            "storage.schedule_storage": False}))
+
+        engine.update_confusion_matrix([_score("θ", 0.2, "s")])
+        engine.save_user_progress()
+
+        assert engine.store is None
+        assert not (tmp_path / "progress.db").exists()
+
+    def test_practice_schedule(self, tmp_path):
+        """Test that failed phonemes and their substitutions come first."""
+        engine = PersonalizationEngine(_make_config(tmp_path))
+        engine.update_confusion_matrix([_score("θ", 0.1, "s"), _score("v", 1.0, "v")])
+
+        schedule = engine.generate_practice_schedule(count=2)
+
+        assert [(item["type"], item["phoneme"]) for item in schedule] == [
+            ("phoneme", "θ"), ("minimal_pair", "θ")]
+        assert schedule[1]["contrast"] == "s"
+        assert all(item["priority"] == "medium" for item in schedule)
+        assert engine.generate_practice_schedule(count=5)[-1]["phoneme"] == "v"
+
+
+    def test_minimal_pair_graduates(self, tmp_path):
+        """Test that correct attempts at a phoneme count as reviews of its contrasts."""
+        engine = PersonalizationEngine(_make_config(tmp_path))
+        engine.update_confusion_matrix([_score("θ", 0.1, "s")])
+        for _ in range(20):
+            engine.update_confusion_matrix([_score("θ", 1.0, "θ")])
+
+        pair = engine.scheduler.get(("minimal_pair", "θ", "s"))
+        assert (pair.lapses, pair.repetitions) == (1, 20)
+        schedule = engine.generate_practice_schedule()
+        assert [item["priority"] for item in schedule] == ["low", "low"]
+
+        engine.update_confusion_matrix([_score("θ", 1.0, "θ"), _score("θ", 0.2, "s")])
+        assert engine.scheduler.get(("minimal_pair", "θ", "s")).lapses == 2
+        engine.close()
+
+
+class TestPracticeScheduler:
+    """Test cases for PracticeScheduler."""
+
+    def test_sm2_intervals(self):
+        """Test that successful reviews follow the SM-2 interval sequence."""
+        scheduler = PracticeScheduler()
+        key = ("phoneme", "θ")
+
+        item = scheduler.review(key, 5, now=0.0)
+        assert item.due == DAY
+        item = scheduler.review(key, 5, now=item.due)
+        assert item.interval == 6 * DAY
+        item = scheduler.review(key, 5, now=item.due)
+        # The interval grows by the easiness from before this review
+        assert np.isclose(item.interval, 6 * DAY * 2.7)
+        assert np.isclose(item.easiness, 2.8)
+
+    def test_failure_relearns(self):
+        """Test that a failed review resets repetitions and lowers easiness."""
+        scheduler = PracticeScheduler(relearn_interval=60.0)
+        key = ("minimal_pair", "θ", "s")
+        scheduler.review(key, 5, now=0.0)
+
+        item = scheduler.review(key, 1, now=100.0)
+
+        assert item.due == 160.0
+        assert item.repetitions == 0
+        assert item.lapses == 1
+        assert item.easiness < 2.5
+        assert quality_from_score(0.6) == 3
+
+    def test_minimal_pairs_index(self):
+        """Test that pairs are found by their expected phoneme after add, remove and restore."""
+        scheduler = PracticeScheduler()
+        scheduler.add(("minimal_pair", "θ", "s"))
+        scheduler.add(("minimal_pair", "θ", "t"))
+        scheduler.add(("phoneme", "θ"))
+        scheduler.remove(("minimal_pair", "θ", "t"))
+
+        assert scheduler.minimal_pairs("θ") == [("minimal_pair", "θ", "s")]
+        restored = PracticeScheduler()
+        restored.restore(scheduler.next_items(10))
+        assert restored.minimal_pairs("θ") == [("minimal_pair", "θ", "s")]
+        assert restored.minimal_pairs("s") == []
+
+    def test_next_items_order(self):
+        """Test that next items come in due order and rescheduling moves them."""
+        scheduler = PracticeScheduler()
+        for i in range(5):
+            scheduler.add(("phoneme", str(i)), due=float(i))
+
+        scheduler.review(("phoneme", "0"), 5, now=10.0)
+        scheduler.remove(("phoneme", "2"))
+
+        keys = [item.key[1] for item in scheduler.next_items(3)]
+        assert keys == ["1", "3", "4"]
+        assert [item.key[1] for item in scheduler.next_items(10)] == ["1", "3", "4", "0"]
+        assert len(scheduler) == 4
+
+    def test_many_items(self, monkeypatch):
+        """Test that large schedules stay consistent and bounded."""
+        rng = np.random.default_rng(0)
+        scheduler = PracticeScheduler()
+        keys = [("phoneme", str(i)) for i in range(5000)]
+        for key in keys:
+            scheduler.add(key, due=0.0)
+        for step in range(20000):
+            key = keys[rng.integers(len(keys))]
+            scheduler.review(key, int(rng.integers(0, 6)), now=float(step))
+
+        heap_size = len(scheduler._heap)
+        stale = heap_size - len(scheduler)
+        pops = []
+        heappop = heapq.heappop
+        monkeypatch.setattr(heapq, "heappop", lambda heap: pops.append(1) or heappop(heap))
+        items = scheduler.next_items(20)
+
+        dues = sorted(scheduler.get(key).due for key in keys)
+        assert [item.due for item in items] == dues[:20]
+        assert heap_size <= 2 * len(scheduler) + 64
+        # Only the earliest entries are popped; stale ones are dropped and
+        # live ones pushed back
+        assert len(pops) <= 20 + stale
+        assert len(pops) < len(scheduler) // 10
+        assert len(scheduler._heap) == heap_size - (len(pops) - 20)
+
+
+class TestProgressStore:
+    """Test cases for ProgressStore."""
+
+    def test_database_path(self):
+        """Test that storage URLs resolve to files."""
+        assert database_path("sqlite:///data/user_progress.db") == "data/user_progress.db"
+        assert database_path("sqlite:////tmp/progress.db") == "/tmp/progress.db"
+        assert database_path("sqlite://") == ":memory:"
+        assert database_path("progress.db") == "progress.db"
+
+    def test_write_behind(self, tmp_path):
+        """Test that writes are queued and committed together by the writer."""
+        store = ProgressStore(tmp_path / "progress.db", flush_interval=60.0)
+        store.record_confusions("u", [("θ", "s", 2)])
+        store.record_confusions("u", [("θ", "s", 3), ("ð", "z", 1)])
+
+        assert store.load_confusions("u") == []
+        assert store.flush(timeout=5.0)
+        assert sorted(store.load_confusions("u")) == [("ð", "z", 1), ("θ", "s", 5)]
+        store.close()
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_closed_store(self, tmp_path, monkeypatch):
+        """Test that a closed store or a dead writer fails fast instead of blocking."""
+        store = ProgressStore(tmp_path / "progress.db")
+        store.close()
+
+        assert not store.flush()
+        with pytest.raises(RuntimeError):
+            store.record_confusions("u", [("θ", "s", 1)])
+
+        dead = ProgressStore(tmp_path / "dead.db")
+        monkeypatch.setattr(dead, "_commit", lambda batch: 1 / 0)
+        dead.record_confusions("u", [("θ", "s", 1)])
+        assert not dead.flush(timeout=5.0)
+        with pytest.raises(RuntimeError):
+            dead.record_confusions("u", [("θ", "s", 1)])
+        dead.close()
+
+    def test_flush_interval(self, tmp_path):
+        """Test that queued writes are committed within the flush interval."""
+        store = ProgressStore(tmp_path / "progress.db", flush_interval=0.05)
+        store.record_scores("u", "s1", [_score("θ", 0.5, "s")])
+
+        deadline = time.monotonic() + 5.0
+        while not store.load_scores("u") and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert store.load_scores("u")[0]["recognized"] == "s"
+        store.close()
+
+    def test_wal_mode(self, tmp_path):
+        """Test that the database uses write-ahead logging."""
+        store = ProgressStore(f"sqlite:///{tmp_path / 'progress.db'}")
+
+        assert store._read("PRAGMA journal_mode", ()) == [("wal",)]
+        store.close()
+
+    def test_checkpoint_interval(self, tmp_path):
+        """Test that commits are checkpointed into the database file by the writer."""
+        path = tmp_path / "progress.db"
+        store = ProgressStore(path, flush_interval=0.0, checkpoint_interval=0.05)
+        store.record_confusions("u", [("θ", "s", 2)])
+        assert store.flush(timeout=5.0)
+
+        def checkpointed():
+            # The database file without its log holds only checkpointed commits
+            copy = tmp_path / f"copy{time.monotonic_ns()}.db"
+            copy.write_bytes(path.read_bytes())
+            reader = ProgressStore(copy)
+            try:
+                return reader.load_confusions("u") == [("θ", "s", 2)]
+            finally:
+                reader.close()
+
+        deadline = time.monotonic() + 5.0
+        while not checkpointed() and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert checkpointed()
+        store.close()
+
+    def test_close_commits(self, tmp_path):
+        """Test that closing commits pending writes."""
+        store = ProgressStore(tmp_path / "progress.db", flush_interval=60.0)
+        store.record_phoneme_stats("u", {"θ": {"total_attempts": 3, "successful_attempts": 1,
+                                              "average_score": 0.4}})
+        store.close()
+
+        reopened = ProgressStore(tmp_path / "progress.db")
+        assert reopened.load_phoneme_stats("u")["θ"]["total_attempts"] == 3
+        reopened.close()
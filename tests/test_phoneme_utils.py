@@ -0,0 +1,113 @@
+"""
+Tests for phoneme utilities.
+"""
+
+import numpy as np
+import pytest
+from src.utils.phoneme_utils import (
+    PHONEME_SYMBOLS,
+    PHONEME_IDS,
+    UNKNOWN_ID,
+    get_inventory,
+    get_phoneme_set,
+    get_common_confusions,
+    get_confusion_matrix,
+    encode_phonemes,
+    decode_phonemes,
+    is_phoneme_valid,
+    get_phoneme_category,
+    get_tokenizer
+)
+
+
+class TestPhonemeTable:
+    """Test cases for the interned phoneme table."""
+    
+    def test_dense_ids_round_trip(self):
+        """Test that IDs are dense and encode/decode invert each other."""
+        assert [PHONEME_IDS[p] for p in PHONEME_SYMBOLS] == list(range(len(PHONEME_SYMBOLS)))
+        
+        ids = encode_phonemes(["θ", "ɪ", "ŋ", "not-a-phoneme"])
+        
+        assert ids.dtype == np.int32
+        assert ids[-1] == UNKNOWN_ID
+        assert decode_phonemes(ids) == ["θ", "ɪ", "ŋ", ""]
+    
+    def test_inventory_mask(self):
+        """Test vectorized membership against the string sets."""
+        inventory = get_inventory("arabic")
+        ids = encode_phonemes(["q", "θ", "p", "?"])
+        
+        assert inventory.contains(ids).tolist() == [True, True, False, False]
+        assert inventory is get_inventory("arabic")
+        assert set(inventory.symbols) == get_phoneme_set("arabic")
+        with pytest.raises(ValueError):
+            inventory.mask[0] = True
+    
+    def test_phoneme_set_cached(self):
+        """Test that phoneme sets are shared and immutable."""
+        assert get_phoneme_set("english") is get_phoneme_set("english")
+        assert isinstance(get_phoneme_set("english"), frozenset)
+        assert is_phoneme_valid("ð", "english")
+        assert not is_phoneme_valid("ħ", "english")
+        with pytest.raises(ValueError):
+            get_phoneme_set("klingon")
+    
+    def test_confusions(self):
+        """Test confusion lists and their matrix form."""
+        assert ("θ", "t") in get_common_confusions("english", "arabic")
+        assert ("ɹ", "ʁ") in get_common_confusions("english", "hebrew")
+        assert get_common_confusions("hebrew", "arabic") == []
+        
+        matrix = get_confusion_matrix("english", "arabic")
+        
+        assert matrix[PHONEME_IDS["θ"], PHONEME_IDS["t"]]
+        assert not matrix[PHONEME_IDS["t"], PHONEME_IDS["θ"]]
+        assert matrix.sum() == len(get_common_confusions("english", "arabic"))
+    
+    def test_categories(self):
+        """Test categories from the table, including long vowels."""
+        assert get_phoneme_category("iː") == "vowel"
+        assert get_phoneme_category("aɪ") == "diphthong"
+        assert get_phoneme_category("tʃ") == "consonant"
+        assert get_phoneme_category("ʔ") == "consonant"
+
+
+class TestPhonemeTokenizer:
+    """Test cases for the longest-match IPA tokenizer."""
+    
+    def test_longest_match(self):
+        """Test that multi-character phonemes are kept whole."""
+        tokenizer = get_tokenizer("english")
+        
+        assert tokenizer.tokenize("tʃɜːtʃ") == ["tʃ", "ɜː", "tʃ"]
+        assert tokenizer.tokenize("haʊs ðɪs") == ["h", "aʊ", "s", "ð", "ɪ", "s"]
+        assert tokenizer.tokenize("dʒeɪ") == ["dʒ", "eɪ"]
+    
+    def test_normalization(self):
+        """Test that tie bars, stress, script g and ASCII length are normalized."""
+        tokenizer = get_tokenizer("english")
+        
+        assert tokenizer.tokenize("ˈt͡ʃiːz") == ["tʃ", "iː", "z"]
+        assert tokenizer.tokenize("ɡuː") == tokenizer.tokenize("gu:") == ["g", "uː"]
+    
+    def test_unknown_characters(self):
+        """Test that unmatched characters become single tokens."""
+        tokenizer = get_tokenizer("arabic")
+        
+        assert tokenizer.tokenize("ŋa") == ["ŋ", "a"]
+        assert tokenizer.tokenize_ids("ŋa").tolist() == [PHONEME_IDS["ŋ"], PHONEME_IDS["a"]]
+        assert tokenizer.tokenize_ids("☃").tolist() == [UNKNOWN_ID]
+    
+    def test_memoized_words(self):
+        """Test that repeated words hit the cache."""
+        tokenizer = get_tokenizer()
+        tokenizer.tokenize("kæt kæt kæt")
+        
+        assert tokenizer._tokenize_word.cache_info().hits >= 2
+    
+    def test_category_of_variants(self):
+        """Test categories of IPA variants outside the table."""
+        assert get_phoneme_category("t͡ʃ") == "consonant"
+        assert get_phoneme_category("ˈa") == "vowel"
+        assert get_phoneme_category("ɛə") == "diphthong"
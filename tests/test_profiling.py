@@ -0,0 +1,128 @@
+"""
+Tests for latency tracing.
+"""
+
+import time
+from src.utils.config import Config
+from src.utils.profiling import LatencyHistogram, LatencyTracer
+
+
+def _make_tracer(enabled: bool = True, budget_ms: int = 300) -> LatencyTracer:
+    config = Config("config.yaml")
+    config.set("debug.profile_performance", enabled)
+    config.set("feedback.latency_target", budget_ms)
+    return LatencyTracer(config)
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+    
+    def test_percentiles_within_bucket_resolution(self):
+        """Test that percentiles are accurate to the bucket growth factor."""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.add(float(value))
+        
+        summary = histogram.summary()
+        
+        assert summary["count"] == 1000
+        assert abs(summary["mean"] - 500.5) < 1e-9
+        for q, expected in (("p50", 500), ("p95", 950), ("p99", 990)):
+            assert expected <= summary[q] <= expected * 1.05
+        assert summary["max"] == 1000
+    
+    def test_fixed_memory(self):
+        """Test that recording more samples does not grow the histogram."""
+        histogram = LatencyHistogram()
+        buckets = len(histogram.counts)
+        for value in (0.0, 1e-6, 1e9):
+            histogram.add(value)
+        
+        assert len(histogram.counts) == buckets
+        assert histogram.percentile(100) == 1e9
+
+
+class TestLatencyTracer:
+    """Test cases for LatencyTracer."""
+    
+    def test_stage_spans(self):
+        """Test that spans accumulate into per-stage histograms."""
+        tracer = _make_tracer()
+        trace = tracer.start("utt")
+        with trace.span("vad"):
+            time.sleep(0.01)
+        with trace.span("scoring"):
+            pass
+        with trace.span("scoring"):
+            pass
+        
+        assert tracer.finish(trace) is False
+        report = tracer.report()
+        assert list(report["stages"]) == ["vad", "scoring", "total"]
+        assert report["stages"]["vad"]["p50"] >= 9.0
+        assert report["utterances"] == 1
+        assert "vad" in tracer.format_report()
+    
+    def test_budget_violations(self):
+        """Test that slow utterances are flagged and kept."""
+        tracer = _make_tracer(budget_ms=100)
+        
+        assert tracer.record({"features": 20.0, "scoring": 30.0}) is False
+        assert tracer.record({"features": 50.0, "scoring": 90.0}, utterance_id="slow") is True
+        
+        report = tracer.report()
+        assert report["over_budget"] == 1
+        assert report["violations"] == [{"id": "slow", "total": 140.0,
+                                         "stages": {"features": 50.0, "scoring": 90.0}}]
+        assert tracer.slowest_stages() == ["scoring"]
+    
+    def test_latency_since_last_input(self):
+        """Test that end-to-end latency can be measured from a later point."""
+        tracer = _make_tracer(budget_ms=50)
+        trace = tracer.start("utt")
+        trace.add("capture", 5.0)
+        time.sleep(0.06)
+        
+        assert tracer.finish(trace, since=time.perf_counter()) is False
+        report = tracer.report()
+        assert report["stages"]["capture"]["max"] == 5.0
+        assert report["stages"]["total"]["max"] < 50
+    
+    def test_emission_latency(self):
+        """Test that live results are checked against the budget separately from utterances."""
+        tracer = _make_tracer(budget_ms=100)
+        
+        assert tracer.record_emission(40.0) is False
+        assert tracer.record_emission(150.0, "utt") is True
+        
+        report = tracer.report()
+        assert report["emission"]["count"] == 2
+        assert report["late_emissions"] == 1
+        assert report["utterances"] == 0
+        assert "emission" in tracer.format_report()
+    
+    def test_without_budget(self):
+        """Test that a tracer without a budget records but never flags latencies."""
+        config = Config("config.yaml")
+        config.set("debug.profile_performance", True)
+        config.set("feedback.latency_target", 100)
+        tracer = LatencyTracer(config, check_budget=False)
+        
+        assert tracer.record({"features": 5000.0}, utterance_id="long") is False
+        assert tracer.record_emission(5000.0) is False
+        
+        report = tracer.report()
+        assert report["budget_ms"] is None
+        assert report["over_budget"] == 0 and report["late_emissions"] == 0
+        assert report["stages"]["total"]["max"] >= 5000.0
+        assert "budget" not in tracer.format_report().splitlines()[0]
+    
+    def test_disabled_is_noop(self):
+        """Test that a disabled tracer records nothing."""
+        tracer = _make_tracer(enabled=False)
+        trace = tracer.start()
+        with trace.span("vad"):
+            pass
+        
+        assert tracer.finish(trace) is False
+        assert tracer.report()["utterances"] == 0
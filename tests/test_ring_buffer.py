@@ -0,0 +1,108 @@
+"""
+Tests for the streaming capture ring buffer.
+"""
+
+import threading
+import numpy as np
+import pytest
+from src.audio.ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+    """Test cases for RingBuffer class."""
+
+    def test_chunks_are_views(self):
+        """Test that chunks are zero-copy, read-only views."""
+        ring = RingBuffer(chunk_size=4, num_chunks=3)
+        ring.write(np.arange(8, dtype=np.float32))
+
+        chunk = ring.read_chunk(timeout=0)
+        assert np.shares_memory(chunk, ring._buffer)
+        assert not chunk.flags.writeable
+        np.testing.assert_array_equal(chunk, [0, 1, 2, 3])
+        np.testing.assert_array_equal(ring.read_chunk(timeout=0), [4, 5, 6, 7])
+
+    def test_wrap_around(self):
+        """Test writes that straddle the end of the buffer."""
+        ring = RingBuffer(chunk_size=4, num_chunks=2)
+        ring.write(np.arange(6, dtype=np.float32))
+        ring.read_chunk(timeout=0)
+        assert ring.read_chunk(timeout=0) is None
+        ring.write(np.arange(6, 12, dtype=np.float32))
+
+        np.testing.assert_array_equal(ring.read_chunk(timeout=0), [4, 5, 6, 7])
+        np.testing.assert_array_equal(ring.read_chunk(timeout=0), [8, 9, 10, 11])
+
+    def test_overrun_protects_held_chunk(self):
+        """Test that a full buffer drops new samples instead of overwriting."""
+        ring = RingBuffer(chunk_size=4, num_chunks=2)
+        ring.write(np.ones(8, dtype=np.float32))
+        chunk = ring.read_chunk(timeout=0)
+
+        written = ring.write(np.zeros(4, dtype=np.float32))
+        assert written == 0
+        assert ring.overruns == 1
+        assert ring.dropped_samples == 4
+        np.testing.assert_array_equal(chunk, np.ones(4))
+
+    def test_underrun_and_timeout(self):
+        """Test that a wait that times out counts an underrun, a poll does not."""
+        ring = RingBuffer(chunk_size=4, num_chunks=2)
+        ring.write(np.ones(2, dtype=np.float32))
+
+        assert ring.read_chunk(timeout=0) is None
+        assert ring.underruns == 0
+        assert ring.read_chunk(timeout=0.01) is None
+        assert ring.underruns == 1
+
+    def test_underrun_only_when_starved(self):
+        """Test that waiting up to a chunk's duration is not an underrun."""
+        ring = RingBuffer(chunk_size=4, num_chunks=2, chunk_duration=0.05)
+
+        def write_after(delay):
+            timer = threading.Timer(delay, ring.write, (np.ones(4, dtype=np.float32),))
+            timer.start()
+            return timer
+
+        write_after(0.01)
+        assert ring.read_chunk(timeout=5) is not None
+        assert ring.underruns == 0
+
+        write_after(0.15)
+        assert ring.read_chunk(timeout=5) is not None
+        assert ring.underruns == 1
+
+        assert ring.read_chunk(timeout=0.01) is None
+        assert ring.underruns == 1
+
+    def test_threaded_producer(self):
+        """Test that every sample arrives in order across threads."""
+        ring = RingBuffer(chunk_size=160, num_chunks=8)
+        source = np.arange(160 * 50, dtype=np.float32)
+
+        def produce():
+            for block in np.array_split(source, 137):
+                while ring.available() + len(block) > ring.capacity:
+                    pass
+                ring.write(block)
+            ring.close()
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = []
+        while True:
+            chunk = ring.read_chunk(timeout=5)
+            if chunk is None:
+                break
+            received.append(chunk.copy())
+        producer.join()
+
+        assert ring.overruns == 0
+        np.testing.assert_array_equal(np.concatenate(received), source)
+
+    def test_invalid_sizes(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            RingBuffer(chunk_size=0)
+        with pytest.raises(ValueError):
+            RingBuffer(chunk_size=4, num_chunks=1)
@@ -0,0 +1,170 @@
+"""
+Tests for the pre-fork supervisor and shared model weights.
+"""
+
+import gc
+import os
+import time
+import numpy as np
+import pytest
+from src.supervisor import PreforkSupervisor, process_memory
+from src.utils.config import Config
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+
+@pytest.fixture(autouse=True)
+def unfreeze_heap():
+    """Undo the gc.freeze() of PreforkSupervisor.preload after each test."""
+    yield
+    gc.unfreeze()
+
+
+class FakeAcousticModel:
+    """Acoustic model stand-in that records weight sharing."""
+
+    label_phoneme_ids = np.arange(4)
+
+    def __init__(self):
+        self.shared = False
+
+    def share_weights(self):
+        self.shared = True
+        return True
+
+
+class FakeComponents:
+    def __init__(self):
+        self.acoustic_model = FakeAcousticModel()
+        self.vad_model = object()
+
+
+def _matmul_model(path, weight):
+    onnx = pytest.importorskip("onnx")
+    from onnx import helper, numpy_helper, TensorProto
+
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", ["x", "w"], ["y"])],
+        "matmul",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, [None, weight.shape[0]])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, [None, weight.shape[1]])],
+        [numpy_helper.from_array(weight, "w")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+def _wait_for(condition, supervisor, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        supervisor.poll()
+        time.sleep(0.02)
+    return condition()
+
+
+class TestSharedWeights:
+    """Test cases for SharedWeights."""
+
+    def test_sessions_use_shared_weights(self, tmp_path):
+        """Test that sessions run on the shared buffers and match plain inference."""
+        pytest.importorskip("onnxruntime")
+        from src.models.onnx_backend import OnnxSessionPool
+
+        weight = np.random.default_rng(0).standard_normal((16, 8)).astype(np.float32)
+        model_file = _matmul_model(tmp_path / "model.onnx", weight)
+        x = np.ones((3, 16), dtype=np.float32)
+
+        plain = OnnxSessionPool(model_file, pool_size=1, num_threads=1)
+        with plain.acquire() as session:
+            expected = session.run({"x": x})[0].copy()
+
+        pool = OnnxSessionPool(model_file, pool_size=2, num_threads=2)
+        assert pool.share_weights()
+        shared = pool.shared_weights.arrays["w"]
+        assert not shared.flags.writeable
+        np.testing.assert_array_equal(shared, weight)
+        assert pool.shared_weights.ort_values()["w"].data_ptr() == shared.ctypes.data
+
+        with pool.acquire() as session:
+            np.testing.assert_allclose(session.run({"x": x})[0], expected, rtol=1e-6)
+
+    def test_not_shared_after_load(self, tmp_path):
+        """Test that weights are not moved once sessions exist."""
+        pytest.importorskip("onnxruntime")
+        from src.models.onnx_backend import OnnxSessionPool
+
+        model_file = _matmul_model(tmp_path / "model.onnx", np.eye(4, dtype=np.float32))
+        pool = OnnxSessionPool(model_file, pool_size=1, num_threads=1)
+        pool.load()
+
+        assert not pool.share_weights()
+
+
+class TestPreforkSupervisor:
+    """Test cases for PreforkSupervisor."""
+
+    def test_preload(self):
+        """Test that weights are shared before any worker starts."""
+        components = FakeComponents()
+        supervisor = PreforkSupervisor(Config("config.yaml"), components,
+                                       lambda index, registry: None, num_workers=1)
+
+        supervisor.preload()
+
+        assert components.acoustic_model.shared
+        assert gc.get_freeze_count() > 0
+
+    def test_restarts_crashed_worker(self, tmp_path):
+        """Test that a worker that fails is started again with the same index."""
+        crashed = tmp_path / "crashed"
+        started = tmp_path / "started"
+
+        def worker_main(index, components):
+            with open(started, "a") as f:
+                f.write(f"{index}\n")
+            if index == 1 and not crashed.exists():
+                crashed.touch()
+                raise RuntimeError("worker crashed")
+            time.sleep(60)
+
+        supervisor = PreforkSupervisor(Config("config.yaml"), FakeComponents(), worker_main,
+                                       num_workers=2, restart_delay=0.0)
+        supervisor.start()
+        try:
+            assert _wait_for(lambda: supervisor.restarts == 1, supervisor)
+            assert _wait_for(lambda: started.exists()
+                             and len(started.read_text().split()) == 3, supervisor)
+            assert sorted(started.read_text().split()) == ["0", "1", "1"]
+            assert sorted(supervisor.workers.values()) == [0, 1]
+        finally:
+            supervisor.stop(timeout=5.0)
+
+        assert supervisor.workers == {}
+
+    def test_worker_memory(self):
+        """Test that memory is reported for every live worker."""
+        supervisor = PreforkSupervisor(Config("config.yaml"), FakeComponents(),
+                                       lambda index, components: time.sleep(60),
+                                       num_workers=2)
+        supervisor.start()
+        try:
+            report = supervisor.worker_memory()
+        finally:
+            supervisor.stop(timeout=5.0)
+
+        assert sorted(report) == [0, 1]
+        for memory in report.values():
+            assert memory["rss_mb"] > 0
+            if "pss_mb" in memory:
+                assert memory["pss_mb"] <= memory["rss_mb"]
+
+    def test_process_memory_of_missing_process(self):
+        """Test that a process that has exited reports nothing."""
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert process_memory(pid) == {}
@@ -0,0 +1,70 @@
+"""
+Tests for WAV file I/O.
+"""
+
+import wave
+import numpy as np
+from src.audio.wav_io import read_wav_info, open_wav, read_blocks, write_wav
+from src.audio.processor import AudioProcessor
+from src.utils.config import Config
+
+
+def _ramp(num_samples: int) -> np.ndarray:
+    return np.linspace(-0.5, 0.5, num_samples, dtype=np.float32)
+
+
+class TestWavIO:
+    """Test cases for memory-mapped WAV I/O."""
+    
+    def test_pcm16_round_trip(self, tmp_path):
+        """Test that 16-bit files are readable by the wave module and back."""
+        path = tmp_path / "ramp.wav"
+        audio = _ramp(10000)
+        assert write_wav(path, audio, 16000) == 10000
+        
+        with wave.open(str(path), "rb") as f:
+            assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, 16000)
+            assert f.getnframes() == 10000
+        
+        samples, info = open_wav(path)
+        assert isinstance(samples, np.memmap)
+        assert samples.dtype == np.dtype("<i2")
+        assert info.duration == 10000 / 16000
+        np.testing.assert_allclose(samples[:, 0] / 32768.0, audio, atol=1e-4)
+    
+    def test_float_load_is_zero_copy(self, tmp_path):
+        """Test that mono float32 files load as a view of the file."""
+        path = tmp_path / "float.wav"
+        write_wav(path, iter(np.split(_ramp(16000), 4)), 16000, sample_width=4)
+        
+        audio = AudioProcessor(Config("config.yaml")).load_audio(str(path))
+        assert isinstance(audio.base, np.memmap)
+        np.testing.assert_array_equal(audio, _ramp(16000))
+    
+    def test_stereo_blocks(self, tmp_path):
+        """Test block iteration and channel mixing on a stereo file."""
+        path = tmp_path / "stereo.wav"
+        left = (np.arange(2500) % 100).astype(np.int16) * 100
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(8000)
+            f.writeframes(np.stack([left, -left], axis=1).tobytes())
+        
+        info = read_wav_info(path)
+        assert (info.channels, info.num_frames) == (2, 2500)
+        
+        blocks = list(read_blocks(path, 0.1))
+        assert [len(b) for b in blocks] == [800, 800, 800, 100]
+        assert all(b.dtype == np.float32 for b in blocks)
+        np.testing.assert_array_equal(np.concatenate(blocks), 0.0)
+    
+    def test_resampled_blocks(self, tmp_path):
+        """Test that processor blocks come out at the configured rate."""
+        path = tmp_path / "hi_rate.wav"
+        write_wav(path, _ramp(48000), 48000)
+        
+        processor = AudioProcessor(Config("config.yaml"))
+        blocks = list(processor.read_blocks(str(path), 0.25))
+        assert sum(len(b) for b in blocks) == 16000
+        assert len(processor.load_audio(str(path))) == 16000
@@ -0,0 +1,298 @@
+"""
+Tests for the WebSocket streaming server.
+"""
+
+import asyncio
+import json
+import time
+import numpy as np
+from src.utils.config import Config
+from src.components import ComponentRegistry
+from src.models.acoustic import AcousticModel
+from src.web.server import WebServer, StreamSession, PcmDecoder, decode_pcm
+
+
+class FakeWebSocket:
+    """In-process stand-in for a websockets connection."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.received = 0
+        self.sent = []
+        self.closed = None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            self.received += 1
+            yield message
+            await asyncio.sleep(0)
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self, code, reason=""):
+        self.closed = (code, reason)
+
+    def of_type(self, message_type):
+        return [m for m in self.sent if m["type"] == message_type]
+
+
+def _speech(sample_rate=16000):
+    """Half a second of silence around one second of noise bursts."""
+    rng = np.random.default_rng(0)
+    silence = np.zeros(sample_rate // 2, dtype=np.float32)
+    speech = 0.3 * rng.standard_normal(sample_rate).astype(np.float32)
+    return np.concatenate((silence, speech, silence))
+
+
+def _tones(sample_rate=16000):
+    """Half a second of silence around three 0.3 s tones, one per reference phoneme."""
+    t = np.arange(int(0.3 * sample_rate)) / sample_rate
+    tones = [0.3 * np.sin(2 * np.pi * freq * t) for freq in (300.0, 1200.0, 3500.0)]
+    silence = np.zeros(sample_rate // 2)
+    return np.concatenate([silence] + tones + [silence]).astype(np.float32)
+
+
+def _tone_log_probs(model, frames):
+    """Posteriors peaked on θ, ɪ or ŋ by the loudest mel band of each log-mel frame."""
+    vocabulary = model.vocabulary
+    tokens = np.array([vocabulary[p] for p in ("θ", "ɪ", "ŋ")])[
+        np.searchsorted([20, 45], frames.argmax(axis=1), side="right")]
+    tokens[frames.max(axis=1) < -10] = model.blank_id
+    log_probs = np.full((len(frames), len(vocabulary)), -10.0, dtype=np.float32)
+    log_probs[np.arange(len(frames)), tokens] = 0.0
+    return log_probs
+
+
+def _chunks(audio, chunk_size=1600):
+    pcm = (audio * 32767).astype("<i2")
+    return [pcm[i:i + chunk_size].tobytes() for i in range(0, len(pcm), chunk_size)]
+
+
+def _make_server(**settings):
+    config = Config("config.yaml")
+    config.set("feedback.audio_hints", False)
+    for key, value in settings.items():
+        config.set(key, value)
+    return WebServer(config, ComponentRegistry(config), "english")
+
+
+def _session_messages(reference="θ ɪ ŋ"):
+    start = {"type": "start", "reference": reference}
+    return [json.dumps(start)] + _chunks(_speech()) + [json.dumps({"type": "end"})]
+
+
+class TestWebServer:
+    """Test cases for WebServer."""
+
+    def test_decode_pcm(self):
+        """Test that both sample formats decode to float32."""
+        pcm16 = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+        float32 = np.array([0.5, -0.25], dtype="<f4").tobytes()
+
+        np.testing.assert_allclose(decode_pcm(pcm16, "pcm16"), [0.0, 0.5, -1.0])
+        np.testing.assert_allclose(decode_pcm(float32 + b"\x00", "float32"), [0.5, -0.25])
+
+    def test_decoder_keeps_partial_samples(self):
+        """Test that samples split across messages are reassembled."""
+        samples = np.array([0.5, -0.25, 0.125], dtype="<f4")
+        data = samples.tobytes()
+        decoder = PcmDecoder("float32")
+
+        decoded = [decoder.decode(data[i:i + 5]) for i in range(0, len(data), 5)]
+
+        assert [len(d) for d in decoded] == [1, 1, 1]
+        np.testing.assert_array_equal(np.concatenate(decoded), samples)
+        assert len(decoder.decode(data[:7])) == 1
+        np.testing.assert_array_equal(decoder.decode(data[7:]), samples[1:])
+
+    def test_odd_sized_messages(self):
+        """Test that a stream split at odd byte offsets scores like an aligned one."""
+        aligned = FakeWebSocket(_session_messages())
+        asyncio.run(_make_server().handle(aligned))
+
+        data = b"".join(_chunks(_speech()))
+        messages = _session_messages()
+        messages[1:-1] = [data[i:i + 3201] for i in range(0, len(data), 3201)]
+        split = FakeWebSocket(messages)
+        asyncio.run(_make_server().handle(split))
+
+        assert split.of_type("result")[0]["scores"] == aligned.of_type("result")[0]["scores"]
+
+    def test_session_scores_utterance(self):
+        """Test that a streamed utterance is detected, scored and answered."""
+        server = _make_server()
+        websocket = FakeWebSocket(_session_messages())
+
+        asyncio.run(server.handle(websocket))
+
+        types = [m["type"] for m in websocket.sent]
+        assert types[0] == "ready"
+        assert websocket.sent[0]["reference"] == ["θ", "ɪ", "ŋ"]
+        assert types.index("speech_start") < types.index("speech_end") < types.index("result")
+        result = websocket.of_type("result")[0]
+        assert [s["phoneme"] for s in result["scores"]] == ["θ", "ɪ", "ŋ"]
+        assert 0.4 < result["start"] < result["end"] < 1.7
+        assert websocket.sent[-1] == {"type": "end", "utterances": 1}
+        assert server.active_sessions == 0
+
+    def test_phonemes_emitted_while_speaking(self, monkeypatch):
+        """Test that phonemes are sent before the learner stops, within the latency target."""
+        monkeypatch.setattr(AcousticModel, "frames_to_log_probs", _tone_log_probs)
+        server = _make_server(**{"debug.profile_performance": True})
+        messages = [json.dumps({"type": "start", "reference": "θ ɪ ŋ"})]
+        websocket = FakeWebSocket(messages + _chunks(_tones()) + [json.dumps({"type": "end"})])
+
+        asyncio.run(server.handle(websocket))
+
+        types = [m["type"] for m in websocket.sent]
+        assert types.index("phoneme") < types.index("speech_end")
+        assert [m["phoneme"] for m in websocket.of_type("phoneme")] == ["θ", "ɪ", "ŋ"]
+        report = server.components.tracer.report()
+        assert report["emission"]["count"] == 3
+        # The first two phonemes are final while the next one is spoken
+        assert report["emission"]["p50"] < server.config.settings.feedback.latency_target
+
+    def test_partials_decode_new_frames(self, monkeypatch):
+        """Test that partial recognition grows with the speech and decodes each frame once."""
+        decoded = []
+
+        def counting_log_probs(model, frames):
+            decoded.append(len(frames))
+            return _tone_log_probs(model, frames)
+
+        monkeypatch.setattr(AcousticModel, "frames_to_log_probs", counting_log_probs)
+        server = _make_server()
+        session = StreamSession(server.components, "english")
+        partials = []
+        for chunk in _chunks(_tones()):
+            messages = session.process(decode_pcm(chunk, "pcm16"))
+            partials += [m["phonemes"] for m in messages if m["type"] == "partial"]
+
+        assert partials[-1] == ["θ", "ɪ", "ŋ"]
+        assert all(p == partials[-1][:len(p)] for p in partials)
+        assert sum(decoded) <= len(_tones()) // 320 + 1
+
+    def test_phonemes_emitted_before_result(self):
+        """Test that every reference phoneme is sent once, ahead of the result."""
+        server = _make_server()
+        websocket = FakeWebSocket(_session_messages())
+
+        asyncio.run(server.handle(websocket))
+
+        types = [m["type"] for m in websocket.sent]
+        phonemes = websocket.of_type("phoneme")
+        result = websocket.of_type("result")[0]
+        assert [m["index"] for m in phonemes] == [0, 1, 2]
+        assert max(i for i, t in enumerate(types) if t == "phoneme") < types.index("result")
+        assert [m["phoneme"] for m in phonemes] == [s["phoneme"] for s in result["scores"]]
+        assert [m["score"] for m in phonemes] == [s["score"] for s in result["scores"]]
+
+    def test_backpressure(self, monkeypatch):
+        """Test that reading pauses while the scoring queue is full."""
+        server = _make_server(**{"web.queue_chunks": 2})
+        websocket = FakeWebSocket(_session_messages())
+        lag = []
+        process = StreamSession.process
+
+        def slow_process(session, chunk, received=None):
+            time.sleep(0.002)
+            lag.append(websocket.received - session.chunks_done)
+            session.chunks_done += 1
+            return process(session, chunk, received)
+
+        monkeypatch.setattr(StreamSession, "chunks_done", 1, raising=False)
+        monkeypatch.setattr(StreamSession, "process", slow_process)
+        asyncio.run(server.handle(websocket))
+
+        assert len(lag) == len(websocket.messages) - 2
+        # Chunks read but not yet scored: the queue plus one being handed over
+        assert max(lag) <= 2 + 2
+
+    def test_concurrent_sessions(self):
+        """Test that many learners are served at once."""
+        server = _make_server()
+        websockets = [FakeWebSocket(_session_messages()) for _ in range(8)]
+
+        async def serve_all():
+            await asyncio.gather(*(server.handle(ws) for ws in websockets))
+
+        asyncio.run(serve_all())
+
+        assert all(len(ws.of_type("result")) == 1 for ws in websockets)
+
+    def test_recognition_without_reference(self):
+        """Test that phonemes are recognized when no reference is given."""
+        server = _make_server()
+        messages = _session_messages()
+        messages[0] = json.dumps({"type": "start"})
+        websocket = FakeWebSocket(messages)
+
+        asyncio.run(server.handle(websocket))
+
+        assert "scores" in websocket.of_type("result")[0]
+
+    def test_failing_session(self, monkeypatch):
+        """Test that a scoring failure is reported and ends the connection."""
+        server = _make_server(**{"web.queue_chunks": 2})
+        websocket = FakeWebSocket(_session_messages())
+        process = StreamSession.process
+        calls = []
+
+        def failing_process(session, chunk, received=None):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise RuntimeError("inference failed")
+            return process(session, chunk, received)
+
+        monkeypatch.setattr(StreamSession, "process", failing_process)
+        asyncio.run(asyncio.wait_for(server.handle(websocket), timeout=5.0))
+
+        assert websocket.sent[-1] == {"type": "error", "message": "Scoring failed"}
+        assert websocket.closed[0] == 1011
+        assert websocket.received < len(websocket.messages)
+        assert server.active_sessions == 0
+
+    def test_latency_tracing(self):
+        """Test that live utterances are traced from capture to feedback."""
+        server = _make_server(**{"debug.profile_performance": True})
+        websocket = FakeWebSocket(_session_messages())
+
+        asyncio.run(server.handle(websocket))
+
+        report = server.components.tracer.report()
+        assert report["utterances"] == 1
+        assert list(report["stages"]) == ["capture", "vad", "features", "scoring", "feedback",
+                                          "total"]
+        # Measured from the chunk that ended the speech, not from its start
+        assert report["stages"]["total"]["max"] < sum(
+            stage["max"] for name, stage in report["stages"].items() if name != "total")
+
+    def test_server_busy(self):
+        """Test that connections beyond the session limit are refused."""
+        server = _make_server(**{"web.max_sessions": 0})
+        websocket = FakeWebSocket(_session_messages())
+
+        asyncio.run(server.handle(websocket))
+
+        assert websocket.closed[0] == 1013
+        assert websocket.sent == []
+
+    def test_protocol_errors(self):
+        """Test that invalid messages are reported without closing the session."""
+        server = _make_server()
+        websocket = FakeWebSocket([
+            b"\x00\x00",
+            "not json",
+            json.dumps({"type": "start", "sample_rate": 8000}),
+            json.dumps({"type": "start", "format": "mp3"}),
+            json.dumps({"type": "dance"}),
+        ] + _session_messages())
+
+        asyncio.run(server.handle(websocket))
+
+        assert len(websocket.of_type("error")) == 5
+        assert len(websocket.of_type("result")) == 1